@@ -1,9 +1,11 @@
 import sys
 from PySide6.QtWidgets import QApplication
 from main_window import MainWindow
+from logger import setup_logging
 
 
 def main() -> None:
+    setup_logging()
     app = QApplication(sys.argv)
     window = MainWindow(app)
     window.showMaximized()
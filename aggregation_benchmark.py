@@ -0,0 +1,164 @@
+import os
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import tracemalloc
+from project_generator import generate_project
+from borehole_logic import Borehole
+from data_cache import TraceCache, SummaryCache
+from startup_benchmark import get_revision
+import config as cf
+
+
+AGGREGATION_METHODS = [
+    'get_xy_dataframes_dict',
+    'get_sensor_21_dataframe_dict',
+    'get_step_maxes_dataframe_dict',
+    'get_step_depth_dataframe_dict',
+    'get_sensor_dataframe_dict',
+]
+
+
+class FileOpenCounter:
+    count = 0
+    is_counting = False
+    is_installed = False
+
+    @staticmethod
+    def audit_hook(event_: str, args_: tuple) -> None:
+        if event_ == 'open' and FileOpenCounter.is_counting:
+            FileOpenCounter.count += 1
+
+    @staticmethod
+    def start() -> None:
+        if not FileOpenCounter.is_installed:
+            sys.addaudithook(FileOpenCounter.audit_hook)
+            FileOpenCounter.is_installed = True
+        FileOpenCounter.count = 0
+        FileOpenCounter.is_counting = True
+
+    @staticmethod
+    def stop() -> int:
+        FileOpenCounter.is_counting = False
+        return FileOpenCounter.count
+
+
+def get_project_shape(file_count_: int) -> tuple:
+    step_total = max(1, round(file_count_ / (cf.DEFAULT_SENSOR_AMOUNT * cf.DEFAULT_MEASUREMENT_NUMBER)))
+    step_count = min(step_total, cf.BENCHMARK_MAX_STEP_COUNT)
+    return math.ceil(step_total / step_count), step_count
+
+
+def get_project_path(work_dir_: str, file_count_: int, point_count_: int, seed_: int) -> str:
+    path = os.path.join(work_dir_, 'projects',
+                        'aggregation_' + '_'.join(str(value) for value in (file_count_, point_count_, seed_)))
+    if not os.path.isfile(os.path.join(path, cf.BOREHOLE_INFO_SAVE_FILENAME)):
+        section_count, step_count = get_project_shape(file_count_)
+        generate_project(path, section_count, step_count, point_count_=point_count_, seed_=seed_)
+    return path
+
+
+def load_borehole(path_: str) -> Borehole:
+    borehole = Borehole(os.path.basename(path_), os.path.dirname(path_))
+    for section in borehole.section_list:
+        section.select(True)
+    return borehole
+
+
+def clear_caches() -> None:
+    TraceCache().clear()
+    SummaryCache().clear()
+
+
+def measure(borehole_: Borehole, method_: str, is_trace_memory_: bool = False) -> dict:
+    hits, misses = TraceCache().hits, TraceCache().misses
+    if is_trace_memory_:
+        tracemalloc.start()
+    FileOpenCounter.start()
+    start_time = time.perf_counter()
+    getattr(borehole_, method_)()
+    elapsed = time.perf_counter() - start_time
+    result = {'time_s': elapsed, 'file_opens': FileOpenCounter.stop(),
+              'cache_hits': TraceCache().hits - hits, 'cache_misses': TraceCache().misses - misses}
+    if is_trace_memory_:
+        result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmark(work_dir_: str, sizes_: list, methods_: list, point_count_: int, seed_: int,
+                  is_trace_memory_: bool) -> dict:
+    results = {
+        'revision': get_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'point_count': point_count_,
+        'projects': [],
+    }
+    # pandas is imported on the first file read; load it here so the first cold run does not pay for it
+    import pandas
+    for file_count in sizes_:
+        path = get_project_path(work_dir_, file_count, point_count_, seed_)
+        project_result = {'target_file_count': file_count, 'file_count': load_borehole(path).get_file_count(),
+                          'methods': dict()}
+        for method in methods_:
+            borehole = load_borehole(path)
+            clear_caches()
+            method_result = {'cold': measure(borehole, method), 'warm': measure(borehole, method)}
+            if is_trace_memory_:
+                borehole = load_borehole(path)
+                clear_caches()
+                method_result['cold']['peak_memory_bytes'] = measure(borehole, method, True)['peak_memory_bytes']
+                method_result['warm']['peak_memory_bytes'] = measure(borehole, method, True)['peak_memory_bytes']
+            project_result['methods'][method] = method_result
+        results['projects'].append(project_result)
+    return results
+
+
+def print_results(results_: dict, baseline_: dict = None) -> None:
+    baseline_projects = dict()
+    if baseline_ is not None:
+        baseline_projects = {project['target_file_count']: project for project in baseline_['projects']}
+    for project in results_['projects']:
+        baseline_methods = baseline_projects.get(project['target_file_count'], dict()).get('methods', dict())
+        for method, method_result in project['methods'].items():
+            for variant in ('cold', 'warm'):
+                ratio = None
+                baseline_time = baseline_methods.get(method, dict()).get(variant, dict()).get('time_s', 0)
+                if baseline_time > 0:
+                    ratio = method_result[variant]['time_s'] / baseline_time
+                print(cf.AGGREGATION_BENCHMARK_MESSAGE_F(project['file_count'], method, variant,
+                                                         method_result[variant], ratio))
+
+
+def main(argv_: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Замер производительности построения данных графиков")
+    parser.add_argument('--work-dir', default=os.path.join(cf.BENCHMARK_DIR, 'aggregation'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=cf.BENCHMARK_AGGREGATION_FILE_COUNTS,
+                        help="примерное количество файлов в синтетических проектах")
+    parser.add_argument('--methods', nargs='+', choices=AGGREGATION_METHODS, default=AGGREGATION_METHODS)
+    parser.add_argument('--points', type=int, default=cf.BENCHMARK_POINT_COUNT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="не замерять пиковую память (tracemalloc)")
+    parser.add_argument('--output', default=None, help="файл для сохранения результатов в JSON")
+    parser.add_argument('--baseline', default=None, help="JSON с результатами для сравнения")
+    args = parser.parse_args(argv_)
+
+    results = run_benchmark(os.path.abspath(args.work_dir), args.sizes, args.methods, args.points, args.seed,
+                            not args.no_memory)
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding=cf.DEFAULT_ENCODING) as file:
+            baseline = json.load(file)
+    print_results(results, baseline)
+    if args.output is not None:
+        with open(args.output, 'w', encoding=cf.DEFAULT_ENCODING) as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,13 +3,33 @@ import pathlib
 import shutil
 from uuid import uuid4
 import statistics as st
-from PySide6.QtWidgets import QWidget, QMessageBox
-from PySide6.QtCore import Qt
-from third_party import get_num_file_by_default, MessageBox
-from graph_widget import XYDataFrame, MaxesDataFrame
+from concurrent.futures import ThreadPoolExecutor
+from diagnostics import MyWarning, Diagnostics
+from task_context import CancelToken, ProgressReporter
+from dataframes import XYDataFrame, MaxesDataFrame
+from data_cache import file_signature
+from profiler import profiled
 import config as cf
 
 
+def get_num_file_by_default(base_name_: str, sensor_amount_: int) -> list:
+    if len(base_name_) < 19:
+        return [-1, -1]
+    measurement_num = -1
+    if base_name_[-5].isalpha():
+        measurement_num = ord(base_name_[-5].lower()) - ord('a') + 10
+    elif base_name_[-5].isdigit():
+        measurement_num = int(base_name_[-5])
+    else:
+        return [-1, -1]
+    sensor_num = -1
+    if base_name_[8].isalpha() and ord(base_name_[8].lower()) - ord('a') < sensor_amount_:
+        sensor_num = ord(base_name_[8].lower()) - ord('a')
+    else:
+        return [-1, -1]
+    return [measurement_num, sensor_num]
+
+
 class DataFile:
     def __init__(self, name_: str, step_path_: str, id_: str = None):
         self.name = name_
@@ -22,6 +42,8 @@ class DataFile:
                                                                         cf.DEFAULT_SENSOR_AMOUNT)
         self.max_value = None
         self.is_select = False
+        self.is_valid = None
+        self.valid_signature = None
 
     def __eq__(self, other_) -> bool:
         return self.id == other_.id
@@ -41,14 +63,56 @@ class DataFile:
                 return float('-inf')
         return self.max_value
 
+    def signature(self) -> tuple:
+        try:
+            return file_signature(self.path())
+        except OSError:
+            return None
+
+    def set_valid(self, is_valid_: bool) -> None:
+        self.is_valid = is_valid_
+        self.valid_signature = self.signature()
+
+    def is_validated(self) -> bool:
+        return self.is_valid is not None and self.valid_signature == self.signature()
+
+    def validate(self) -> Diagnostics:
+        diagnostics = Diagnostics()
+        if self.measurement_num == -1 or self.sensor_num == -1:
+            diagnostics.add(cf.WRONG_FILENAME_WARNING_TITLE, cf.WRONG_FILENAME_WARNING_MESSAGE_F(self.name), self.path())
+        elif not os.path.isfile(self.path()):
+            diagnostics.add(cf.FILE_NOT_EXIST_WARNING_TITLE, cf.FILE_NOT_EXIST_WARNING_MESSAGE_F(self.path()),
+                            self.path())
+        else:
+            try:
+                XYDataFrame.check_header(self.path())
+            except MyWarning as mw:
+                diagnostics.add(mw.exception_title, mw.message, self.path())
+            except Exception:
+                diagnostics.add(cf.UNKNOWN_WARNING_TITLE, cf.UNKNOWN_WARNING_MESSAGE, self.path())
+        self.set_valid(len(diagnostics) < 1)
+        return diagnostics
+
     def get_xy_dataframe(self) -> XYDataFrame:
+        CancelToken.current().check()
+        if self.is_valid is False and self.is_validated():
+            self.max_value = None
+            ProgressReporter.current().advance(self.name)
+            return None
         if self.measurement_num == -1 or self.sensor_num == -1:
-            MessageBox().warning(cf.WRONG_FILENAME_WARNING_TITLE, cf.WRONG_FILENAME_WARNING_MESSAGE_F(self.name))
+            Diagnostics.current().add(cf.WRONG_FILENAME_WARNING_TITLE, cf.WRONG_FILENAME_WARNING_MESSAGE_F(self.name),
+                                      self.path())
             self.max_value = None
+            self.set_valid(False)
+            ProgressReporter.current().advance(self.name)
             return None
-        xy_dataframe = XYDataFrame(self.path())
+        xy_dataframe = XYDataFrame(self.path(), id_=self.id)
+        ProgressReporter.current().advance(self.name)
         if not xy_dataframe.active:
+            self.set_valid(False)
             return None
+        if self.is_valid is False:
+            self.set_valid(True)
         self.max_value = xy_dataframe.max_y
         return xy_dataframe
 
@@ -138,36 +202,22 @@ class Step:
 
     def get_xy_dataframes_list(self) -> list:
         xy_dataframes_list = list()
-        i = 0
         for data_file in self.data_list:
             xy_dataframe = data_file.get_xy_dataframe()
-            if xy_dataframe is None or data_file.sensor_num == -1:
-                while i < len(self.data_list):
-                    if self.data_list[i].sensor_num == -1:
-                        self.remove_file(id=self.data_list[i].id)
-                    else:
-                        i += 1
-                return list()
+            if xy_dataframe is None:
+                continue
             if xy_dataframe.is_correct_read() and data_file.is_select:
                 xy_dataframes_list.append(xy_dataframe)
-            i += 1
         return xy_dataframes_list
 
     def get_sensor_maxes_dict(self) -> dict:
         sensor_dict = dict()
-        i = 0
         for data_file in self.data_list:
-            if data_file.get_xy_dataframe() is None or data_file.sensor_num == -1:
-                while i < len(self.data_list):
-                    if self.data_list[i].sensor_num == -1:
-                        self.remove_file(id=self.data_list[i].id)
-                    else:
-                        i += 1
-                return dict()
+            if data_file.get_xy_dataframe() is None:
+                continue
             if data_file.sensor_num not in sensor_dict:
                 sensor_dict[data_file.sensor_num] = [None] * cf.DEFAULT_MEASUREMENT_NUMBER
             sensor_dict[data_file.sensor_num][data_file.measurement_num] = data_file.max()
-            i += 1
 
         for sensor_num in sensor_dict.keys():
             i = 0
@@ -180,17 +230,10 @@ class Step:
 
     def get_sensor_maxes_of_maxes_list(self) -> list:
         sensor_list = [0] * cf.DEFAULT_MEASUREMENT_NUMBER
-        i = 0
         for data_file in self.data_list:
-            if data_file.get_xy_dataframe() is None or data_file.sensor_num == -1:
-                while i < len(self.data_list):
-                    if self.data_list[i].sensor_num == -1:
-                        self.remove_file(id=self.data_list[i].id)
-                    else:
-                        i += 1
-                return list()
+            if data_file.get_xy_dataframe() is None:
+                continue
             sensor_list[data_file.sensor_num] = max(sensor_list[data_file.sensor_num], data_file.max())
-            i += 1
         return sensor_list
 
     def get_sensor_dataframe_list(self) -> list:
@@ -539,13 +582,104 @@ class Borehole:
             if not section_dict[section_name]:
                 self.add_section(os.path.basename(section_name))
 
+    def apply_selection(self, selection_dict_: dict) -> dict:
+        change_set = dict()
+        for section in self.section_list:
+            section_key = (section.name,)
+            self.__apply_state(section, section_key, selection_dict_, change_set)
+            for step in section.step_list:
+                step_key = section_key + (step.number,)
+                self.__apply_state(step, step_key, selection_dict_, change_set)
+                for file in step.data_list:
+                    self.__apply_state(file, step_key + (file.name,), selection_dict_, change_set)
+        return change_set
+
+    def get_item_states(self) -> dict:
+        item_states = dict()
+        for section in self.section_list:
+            section_key = (section.name,)
+            item_states[section_key] = None
+            for step in section.step_list:
+                step_key = section_key + (step.number,)
+                item_states[step_key] = None
+                for file in step.data_list:
+                    try:
+                        stat = os.stat(file.path())
+                        item_states[step_key + (file.name,)] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        item_states[step_key + (file.name,)] = None
+        return item_states
+
+    def get_structure_changes(self, old_item_states_: dict) -> dict:
+        change_set = dict()
+        item_states = self.get_item_states()
+        for key in item_states.keys():
+            if key not in old_item_states_:
+                change_set[key] = {'added'}
+            elif item_states[key] != old_item_states_[key]:
+                change_set[key] = {'modified'}
+        for key in old_item_states_.keys():
+            if key not in item_states:
+                change_set[key] = {'removed'}
+        return change_set
+
+    @staticmethod
+    def __apply_state(item_, key_: tuple, selection_dict_: dict, change_set_: dict) -> None:
+        if key_ not in selection_dict_:
+            return
+        changed_fields = set()
+        for field, value in selection_dict_[key_].items():
+            if getattr(item_, field) != value:
+                setattr(item_, field, value)
+                changed_fields.add(field)
+        if len(changed_fields) > 0:
+            change_set_[key_] = changed_fields
+
+    def get_file_count(self) -> int:
+        file_count = 0
+        for section in self.section_list:
+            for step in section.step_list:
+                file_count += len(step.data_list)
+        return file_count
+
+    def validate(self, workers_: int = cf.DEFAULT_VALIDATION_WORKERS, is_force_: bool = False) -> Diagnostics:
+        data_files = []
+        for section in self.section_list:
+            for step in section.step_list:
+                for data_file in step.data_list:
+                    if is_force_ or not data_file.is_validated():
+                        data_files.append(data_file)
+        cancel_token, progress_reporter = CancelToken.current(), ProgressReporter.current()
+        progress_reporter.start(len(data_files))
+        diagnostics = Diagnostics()
+        if len(data_files) < 1:
+            return diagnostics
+        executor = ThreadPoolExecutor(max_workers=min(workers_ if workers_ > 0 else os.cpu_count() or 1,
+                                                      len(data_files)))
+        futures = [executor.submit(data_file.validate) for data_file in data_files]
+        try:
+            for data_file, future in zip(data_files, futures):
+                cancel_token.check()
+                diagnostics.extend(future.result())
+                progress_reporter.advance(data_file.name)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+        Diagnostics.current().extend(diagnostics)
+        return diagnostics
+
+    @profiled('aggregation.get_xy_dataframes_dict')
     def get_xy_dataframes_dict(self) -> dict:
+        ProgressReporter.current().start(self.get_file_count())
         xy_dataframes_dict = dict()
         for section in self.section_list:
             xy_dataframes_dict[section.name] = section.get_xy_dataframes_list()
         return xy_dataframes_dict
 
+    @profiled('aggregation.get_sensor_21_dataframe_dict')
     def get_sensor_21_dataframe_dict(self) -> dict:
+        ProgressReporter.current().start(self.get_file_count())
         dataframes_dict = dict()
         for section in self.section_list:
             section_df_list = section.get_sensor_21_dataframe_list()
@@ -553,7 +687,9 @@ class Borehole:
                 dataframes_dict[section.name] = section_df_list
         return dataframes_dict
 
+    @profiled('aggregation.get_sensor_dataframe_dict')
     def get_sensor_dataframe_dict(self) -> dict:
+        ProgressReporter.current().start(self.get_file_count())
         dataframes_dict = dict()
         for section in self.section_list:
             section_df_list = section.get_sensor_dataframe_list()
@@ -561,13 +697,17 @@ class Borehole:
                 dataframes_dict[section.name] = section_df_list
         return dataframes_dict
 
+    @profiled('aggregation.get_maxes_dataframe_dict')
     def get_maxes_dataframe_dict(self) -> dict:
+        ProgressReporter.current().start(self.get_file_count())
         dataframes_dict = dict()
         for section in self.section_list:
             dataframes_dict[section.name] = section.get_maxes_dataframe_list()
         return dataframes_dict
 
+    @profiled('aggregation.get_step_maxes_dataframe_dict')
     def get_step_maxes_dataframe_dict(self) -> dict:
+        ProgressReporter.current().start(self.get_file_count())
         dataframes_dict = dict()
         for section in self.section_list:
             tmp_dict = section.get_step_maxes_dataframe_dict()
@@ -575,7 +715,9 @@ class Borehole:
                 dataframes_dict[section.name] = tmp_dict
         return dataframes_dict
 
+    @profiled('aggregation.get_step_depth_dataframe_dict')
     def get_step_depth_dataframe_dict(self):
+        ProgressReporter.current().start(self.get_file_count())
         dataframes_dict = dict()
         maxes_dict = dict()
         for section in self.section_list:
@@ -584,8 +726,10 @@ class Borehole:
                     dataframes_dict[step.number] = dict()
                 if section.depth not in dataframes_dict[step.number] and len(step.data_list):
                     dataframes_dict[step.number][section.depth] = dict()
-                    maxes_dict[section.depth] = dict()
+                    maxes_dict.setdefault(section.depth, dict())
                 for datafile in step.data_list:
+                    if datafile.max() == float('-inf'):
+                        continue
                     if datafile.sensor_num not in dataframes_dict[step.number][section.depth]:
                         dataframes_dict[step.number][section.depth][datafile.sensor_num] = {'x': datafile.max(), 'rx': 0}
                     if datafile.sensor_num not in maxes_dict[section.depth]:
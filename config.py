@@ -14,6 +14,10 @@ HELP_INFO_DIALOG_TITLE = 'Help information'
 SELECT_FOLDER_FILE_DIALOG_TITLE = "Select folder"
 SELECT_FILE_FILE_DIALOG_TITLE = "Select file"
 DATA_CONVERTER_DIALOG_TITLE = 'Data Converter'
+SPECTRUM_SETTINGS_DIALOG_TITLE = 'Spectrum settings'
+VALIDATION_REPORT_DIALOG_TITLE = 'Validation report'
+PROFILER_DIALOG_TITLE = 'Profiler'
+MEMORY_REPORT_DIALOG_TITLE = 'Memory usage'
 
 
 # Folder names and project files names
@@ -23,6 +27,7 @@ BOREHOLE_INFO_SAVE_FILENAME = "info.txt"
 DEFAULT_PROJECT_FOLDER = 'projects'
 CACHE_DIR_PATH = '__avellon_cache__'
 CACHE_FILE_INFO_PATH = CACHE_DIR_PATH + '/' + DEFAULT_PROJECT_INFO_FILENAME
+FILTER_CACHE_DIR_PATH = CACHE_DIR_PATH + '/filtered'
 DEFAULT_FOLDER_NAME_FOR_SELECT = "data"
 DEFAULT_FOLDER_NAME_TO_SAVE = "save_data"
 DEFAULT_FORMAT_OF_FILENAME = "%Y_%m_%d_%H_%M_%S"
@@ -53,6 +58,130 @@ DEFAULT_ENCODING = ENCODING_UTF8
 DEFAULT_BOREHOLE_NAME_FONT_SIZE = 40
 
 
+# Level of detail settings
+LOD_BASE_BIN_SIZE = 4
+LOD_LEVEL_FACTOR = 4
+LOD_MIN_BIN_COUNT = 256
+LOD_DEFAULT_PIXEL_COUNT = 2000
+
+
+# Cache settings
+FILTER_CACHE_MAX_BYTES = 256 * 1024 ** 2
+IS_PERSIST_FILTER_CACHE = False
+SPECTRUM_CACHE_MAX_BYTES = 128 * 1024 ** 2
+TRACE_CACHE_MAX_BYTES = 512 * 1024 ** 2
+SUMMARY_CACHE_MAX_BYTES = 8 * 1024 ** 2
+IS_PREFETCH_ON_OPEN = True
+PREFETCH_RESUME_DELAY_MS = 200
+
+
+# Memory budget settings
+MEMORY_BUDGET_BYTES = 0
+MEMORY_BUDGET_FRACTION = 0.5
+DEFAULT_MEMORY_BUDGET_BYTES = 2 * 1024 ** 3
+MEMORY_CHECK_INTERVAL_BYTES = 64 * 1024 ** 2
+MEMORY_REPORT_HEADERS = ["Объект", "Размер (МБ)"]
+
+
+# Job scheduler settings
+JOB_SCHEDULER_MAX_THREADS = 1
+JOB_PRIORITY_LOW = -1
+JOB_PRIORITY_NORMAL = 0
+JOB_PRIORITY_HIGH = 1
+
+
+# Progress settings
+PROGRESS_REPORT_INTERVAL = 0.1
+PROGRESS_BAR_MAXIMUM = 1000
+
+
+# Spectrum settings
+SPECTRUM_WINDOW_NAMES = {
+    'Ханна': 'hann',
+    'Хэмминга': 'hamming',
+    'Блэкмана': 'blackman',
+    'Прямоугольное': 'rectangular',
+}
+DEFAULT_SPECTRUM_WINDOW = 'hann'
+DEFAULT_WELCH_SEGMENT_SIZE = 0
+DEFAULT_WELCH_OVERLAP = 0.5
+
+
+# Playback settings
+PLAYBACK_SPEEDS = {'0.5x': 0.5, '1x': 1., '2x': 2., '4x': 4.}
+DEFAULT_PLAYBACK_SPEED = '1x'
+DEFAULT_PLAYBACK_INTERVAL_MS = 500
+ANIMATION_SERIES_INDEX_WIDTH = 4
+
+
+# Report settings
+REPORT_FORMATS = ['png', 'svg']
+REPORT_GRAPH_TYPES = ['oscilloscope', 'frequency', 'amplitude', 'depth', 'windrose']
+DEFAULT_REPORT_FORMAT = 'png'
+DEFAULT_REPORT_DPI = 150
+DEFAULT_REPORT_WORKERS = 0
+REPORT_FIGURE_SIZE = (10, 6)
+REPORT_PIXEL_COUNT = 4000
+REPORT_MAX_LEGEND_SIZE = 20
+
+
+# Logging settings
+LOGGER_NAME = 'avellon'
+LOG_LEVEL_ENV_VAR = 'AVELLON_LOG_LEVEL'
+DEFAULT_LOG_LEVEL = 'INFO'
+LOG_FORMAT = '%(levelname)s %(name)s: %(message)s'
+
+
+# Profiler settings
+PROFILE_ENV_VAR = 'AVELLON_PROFILE'
+PROFILE_TRACE_ENV_VAR = 'AVELLON_PROFILE_TRACE'
+PROFILER_MAX_EVENTS = 100000
+PROFILER_STATS_HEADERS = ["Операция", "Вызовы", "Всего (с)", "Среднее (мс)", "Максимум (мс)"]
+PROFILER_COUNTERS_HEADERS = ["Счетчик", "Значение"]
+PROFILER_TRACE_FILE_FILTER = "Chrome trace (*.json)"
+
+
+# Benchmark settings
+BENCHMARK_DIR = 'benchmark_data'
+BENCHMARK_REPEAT = 3
+BENCHMARK_STARTUP_SECTION_COUNTS = [0, 1, 10, 50]
+BENCHMARK_STEP_COUNT = 2
+BENCHMARK_POINT_COUNT = 1000
+BENCHMARK_TOP_IMPORT_COUNT = 15
+BENCHMARK_FIRST_PAINT_TIMEOUT_MS = 10000
+BENCHMARK_AGGREGATION_FILE_COUNTS = [100, 1000, 10000, 100000]
+BENCHMARK_MAX_STEP_COUNT = 10
+
+
+# Project generator settings
+GENERATOR_NOISE_MODELS = ['gauss', 'uniform', 'none']
+GENERATOR_MALFORMED_KINDS = ['filename', 'header', 'data']
+GENERATOR_TIME_BASE_US = 500
+GENERATOR_SAMPLING_RATE_MSA = 1.25
+GENERATOR_BASE_FREQUENCY = 0.01
+DEFAULT_GENERATOR_SECTION_COUNT = 2
+DEFAULT_GENERATOR_STEP_COUNT = 2
+DEFAULT_GENERATOR_POINT_COUNT = 2000
+DEFAULT_GENERATOR_NOISE = 'gauss'
+DEFAULT_GENERATOR_NOISE_LEVEL = 0.1
+
+
+# Oscilloscope table settings
+OSCILLOSCOPE_TABLE_HEADERS = ["Файл", "Секция", "Шаг", "Датчик", "Максимум", "Минимум", "СКЗ"]
+OSCILLOSCOPE_TABLE_VALUE_COLUMNS = [4, 5, 6]
+OSCILLOSCOPE_TABLE_FLOAT_FORMAT = '{:.6g}'
+OSCILLOSCOPE_TABLE_ROW_HEIGHT = 24
+
+
+# Borehole tree settings
+BOREHOLE_TREE_HEADERS = ["Имя", "Глубина (м)", "Длина (м)"]
+
+
+# Validation settings
+DEFAULT_VALIDATION_WORKERS = 0
+VALIDATION_REPORT_HEADERS = ["Файл", "Проблема", "Описание"]
+
+
 # Borehole measurement settings
 DEFAULT_SENSOR_AMOUNT = 4
 DEFAULT_MEASUREMENT_NUMBER = 21
@@ -64,6 +193,7 @@ FILE_DIALOG_FOLDER_FILTER = "FOLDER_FILTER"
 FILE_DIALOG_CSV_FILTER = "CSV files (*.csv)"
 FILE_DIALOG_SAVE_FILTERS = ["JPG files (*.jpg; *.jpeg)", "PNG files (*.png)",
                             "JPG files (*.jpg; *.jpeg);; PNG files (*.png)"]
+FILE_DIALOG_ANIMATION_FILTER = "GIF files (*.gif);; PNG files (*.png)"
 
 
 # Formats and types
@@ -93,6 +223,8 @@ PIPE_CRACK_POSITION_UNIT = "м"
 
 # CSV file data
 CSV_FILE_HEADER_SIZE = 7
+DEFAULT_STREAM_CHUNK_SIZE = 65536
+STREAM_FILTER_MIN_POINTS = 10**6
 TIME_BASE_HEADER = "Time Base"
 SAMPLING_RATE_HEADER = "Sampling Rate"
 AMPLITUDE_HEADER = 'Amplitude'
@@ -174,10 +306,48 @@ def IS_FLOAT(s_: str) -> bool:
 
 # INFORMATION TITLES
 CONVERT_COMPLETE_INFO_TITLE = "Convert Complete"
+EXPORT_COMPLETE_INFO_TITLE = "Export Complete"
+REPORT_COMPLETE_INFO_TITLE = "Report Complete"
 
 
 # INFORMATION MESSAGES
 CONVERT_COMPLETE_INFO_MESSAGE = "Конвертирование успешно завершенно."
+def EXPORT_COMPLETE_INFO_MESSAGE_F(path_: str = "") -> str:
+    return f"Экспорт успешно завершен: {path_}"
+def REPORT_COMPLETE_INFO_MESSAGE_F(count_: int = 0, path_: str = "") -> str:
+    return f"Сохранено графиков: {count_}\nПапка: {path_}"
+def VALIDATION_REPORT_COUNT_MESSAGE_F(count_: int = 0) -> str:
+    return f"Найдено проблем: {count_}"
+def MEMORY_REPORT_TOTAL_MESSAGE_F(total_bytes_: int = 0, budget_bytes_: int = 0, evicted_count_: int = 0) -> str:
+    return f"Всего: {total_bytes_ / 1024 ** 2:.1f} МБ из {budget_bytes_ / 1024 ** 2:.1f} МБ, " \
+           f"выгружено трасс: {evicted_count_}"
+def GENERATOR_RANGE_WARNING_MESSAGE_F(name_: str = "", min_: int = 0, max_: int = 0) -> str:
+    return f"{name_} должно быть в диапазоне от {min_} до {max_}."
+def GENERATOR_NOISE_WARNING_MESSAGE_F(noise_: str = "") -> str:
+    return f"Неизвестная модель шума: {noise_}"
+def GENERATOR_COMPLETE_MESSAGE_F(path_: str = "", file_count_: int = 0, malformed_count_: int = 0) -> str:
+    return f"Проект создан: {path_}\nФайлов: {file_count_}, испорченных: {malformed_count_}"
+def BENCHMARK_IMPORT_MESSAGE_F(total_s_: float = 0., module_count_: int = 0) -> str:
+    return f"import: {total_s_:.3f} с, модулей: {module_count_}"
+def AGGREGATION_BENCHMARK_MESSAGE_F(file_count_: int = 0, method_: str = "", variant_: str = "", result_: dict = None,
+                                   ratio_: float = None) -> str:
+    result = dict() if result_ is None else result_
+    memory = "" if 'peak_memory_bytes' not in result else f"  {result['peak_memory_bytes'] / 1024 ** 2:>8.1f} МБ"
+    return f"{file_count_:>8} файлов  {method_:<30}{variant_:<5}{result.get('time_s', 0.):>9.3f} с" + \
+        f"  открытий: {result.get('file_opens', 0):>7}" + memory + ("" if ratio_ is None else f"  x{ratio_:.2f}")
+def BENCHMARK_METRIC_MESSAGE_F(file_count_: int = 0, metric_: str = "", value_: float = 0., ratio_: float = None) -> str:
+    return f"{file_count_:>8} файлов  {metric_:<16}{value_:>9.3f} с" + ("" if ratio_ is None else f"  x{ratio_:.2f}")
+def ETA_F(seconds_: float) -> str:
+    if seconds_ < 0:
+        return "--:--"
+    seconds = int(seconds_ + 0.5)
+    return f"{seconds // 60:02d}:{seconds % 60:02d}" if seconds < 3600 else \
+        f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+def PROGRESS_INFO_MESSAGE_F(done_: int = 0, total_: int = 0, rate_: float = 0., eta_: float = -1.) -> str:
+    return f"{done_}/{total_}  {rate_:.1f} файл/с  осталось {ETA_F(eta_)}"
+def PROGRESS_LOG_MESSAGE_F(name_: str = "", done_: int = 0, total_: int = 0, item_: str = "",
+                           rate_: float = 0., eta_: float = -1.) -> str:
+    return f"{name_}: {PROGRESS_INFO_MESSAGE_F(done_, total_, rate_, eta_)}  {item_}"
 
 
 # Colors
@@ -273,6 +443,15 @@ AMPLITUDE_HELP_INFO = '''
 То есть для построения необходимо иметь минимум два шага для датчика, заполненные файлами.</p>
 '''
 
+SPECTRUM_HELP_INFO = '''
+<h2> Смысл графика </h2>
+<p> Амплитудный спектр каждой выбранной осциллограммы, вычисленный быстрым преобразованием Фурье.
+Частота дискретизации берется из заголовка файла (`Sampling Rate`). </p>
+<h2> Построение </h2>
+<p> В окне `Настройки спектра` можно выбрать оконную функцию, размер сегмента и перекрытие сегментов.
+Размер сегмента `0` означает преобразование всей записи целиком, иначе спектр усредняется по сегментам (метод Уэлча).</p>
+'''
+
 DEPTH_HELP_INFO = '''
 <h2> Смысл графика </h2>
 <p> Что-то ... </p>
@@ -5,11 +5,15 @@ from PySide6.QtWidgets import QFileDialog, QVBoxLayout, QPushButton, QWidget, \
     QFormLayout, QLineEdit, QCheckBox
 from PySide6.QtGui import QIntValidator
 from PySide6.QtCore import Qt
-from third_party import MessageBox, AbstractToolDialog
+from third_party import MessageBox, AbstractToolDialog, CancelToken, OperationCancelled, ProgressReporter
 from loadlabel import loading
+from logger import get_logger
 import config as cf
 
 
+logger = get_logger(__name__)
+
+
 def try_create_dir(parent_path_: str, name_: str, num_: int = -1) -> str:
     tmp_name = name_
     if num_ > -1:
@@ -131,19 +135,37 @@ class FileDirector:
             self.save_dir = try_create_dir(str(pathlib.Path(filename_list_[0]).parent), converted_folder_name_) \
                 if converted_folder_path_ is None else try_create_dir(converted_folder_path_, converted_folder_name_)
         self.is_fill_gap = is_fill_gap
+        self.converted_filename_list = []
 
-    def convert(self) -> bool:
+    def convert(self, cancel_token_: CancelToken = None, progress_reporter_: ProgressReporter = None) -> bool:
+        cancel_token = CancelToken.current(cancel_token_)
+        progress_reporter = ProgressReporter.current(progress_reporter_)
         measurement_num = self.start_measurement_num
-        for filename in self.filename_list:
-            if measurement_num > 36:
-                return True
-            file_converter = FileConverter(filename, self.save_dir, self.sensor_num,
-                                           self.crash_deep, measurement_num, self.is_fill_gap)
-            if not file_converter.convert():
-                return False
-            measurement_num += 1
+        try:
+            for filename in self.filename_list:
+                if measurement_num > 36:
+                    return True
+                cancel_token.check()
+                file_converter = FileConverter(filename, self.save_dir, self.sensor_num,
+                                               self.crash_deep, measurement_num, self.is_fill_gap)
+                if not file_converter.convert():
+                    return False
+                self.converted_filename_list.append(file_converter.new_filename)
+                progress_reporter.advance(file_converter.old_basename)
+                measurement_num += 1
+        except OperationCancelled:
+            self.remove_converted()
+            raise
         return True
 
+    def remove_converted(self) -> None:
+        for filename in self.converted_filename_list:
+            if os.path.isfile(filename):
+                os.remove(filename)
+        self.converted_filename_list = []
+        if os.path.isdir(self.save_dir) and not any(pathlib.Path(self.save_dir).iterdir()):
+            os.rmdir(self.save_dir)
+
 
 class ConverterDialog(AbstractToolDialog):
     def __init__(self, parent_: QWidget = None):
@@ -244,15 +266,16 @@ class ConverterDialog(AbstractToolDialog):
                                                                      filter=cf.FILE_DIALOG_CSV_FILTER)
         if len(filename_list) < 1:
             return 
-        print(filename_list)
-        print(self.sensor_num, self.crash_deep, self.start_measurement_num)
+        logger.debug('conversion files: %s', filename_list)
+        logger.debug('sensor: %s, crash depth: %s, start measurement: %s', self.sensor_num, self.crash_deep,
+                     self.start_measurement_num)
         self.conversion(filename_list)
 
     def folder_files_conversion_action(self) -> None:
         dir_path = QFileDialog.getExistingDirectory(self, cf.SELECT_FOLDER_FILE_DIALOG_TITLE)
         if len(dir_path) < 1 or not os.path.isdir(dir_path):
             return
-        print(dir_path)
+        logger.debug('conversion folder: %s', dir_path)
         filename_list = []
         for filename in pathlib.Path(dir_path).glob('*.csv'):
             if filename.is_file():
@@ -265,7 +288,7 @@ class ConverterDialog(AbstractToolDialog):
         dir_path = QFileDialog.getExistingDirectory(self, cf.SELECT_FOLDER_FILE_DIALOG_TITLE)
         if len(dir_path) < 1 or not os.path.isdir(dir_path):
             return
-        print(dir_path)
+        logger.debug('conversion folders root: %s', dir_path)
         folder_list = []
         for filename in pathlib.Path(dir_path).glob('*'):
             if filename.is_dir():
@@ -277,25 +300,39 @@ class ConverterDialog(AbstractToolDialog):
     @loading('result_conversion', True)
     def conversion(self, filename_list_: list, converted_folder_name_: str = cf.DEFAULT_CONVERTED_DATA_FOLDER,
                    converted_folder_path_: str = None) -> bool:
+        ProgressReporter.current().start(len(filename_list_))
         file_director = FileDirector(filename_list_, self.sensor_num, self.crash_deep, self.start_measurement_num,
                                      converted_folder_name_, converted_folder_path_, is_fill_gap=self.is_fill_gap)
         return file_director.convert()
 
     @loading('result_conversion', True)
     def few_conversion(self, folder_list_: list, converted_folder_name_: str, converted_folder_path_: str) -> bool:
-        res = True
-        sensor_num = 0
+        cancel_token = CancelToken.current()
+        progress_reporter = ProgressReporter.current()
+        filename_lists = []
         for dirname in folder_list_:
             filename_list = []
             for filename in pathlib.Path(dirname).glob('*.csv'):
                 if filename.is_file():
                     filename_list.append(str(filename))
-            if len(filename_list) < 1:
-                continue
-            file_director = FileDirector(filename_list, sensor_num, self.crash_deep, 0,
-                                         converted_folder_name_, converted_folder_path_, True, is_fill_gap=self.is_fill_gap)
-            res = file_director.convert() and res
-            sensor_num += 1
+            filename_lists.append(filename_list)
+        progress_reporter.start(sum(len(filename_list) for filename_list in filename_lists))
+        file_director_list = []
+        res = True
+        sensor_num = 0
+        try:
+            for filename_list in filename_lists:
+                if len(filename_list) < 1:
+                    continue
+                file_director = FileDirector(filename_list, sensor_num, self.crash_deep, 0, converted_folder_name_,
+                                             converted_folder_path_, True, is_fill_gap=self.is_fill_gap)
+                file_director_list.append(file_director)
+                res = file_director.convert(cancel_token, progress_reporter) and res
+                sensor_num += 1
+        except OperationCancelled:
+            for file_director in file_director_list:
+                file_director.remove_converted()
+            raise
         return res
 
     def result_conversion(self, is_success_: bool) -> None:
@@ -0,0 +1,305 @@
+import os
+import sys
+import pickle
+import hashlib
+import weakref
+import itertools
+import threading
+from collections import OrderedDict
+from profiler import Profiler, span
+from data_filter import filter_chunks
+import config as cf
+
+
+FLOAT_OBJECT_SIZE = sys.getsizeof(0.)
+
+
+def file_signature(path_: str) -> tuple:
+    stat = os.stat(path_)
+    return os.path.abspath(path_), stat.st_mtime_ns, stat.st_size
+
+
+def estimate_nbytes(value_) -> int:
+    if hasattr(value_, 'nbytes'):
+        return int(value_.nbytes)
+    if isinstance(value_, dict):
+        return sys.getsizeof(value_) + sum(estimate_nbytes(v) for v in value_.values())
+    if isinstance(value_, (list, tuple)):
+        if len(value_) < 1 or isinstance(value_[0], float):
+            return sys.getsizeof(value_) + len(value_) * FLOAT_OBJECT_SIZE
+        return sys.getsizeof(value_) + sum(estimate_nbytes(v) for v in value_)
+    return sys.getsizeof(value_)
+
+
+def estimate_unique_nbytes(value_, seen_: set) -> int:
+    if value_ is None or id(value_) in seen_:
+        return 0
+    seen_.add(id(value_))
+    if hasattr(value_, 'origin_data'):
+        return sys.getsizeof(value_) + sum(estimate_unique_nbytes(data, seen_) for data in (
+            value_.data, value_.origin_data, value_.filt_data, getattr(value_, 'pyramids', None)))
+    if isinstance(value_, dict):
+        return sys.getsizeof(value_) + sum(estimate_unique_nbytes(v, seen_) for v in value_.values())
+    if isinstance(value_, (list, tuple)) and len(value_) > 0 and not isinstance(value_[0], float):
+        return sys.getsizeof(value_) + sum(estimate_unique_nbytes(v, seen_) for v in value_)
+    return estimate_nbytes(value_)
+
+
+def get_memory_budget() -> int:
+    if cf.MEMORY_BUDGET_BYTES > 0:
+        return cf.MEMORY_BUDGET_BYTES
+    try:
+        return int(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') * cf.MEMORY_BUDGET_FRACTION)
+    except (AttributeError, ValueError, OSError):
+        return cf.DEFAULT_MEMORY_BUDGET_BYTES
+
+
+class MemoryBoundedCache:
+    def __init__(self, name_: str, max_bytes_: int, persist_dir_: str = None):
+        self.name = name_
+        self.max_bytes = max_bytes_
+        self.persist_dir = persist_dir_
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+        MemoryAccountant().add_cache(self)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key_) -> bool:
+        return key_ in self.entries
+
+    def get(self, key_, default_=None):
+        with self.lock:
+            if key_ in self.entries:
+                self.entries.move_to_end(key_)
+                self.hits += 1
+                Profiler().count('cache.' + self.name + '.hits')
+                return self.entries[key_][0]
+        value = self.__load(key_)
+        if value is None:
+            self.misses += 1
+            Profiler().count('cache.' + self.name + '.misses')
+            return default_
+        self.hits += 1
+        Profiler().count('cache.' + self.name + '.hits')
+        self.put(key_, value, is_persist_=False)
+        return value
+
+    def put(self, key_, value_, nbytes_: int = None, is_persist_: bool = True) -> None:
+        nbytes = estimate_nbytes(value_) if nbytes_ is None else nbytes_
+        if nbytes > self.max_bytes:
+            return
+        with self.lock:
+            self.__pop(key_)
+            self.entries[key_] = (value_, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                self.__pop(next(iter(self.entries)))
+        if is_persist_:
+            self.__save(key_, value_)
+
+    def remove(self, key_) -> None:
+        with self.lock:
+            self.__pop(key_)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def __pop(self, key_) -> None:
+        if key_ in self.entries:
+            self.total_bytes -= self.entries.pop(key_)[1]
+
+    def __persist_path(self, key_) -> str:
+        return self.persist_dir + '/' + hashlib.sha1(repr(key_).encode(cf.DEFAULT_ENCODING)).hexdigest() + '.pkl'
+
+    def __save(self, key_, value_) -> None:
+        if self.persist_dir is None:
+            return
+        if not os.path.isdir(self.persist_dir):
+            os.makedirs(self.persist_dir, exist_ok=True)
+        path = self.__persist_path(key_)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            pickle.dump((key_, value_), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def __load(self, key_):
+        if self.persist_dir is None:
+            return None
+        path = self.__persist_path(key_)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as file:
+                stored_key, value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return value if stored_key == key_ else None
+
+
+class FilteredDataCache(MemoryBoundedCache):
+    def __init__(self):
+        if hasattr(self, 'entries'):
+            return
+        super().__init__('filtered', cf.FILTER_CACHE_MAX_BYTES,
+                         cf.FILTER_CACHE_DIR_PATH if cf.IS_PERSIST_FILTER_CACHE else None)
+
+    @staticmethod
+    def get_key(filename_: str, filter_) -> tuple:
+        return file_signature(filename_), type(filter_).__name__, filter_.get_params()
+
+    @staticmethod
+    def filter_data(filter_, init_data_) -> list:
+        if isinstance(init_data_, list):
+            filter_.set_data(init_data_)
+            return filter_.get_data()
+        return list(itertools.chain.from_iterable(filter_chunks(filter_, init_data_)))
+
+    def get_filtered_data(self, filename_: str, filter_, init_data_) -> list:
+        try:
+            key = self.get_key(filename_, filter_)
+        except OSError:
+            return self.filter_data(filter_, init_data_)
+        data = self.get(key)
+        if data is None:
+            with span('filter.' + type(filter_).__name__):
+                data = self.filter_data(filter_, init_data_)
+            self.put(key, data)
+        return data
+
+    def __new__(cls):
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(FilteredDataCache, cls).__new__(cls)
+        return cls.instance
+
+
+class TraceCache(MemoryBoundedCache):
+    def __init__(self):
+        if hasattr(self, 'entries'):
+            return
+        super().__init__('trace', cf.TRACE_CACHE_MAX_BYTES)
+
+    def __new__(cls):
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(TraceCache, cls).__new__(cls)
+        return cls.instance
+
+
+class SummaryCache(MemoryBoundedCache):
+    def __init__(self):
+        if hasattr(self, 'entries'):
+            return
+        super().__init__('summary', cf.SUMMARY_CACHE_MAX_BYTES)
+
+    def __new__(cls):
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(SummaryCache, cls).__new__(cls)
+        return cls.instance
+
+
+class MemoryAccountant:
+    def __init__(self):
+        if hasattr(self, 'caches'):
+            return
+        self.budget_bytes = get_memory_budget()
+        self.caches = []
+        self.sources = []
+        self.evictables = weakref.WeakValueDictionary()
+        self.charged_bytes = 0
+        self.evicted_count = 0
+        self.lock = threading.RLock()
+
+    def add_cache(self, cache_: MemoryBoundedCache) -> None:
+        self.caches.append(cache_)
+
+    def add_source(self, name_: str, owner_, attribute_: str) -> None:
+        with self.lock:
+            self.sources = [source for source in self.sources if source[1]() is not None]
+            self.sources.append((name_, weakref.ref(owner_), attribute_))
+
+    def set_budget(self, budget_bytes_: int) -> None:
+        self.budget_bytes = budget_bytes_
+        self.enforce()
+
+    def track(self, evictable_) -> None:
+        with self.lock:
+            self.evictables[id(evictable_)] = evictable_
+        self.charge(evictable_.nbytes)
+
+    def charge(self, nbytes_: int) -> None:
+        with self.lock:
+            self.charged_bytes += nbytes_
+            if self.charged_bytes < cf.MEMORY_CHECK_INTERVAL_BYTES:
+                return
+            self.charged_bytes = 0
+        self.enforce()
+
+    def get_cache_report(self) -> list:
+        return [(cache.name, cache.total_bytes) for cache in self.caches]
+
+    def get_source_report(self) -> list:
+        report = []
+        for name, owner_ref, attribute in list(self.sources):
+            owner = owner_ref()
+            if owner is not None:
+                report.append((name, estimate_unique_nbytes(getattr(owner, attribute, None), set())))
+        return report
+
+    def __get_loaded(self) -> list:
+        with self.lock:
+            evictables = list(self.evictables.values())
+        return sorted([evictable for evictable in evictables if evictable.is_loaded()],
+                      key=lambda evictable_: evictable_.last_access)
+
+    @staticmethod
+    def __get_held_bytes(evictables_: list) -> dict:
+        return {evictable.data_id(): evictable.nbytes for evictable in evictables_}
+
+    def __get_untracked_trace_bytes(self, held_: dict) -> int:
+        with TraceCache().lock:
+            return sum(nbytes for trace, nbytes in TraceCache().entries.values() if id(trace['y']) not in held_)
+
+    def get_total_bytes(self) -> int:
+        held = self.__get_held_bytes(self.__get_loaded())
+        return sum(cache.total_bytes for cache in self.caches if cache is not TraceCache()) + \
+            sum(held.values()) + self.__get_untracked_trace_bytes(held)
+
+    def enforce(self) -> int:
+        with self.lock:
+            loaded = self.__get_loaded()
+            held = self.__get_held_bytes(loaded)
+            total = sum(cache.total_bytes for cache in self.caches if cache is not TraceCache()) + \
+                sum(held.values()) + self.__get_untracked_trace_bytes(held)
+            if total <= self.budget_bytes:
+                return total
+            with TraceCache().lock:
+                for key, (trace, nbytes) in list(TraceCache().entries.items()):
+                    if total <= self.budget_bytes:
+                        break
+                    if id(trace['y']) not in held:
+                        TraceCache().remove(key)
+                        total -= nbytes
+            groups = dict()
+            for evictable in loaded:
+                groups.setdefault(evictable.data_id(), []).append(evictable)
+            for data_id, evictables in sorted(groups.items(), key=lambda item_: item_[1][-1].last_access)[:-1]:
+                if total <= self.budget_bytes:
+                    break
+                total -= held[data_id]
+                for evictable in evictables:
+                    TraceCache().remove(evictable.signature)
+                    evictable.evict()
+                    self.evicted_count += 1
+                    Profiler().count('memory.evictions')
+            return total
+
+    def __new__(cls):
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(MemoryAccountant, cls).__new__(cls)
+        return cls.instance
@@ -1,4 +1,12 @@
 import statistics as st
+from collections import deque
+
+
+class AbstractStreamFilter:
+    def feed(self, chunk_: list) -> list: ...
+
+    def flush(self) -> list:
+        return []
 
 
 class AbstractDataFilter:
@@ -10,8 +18,12 @@ class AbstractDataFilter:
 
     def set_params(self, *args, **kwargs): ...
 
+    def get_params(self) -> tuple: ...
+
     def get_data(self): ...
 
+    def stream(self) -> AbstractStreamFilter: ...
+
 
 class ArithmeticMeanFilter(AbstractDataFilter):
     def __init__(self, data: list):
@@ -21,8 +33,13 @@ class ArithmeticMeanFilter(AbstractDataFilter):
     def set_params(self, buffer_size: int) -> None:
         self.buffer_size = buffer_size
 
+    def get_params(self) -> tuple:
+        return (self.buffer_size,)
+
     def get_data(self) -> list:
         data = self.init_data[:]
+        if len(data) < self.buffer_size:
+            return data
         sum_el = 0
         for i in range(self.buffer_size):
             sum_el += self.init_data[i]
@@ -32,6 +49,9 @@ class ArithmeticMeanFilter(AbstractDataFilter):
             sum_el += self.init_data[i + self.buffer_size] - self.init_data[i]
         return data
 
+    def stream(self) -> AbstractStreamFilter:
+        return ArithmeticMeanStream(self.buffer_size)
+
 
 class MedianFilter(AbstractDataFilter):
     def __init__(self, data: list):
@@ -41,8 +61,13 @@ class MedianFilter(AbstractDataFilter):
     def set_params(self, buffer_size: int) -> None:
         self.buffer_size = buffer_size
 
+    def get_params(self) -> tuple:
+        return (self.buffer_size,)
+
     def get_data(self) -> list:
         data = self.init_data[:]
+        if len(data) < 1:
+            return data
         buffer = [data[0]] * self.buffer_size
         for i in range(len(data)):
             buffer = buffer[1:]
@@ -50,6 +75,9 @@ class MedianFilter(AbstractDataFilter):
             data[i] = st.median_grouped(buffer)
         return data
 
+    def stream(self) -> AbstractStreamFilter:
+        return MedianStream(self.buffer_size)
+
 
 class ExpEasyMeanFilter(AbstractDataFilter):
     def __init__(self, data: list):
@@ -63,8 +91,13 @@ class ExpEasyMeanFilter(AbstractDataFilter):
         self.max_k = max_k
         self.d = d
 
+    def get_params(self) -> tuple:
+        return self.s_k, self.max_k, self.d
+
     def get_data(self) -> list:
         data = self.init_data[:]
+        if len(data) < 1:
+            return data
         fit = data[0]
         for i in range(len(data)):
             k = self.s_k if (abs(data[i] - fit) < self.d) else self.max_k
@@ -72,6 +105,9 @@ class ExpEasyMeanFilter(AbstractDataFilter):
             data[i] = fit
         return data
 
+    def stream(self) -> AbstractStreamFilter:
+        return ExpEasyMeanStream(self.s_k, self.max_k, self.d)
+
 
 class NormaliseFilter(AbstractDataFilter):
     def __init__(self, data: list):
@@ -87,6 +123,9 @@ class NormaliseFilter(AbstractDataFilter):
         self.max_k = max_k
         self.d = d
 
+    def get_params(self) -> tuple:
+        return self.buffer_size, self.s_k, self.max_k, self.d
+
     def get_data(self) -> list:
         data = self.init_data[:]
         median_filter = MedianFilter(data)
@@ -95,6 +134,9 @@ class NormaliseFilter(AbstractDataFilter):
         exp_filter.set_params(self.s_k, self.max_k, self.d)
         return exp_filter.get_data()
 
+    def stream(self) -> AbstractStreamFilter:
+        return NormaliseStream(MedianStream(self.buffer_size), ExpEasyMeanStream(self.s_k, self.max_k, self.d))
+
 
 class KalmanFilter(AbstractDataFilter):
     def __init__(self, data: list):
@@ -105,6 +147,9 @@ class KalmanFilter(AbstractDataFilter):
     def set_params(self, q: float, r: float) -> None:
         pass
 
+    def get_params(self) -> tuple:
+        return self.q, self.r
+
     def get_data(self) -> list:
         data = self.init_data[:]
         accumulated_error = 1
@@ -117,3 +162,109 @@ class KalmanFilter(AbstractDataFilter):
             accumulated_error = ((1 - H) * old_error_all ** 2) ** (1 / 2)
             kalman_adc_old = kalman_adc
         return data
+
+    def stream(self) -> AbstractStreamFilter:
+        return KalmanStream(self.q, self.r)
+
+
+class ArithmeticMeanStream(AbstractStreamFilter):
+    def __init__(self, buffer_size_: int):
+        self.buffer_size = buffer_size_
+        self.mv = buffer_size_ // 2
+        self.window = deque(maxlen=buffer_size_)
+        self.count = 0
+        self.sum_el = 0
+
+    def feed(self, chunk_: list) -> list:
+        data = []
+        for value in chunk_:
+            if self.count < self.buffer_size:
+                self.sum_el += value
+                if self.count < self.mv:
+                    data.append(value)
+            else:
+                data.append(self.sum_el / self.buffer_size)
+                self.sum_el += value - self.window[0]
+            self.window.append(value)
+            self.count += 1
+        return data
+
+    def flush(self) -> list:
+        data = list(self.window)[self.mv:]
+        self.window.clear()
+        return data
+
+
+class MedianStream(AbstractStreamFilter):
+    def __init__(self, buffer_size_: int):
+        self.buffer_size = buffer_size_
+        self.buffer = None
+
+    def feed(self, chunk_: list) -> list:
+        data = []
+        for value in chunk_:
+            if self.buffer is None:
+                self.buffer = [value] * self.buffer_size
+            self.buffer = self.buffer[1:]
+            self.buffer.append(value)
+            data.append(st.median_grouped(self.buffer))
+        return data
+
+
+class ExpEasyMeanStream(AbstractStreamFilter):
+    def __init__(self, s_k_: float, max_k_: float, d_: float):
+        self.s_k = s_k_
+        self.max_k = max_k_
+        self.d = d_
+        self.fit = None
+
+    def feed(self, chunk_: list) -> list:
+        data = []
+        for value in chunk_:
+            if self.fit is None:
+                self.fit = value
+            k = self.s_k if (abs(value - self.fit) < self.d) else self.max_k
+            self.fit += (value - self.fit) * k
+            data.append(self.fit)
+        return data
+
+
+class NormaliseStream(AbstractStreamFilter):
+    def __init__(self, median_stream_: MedianStream, exp_stream_: ExpEasyMeanStream):
+        self.median_stream = median_stream_
+        self.exp_stream = exp_stream_
+
+    def feed(self, chunk_: list) -> list:
+        return self.exp_stream.feed(self.median_stream.feed(chunk_))
+
+    def flush(self) -> list:
+        return self.exp_stream.feed(self.median_stream.flush()) + self.exp_stream.flush()
+
+
+class KalmanStream(AbstractStreamFilter):
+    def __init__(self, q_: float, r_: float):
+        self.q = q_
+        self.r = r_
+        self.accumulated_error = 1
+        self.kalman_adc_old = 0
+
+    def feed(self, chunk_: list) -> list:
+        for value in chunk_:
+            old_input = value * 0.382 + self.kalman_adc_old * 0.618 if abs(value - self.kalman_adc_old) / 50 > 0.25 else self.kalman_adc_old
+            old_error_all = (self.accumulated_error ** 2 + self.q ** 2) ** (1 / 2)
+            H = old_error_all ** 2 / (old_error_all ** 2 + self.r ** 2)
+            kalman_adc = old_input + H * (value - old_input)
+            self.accumulated_error = ((1 - H) * old_error_all ** 2) ** (1 / 2)
+            self.kalman_adc_old = kalman_adc
+        return list(chunk_)
+
+
+def filter_chunks(filter_: AbstractDataFilter, chunks_):
+    stream = filter_.stream()
+    for chunk in chunks_:
+        data = stream.feed(chunk)
+        if len(data):
+            yield data
+    data = stream.flush()
+    if len(data):
+        yield data
@@ -0,0 +1,336 @@
+import os
+import itertools
+import numpy as np
+from uuid import uuid4
+from typing import TYPE_CHECKING
+from diagnostics import MyWarning, Diagnostics
+from decimation import MinMaxPyramid
+from data_cache import TraceCache, SummaryCache, MemoryAccountant, file_signature, estimate_nbytes
+from profiler import Profiler, span
+import config as cf
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class AbstractDataFrame:
+    def __init__(self, name_: str, parent_=None, id_=None):
+        self.name = name_
+        self.id = id_
+        if self.id is None:
+            self.id = uuid4()
+        self.active = True
+        self.data = None
+        self.origin_data = None
+        self.filt_data = None
+        self.header = None
+        self.parent = parent_
+
+    def __eq__(self, other_) -> bool:
+        return self.id == other_
+
+    def is_correct_read(self) -> bool:
+        return self.data is not None
+
+    def clear(self):
+        self.active = False
+        self.data = self.header = None
+
+    def swap_filt_data(self):
+        self.data, self.filt_data = self.filt_data, self.data
+
+    def swap_origin_data(self):
+        self.data, self.origin_data = self.origin_data, self.data
+
+    def _header_init(self): ...
+
+    def _data_init(self): ...
+
+
+class TraceData(dict):
+    clock = itertools.count()
+
+    def __init__(self, filename_: str, y_: list):
+        super().__init__(y=y_)
+        self.filename = filename_
+        self.last_access = next(TraceData.clock)
+
+    def __getitem__(self, key_):
+        self.touch()
+        return super().__getitem__(key_)
+
+    def __missing__(self, key_):
+        if key_ != 'y':
+            raise KeyError(key_)
+        data_y = XYDataFrame.read_trace(self.filename)['y']
+        self['y'] = data_y
+        Profiler().count('memory.reloads')
+        MemoryAccountant().charge(estimate_nbytes(data_y))
+        return data_y
+
+    def touch(self) -> None:
+        self.last_access = next(TraceData.clock)
+
+    def is_loaded(self) -> bool:
+        return 'y' in self
+
+
+class XYDataFrame(AbstractDataFrame):
+    def __init__(self, filename_: str, parent_=None, id_=None, diagnostics_: Diagnostics = None):
+        super().__init__(os.path.basename(filename_), parent_, id_)
+        self.filename = filename_
+        self.max_y = None
+        self.point_count = 0
+        self.summary = None
+        self.signature = None
+        self.pyramids = dict()
+
+        if not os.path.exists(self.filename) or not os.path.isfile(self.filename):
+            Diagnostics.current(diagnostics_).add(cf.FILE_NOT_EXIST_WARNING_TITLE,
+                                                  cf.FILE_NOT_EXIST_WARNING_MESSAGE_F(self.filename), self.filename)
+            self.clear()
+            return
+        try:
+            trace = self.read_trace(self.filename)
+        except MyWarning as mw:
+            Diagnostics.current(diagnostics_).add(mw.exception_title, mw.message, self.filename)
+            self.clear()
+            return
+        except:
+            Diagnostics.current(diagnostics_).add(cf.UNKNOWN_WARNING_TITLE, cf.UNKNOWN_WARNING_MESSAGE, self.filename)
+            self.clear()
+            return
+        self.signature = trace['signature']
+        self.header = trace['header']
+        self.origin_data = TraceData(self.filename, trace['y'])
+        self.data = self.origin_data
+        self.max_y = trace['max']
+        self.point_count = len(trace['y'])
+        MemoryAccountant().track(self)
+
+    @property
+    def nbytes(self) -> int:
+        return estimate_nbytes(self.origin_data) + estimate_nbytes(self.pyramids)
+
+    @property
+    def last_access(self) -> int:
+        return self.origin_data.last_access
+
+    def data_id(self) -> int:
+        return id(self.origin_data.get('y'))
+
+    def is_loaded(self) -> bool:
+        return self.origin_data is not None and self.origin_data.is_loaded()
+
+    def get_filter_input(self):
+        if self.is_loaded() or self.point_count < cf.STREAM_FILTER_MIN_POINTS:
+            return self.origin_data['y']
+        return self.read_chunks(self.filename, cf.DEFAULT_STREAM_CHUNK_SIZE)
+
+    def evict(self) -> None:
+        self.pyramids = dict()
+        self.origin_data.clear()
+
+    def clear(self):
+        self.active = False
+        self.data = self.header = self.max_y = None
+
+    def is_correct_read(self) -> bool:
+        return self.data is not None and self.header is not None
+
+    @staticmethod
+    def read_header(data_: 'pd.DataFrame', filename_: str) -> dict:
+        res = dict()
+        for i in range(cf.CSV_FILE_HEADER_SIZE):
+            dot_index = data_.iloc[i][0].find(':')
+            if dot_index == -1 or \
+                    data_.iloc[i][0][:dot_index] not in cf.CSV_FILE_HEADER_CONTENT:
+                raise MyWarning(cf.INCORRECT_FILE_CONTENT_WARNING_TITLE,
+                                cf.INCORRECT_FILE_HEADER_WARNING_MESSAGE_F(filename_))
+            header_name = data_.iloc[i][0][:dot_index]
+            res[header_name] = cf.CSV_FILE_HEADER_CONTENT[header_name] \
+                .get(data_.iloc[i][0][dot_index + 1:])
+            if header_name == cf.AMPLITUDE_HEADER:
+                res[header_name] *= 1 if data_.iloc[i][0][dot_index + 1:].lower().find('mv') else 10**-3
+        return res
+
+    @staticmethod
+    def check_header(filename_: str) -> None:
+        if file_signature(filename_) in TraceCache():
+            return
+        import pandas as pd
+        data = pd.read_csv(filename_, header=None, nrows=cf.CSV_FILE_HEADER_SIZE, on_bad_lines='skip',
+                           dtype=np.dtype(str))
+        XYDataFrame.read_header(data, filename_)
+
+    @staticmethod
+    def read_data_y(data_: 'pd.DataFrame') -> list:
+        return data_.drop(index=range(cf.CSV_FILE_HEADER_SIZE))[0].astype(float).values.tolist()
+
+    @staticmethod
+    def read_trace(filename_: str) -> dict:
+        signature = file_signature(filename_)
+        trace = TraceCache().get(signature)
+        if trace is None:
+            import pandas as pd
+            with span('parse.trace'):
+                data = pd.read_csv(filename_, header=None, on_bad_lines='skip', dtype=np.dtype(str))
+                header = XYDataFrame.read_header(data, filename_)
+                data_y = XYDataFrame.read_data_y(data)
+            Profiler().count('parse.files')
+            Profiler().count('parse.bytes_read', signature[2])
+            trace = {'signature': signature, 'header': header, 'y': data_y, 'max': max(data_y)}
+            TraceCache().put(signature, trace)
+        return trace
+
+    @staticmethod
+    def compute_summary(data_y_: list) -> dict:
+        data_y = np.asarray(data_y_, dtype=float)
+        return {'max': float(data_y.max()), 'min': float(data_y.min()),
+                'rms': float(np.sqrt(np.mean(data_y ** 2)))}
+
+    @staticmethod
+    def read_summary(filename_: str) -> dict:
+        signature = file_signature(filename_)
+        summary = SummaryCache().get(signature)
+        if summary is None:
+            summary = XYDataFrame.compute_summary(XYDataFrame.read_trace(filename_)['y'])
+            SummaryCache().put(signature, summary)
+        return summary
+
+    def get_summary(self) -> dict:
+        if self.summary is None:
+            self.summary = None if self.signature is None else SummaryCache().get(self.signature)
+        if self.summary is None:
+            self.summary = self.compute_summary(self.origin_data['y'])
+            if self.signature is not None:
+                SummaryCache().put(self.signature, self.summary)
+        return self.summary
+
+    def get_pyramid(self) -> MinMaxPyramid:
+        self.origin_data.touch()
+        data_y = self.data['y']
+        pyramid = self.pyramids.get(id(data_y))
+        if pyramid is None:
+            origin_y = self.origin_data.get('y')
+            self.pyramids = {key: value for key, value in self.pyramids.items() if value.source is origin_y}
+            pyramid = self.pyramids[id(data_y)] = MinMaxPyramid(data_y)
+            MemoryAccountant().charge(pyramid.nbytes)
+        return pyramid
+
+    @staticmethod
+    def read_chunks(filename_: str, chunk_size_: int = cf.DEFAULT_STREAM_CHUNK_SIZE):
+        import pandas as pd
+        with pd.read_csv(filename_, header=None, skiprows=cf.CSV_FILE_HEADER_SIZE, usecols=[0],
+                         on_bad_lines='skip', chunksize=chunk_size_) as reader:
+            for chunk in reader:
+                yield chunk[0].astype(float).values.tolist()
+
+    @staticmethod
+    def get_data_x(data_points_: int, time_base_: int, zero_index_: int = 0) -> dict:
+        x_data = {'x': []}
+        step = time_base_ * 32 / data_points_ * 10**-6
+        for i in range(data_points_):
+            x_data['x'].append((i - zero_index_) * step)
+        return x_data
+
+
+class MaxesDataFrame(AbstractDataFrame):
+    def __init__(self, name_: str, maxes_: list, parent_=None, max_value_: float = None, **kwargs):
+        super().__init__(name_, parent_)
+        self.data = {'x': [], 'y': maxes_, 'ry': []}
+        if 'x_list' in kwargs:
+            self.data['x'] = kwargs['x_list']
+        self.max_value = None
+
+        self._data_init(max_value_)
+        self.tmp_value = None
+
+    def max(self, max_value_: float = None) -> float:
+        if max_value_ is not None:
+            self.max_value = max_value_
+        if self.max_value is None and len(self.data['y']):
+            self.max_value = max(self.data['y'])
+        return self.max_value
+
+    def _data_init(self, max_value_: float = None) -> None:
+        self.compute_relative_data(max_value_)
+
+    def compute_relative_data(self, max_value_: float = None) -> None:
+        max_of_maxes = max_value_
+        if max_of_maxes is None:
+            max_of_maxes = self.max()
+        for max_ in self.data['y']:
+            self.data['ry'].append(max_ / max_of_maxes)
+
+    @staticmethod
+    def get_data_x(data_points_: int, start_point_: int = 0, step_: int = 1) -> dict:
+        x_dataframe = {'x': []}
+        for i in range(start_point_, start_point_ + data_points_ * step_, step_):
+            x_dataframe['x'].append(i)
+        return x_dataframe
+
+
+class SpectrumDataFrame(AbstractDataFrame):
+    def __init__(self, xy_dataframe_: XYDataFrame, frequencies_, amplitude_, parent_=None):
+        super().__init__(xy_dataframe_.name, parent_, xy_dataframe_.id)
+        self.filename = xy_dataframe_.filename
+        self.origin_data = {'x': frequencies_ * 10**-3, 'y': amplitude_}
+        self.data = self.origin_data
+
+
+def compute_depth_frame(data_frames_: dict, step_num_: int, mean_mode_: int, sensor_num_: int,
+                        is_relative_: bool) -> dict:
+    if len(data_frames_.keys()) < 1 or step_num_ not in data_frames_:
+        return None
+    frame = {'series': [], 'range': {'x': [None, None], 'y': [None, None]}}
+    range_list = frame['range']
+    for section_depth in data_frames_[step_num_].keys():
+        if mean_mode_ >= 0 and sensor_num_ not in data_frames_[step_num_][section_depth]:
+            continue
+        data_y_list = [section_depth + 8, section_depth]
+        range_list['y'][0] = min(data_y_list[1] if range_list['y'][0] is None else range_list['y'][0], data_y_list[1])
+        range_list['y'][1] = max(data_y_list[0] if range_list['y'][1] is None else range_list['y'][1], data_y_list[0])
+        data_x_list = [data_frames_[step_num_][section_depth][mean_mode_ if mean_mode_ < 0 else sensor_num_]['rx' if is_relative_ else "x"]] * 2
+        range_list['x'][0] = min(data_x_list[0] if range_list['x'][0] is None else range_list['x'][0], data_x_list[0])
+        range_list['x'][1] = max(data_x_list[1] if range_list['x'][1] is None else range_list['x'][1], data_x_list[1])
+        frame['series'].append((section_depth, data_x_list, data_y_list))
+    return frame
+
+
+class WindRoseFrames:
+    def __init__(self, data_frame_dict_: dict, is_relative_: bool = False):
+        self.section_names = list(data_frame_dict_.keys())
+        self.is_relative = is_relative_
+        self.top_y_lim = float('-inf')
+        frame_count = 0
+        for section_name in self.section_names:
+            for dataframe in data_frame_dict_[section_name]:
+                if dataframe.is_correct_read():
+                    frame_count = max(frame_count, len(dataframe.data['ry' if is_relative_ else 'y']))
+        self.data = np.full((frame_count, len(self.section_names), cf.DEFAULT_SENSOR_AMOUNT + 1), np.nan)
+
+        for s in range(len(self.section_names)):
+            frame = np.zeros((frame_count, cf.DEFAULT_SENSOR_AMOUNT + 1))
+            is_correct = np.ones(frame_count, dtype=bool)
+            for dataframe in data_frame_dict_[self.section_names[s]]:
+                if not dataframe.is_correct_read():
+                    is_correct[:] = False
+                    continue
+                values = dataframe.data['ry' if is_relative_ else 'y']
+                is_correct[len(values):] = False
+                if len(values) < 1 or dataframe.max() is None:
+                    continue
+                if int(dataframe.name) < cf.DEFAULT_SENSOR_AMOUNT + 1:
+                    frame[:len(values), int(dataframe.name)] = values
+                if dataframe.max() > self.top_y_lim:
+                    self.top_y_lim = dataframe.max()
+            frame[:, -1] = frame[:, 0]
+            frame[~is_correct] = np.nan
+            self.data[:, s] = frame
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def get_top_y_lim(self) -> float:
+        return 1 if self.is_relative or self.top_y_lim == float('-inf') else self.top_y_lim
@@ -0,0 +1,59 @@
+import numpy as np
+import config as cf
+
+
+class MinMaxPyramid:
+    def __init__(self, data_, base_bin_size_: int = cf.LOD_BASE_BIN_SIZE, level_factor_: int = cf.LOD_LEVEL_FACTOR):
+        self.source = data_
+        self.data = np.asarray(data_, dtype=float)
+        self.levels = []
+
+        mins = maxs = self.data
+        factor, bin_size = base_bin_size_, base_bin_size_
+        while len(self.data) >= bin_size * cf.LOD_MIN_BIN_COUNT:
+            mins = self.__reduce(mins, factor, np.min)
+            maxs = self.__reduce(maxs, factor, np.max)
+            self.levels.append((bin_size, mins, maxs))
+            factor = level_factor_
+            bin_size *= level_factor_
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + sum(mins.nbytes + maxs.nbytes for _, mins, maxs in self.levels)
+
+    @staticmethod
+    def __reduce(values_: np.ndarray, factor_: int, func_) -> np.ndarray:
+        pad = -len(values_) % factor_
+        if pad:
+            values_ = np.pad(values_, (0, pad), mode='edge')
+        return func_(values_.reshape(-1, factor_), axis=1)
+
+    def select_level(self, sample_count_: int, pixel_count_: int) -> int:
+        target_bin_size = sample_count_ / max(pixel_count_, 1)
+        level = None
+        for i in range(len(self.levels)):
+            if self.levels[i][0] <= target_bin_size:
+                level = i
+        return level
+
+    def get_view(self, start_: int, stop_: int, pixel_count_: int) -> tuple:
+        start, stop = max(int(start_), 0), min(int(stop_), len(self.data))
+        if stop <= start:
+            return np.empty(0, dtype=int), np.empty(0)
+        level = self.select_level(stop - start, pixel_count_)
+        if level is None:
+            return np.arange(start, stop), self.data[start:stop]
+
+        bin_size, mins, maxs = self.levels[level]
+        first, last = start // bin_size, -(-stop // bin_size)
+        bins = np.arange(first, last)
+        indices = np.empty(2 * len(bins), dtype=int)
+        indices[0::2] = bins * bin_size
+        indices[1::2] = np.minimum((bins + 1) * bin_size, len(self.data)) - 1
+        values = np.empty(2 * len(bins))
+        values[0::2] = mins[first:last]
+        values[1::2] = maxs[first:last]
+        return indices, values
@@ -0,0 +1,69 @@
+import threading
+from logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class MyWarning(Warning):
+    def __init__(self, exception_title_: str, message_: str):
+        self.message = message_
+        self.exception_title = exception_title_
+        super().__init__(self.message)
+
+
+class Diagnostic:
+    def __init__(self, title_: str, message_: str, path_: str = ''):
+        self.title = title_
+        self.message = message_
+        self.path = path_
+
+
+def print_diagnostic(diagnostic_: Diagnostic) -> None:
+    logger.warning('%s: %s', diagnostic_.title, diagnostic_.message)
+
+
+class Diagnostics:
+    local = threading.local()
+    default_sink = None
+
+    def __init__(self, sink_=None):
+        self.sink = sink_
+        self.items = []
+        self.keys = set()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, title_: str, message_: str, path_: str = '') -> None:
+        diagnostic = Diagnostic(title_, message_, path_)
+        if self.sink is not None:
+            self.sink(diagnostic)
+        elif (title_, message_, path_) not in self.keys:
+            self.keys.add((title_, message_, path_))
+            self.items.append(diagnostic)
+
+    def extend(self, diagnostics_) -> None:
+        for diagnostic in diagnostics_:
+            self.add(diagnostic.title, diagnostic.message, diagnostic.path)
+
+    def clear(self) -> None:
+        self.items = []
+        self.keys = set()
+
+    @staticmethod
+    def current(diagnostics_=None):
+        if diagnostics_ is not None:
+            return diagnostics_
+        diagnostics = getattr(Diagnostics.local, 'diagnostics', None)
+        if diagnostics is None:
+            diagnostics = Diagnostics(Diagnostics.default_sink)
+            Diagnostics.set_current(diagnostics)
+        return diagnostics
+
+    @staticmethod
+    def set_current(diagnostics_) -> None:
+        Diagnostics.local.diagnostics = diagnostics_
@@ -1,150 +1,16 @@
-import os
 import numpy as np
-import pandas as pd
 from uuid import uuid4
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QSizePolicy
 from PySide6.QtCore import QPoint, QRect
 from pyqtgraph import PlotWidget, mkPen
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-from third_party import MyWarning, MessageBox
+from dataframes import AbstractDataFrame, XYDataFrame, MaxesDataFrame, SpectrumDataFrame, WindRoseFrames, \
+    compute_depth_frame
+from profiler import span, profiled
 import config as cf
 
 
-class AbstractDataFrame:
-    def __init__(self, name_: str, parent_: QWidget = None):
-        self.name = name_
-        self.id = uuid4()
-        self.active = True
-        self.data = None
-        self.origin_data = None
-        self.filt_data = None
-        self.header = None
-        self.parent = parent_
-
-    def __eq__(self, other_) -> bool:
-        return self.id == other_
-
-    def is_correct_read(self) -> bool:
-        return self.data is not None
-
-    def clear(self):
-        self.active = False
-        self.data = self.header = None
-
-    def swap_filt_data(self):
-        self.data, self.filt_data = self.filt_data, self.data
-
-    def swap_origin_data(self):
-        self.data, self.origin_data = self.origin_data, self.data
-
-    def _header_init(self): ...
-
-    def _data_init(self): ...
-
-
-class XYDataFrame(AbstractDataFrame):
-    def __init__(self, filename_: str, parent_: QWidget = None):
-        super().__init__(os.path.basename(filename_), parent_)
-        self.filename = filename_
-        self.max_y = None
-        is_exception = False
-
-        if not os.path.exists(self.filename) or not os.path.isfile(self.filename):
-            MessageBox().warning(cf.FILE_NOT_EXIST_WARNING_TITLE, cf.FILE_NOT_EXIST_WARNING_MESSAGE_F(self.filename))
-        else:
-            self.data = pd.read_csv(self.filename, header=None, on_bad_lines='skip', dtype=np.dtype(str))
-        try:
-            self.header = self._header_init()
-        except MyWarning as mw:
-            MessageBox().warning(mw.exception_title, mw.message)
-            is_exception = True
-        except:
-            MessageBox().warning(cf.UNKNOWN_WARNING_TITLE, cf.UNKNOWN_WARNING_MESSAGE)
-            is_exception = True
-
-        if is_exception:
-            self.clear()
-        self._data_init()
-
-    def clear(self):
-        self.active = False
-        self.data = self.header = self.max_y = None
-
-    def is_correct_read(self) -> bool:
-        return self.data is not None and self.header is not None
-
-    def _header_init(self) -> dict:
-        res = dict()
-        for i in range(cf.CSV_FILE_HEADER_SIZE):
-            dot_index = self.data.iloc[i][0].find(':')
-            if dot_index == -1 or \
-                    self.data.iloc[i][0][:dot_index] not in cf.CSV_FILE_HEADER_CONTENT:
-                raise MyWarning(cf.INCORRECT_FILE_CONTENT_WARNING_TITLE,
-                                cf.INCORRECT_FILE_HEADER_WARNING_MESSAGE_F(self.filename))
-            header_name = self.data.iloc[i][0][:dot_index]
-            # print("HEADER: ", header_name, self.data.iloc[i][0][dot_index + 1:])
-            res[header_name] = cf.CSV_FILE_HEADER_CONTENT[header_name] \
-                .get(self.data.iloc[i][0][dot_index + 1:])
-            # print("GET SUCCESS")
-            if header_name == cf.AMPLITUDE_HEADER:
-                res[header_name] *= 1 if self.data.iloc[i][0][dot_index + 1:].lower().find('mv') else 10**-3
-        return res
-
-    def _data_init(self) -> None:
-        if not self.is_correct_read():
-            return
-
-        self.data = self.data.drop(index=[0, 1, 2, 3, 4, 5])
-        self.origin_data = {'y': self.data[0].astype(float).values.tolist()}
-        self.data = self.origin_data
-        self.max_y = max(self.data['y'])
-
-    @staticmethod
-    def get_data_x(data_points_: int, time_base_: int, zero_index_: int = 0) -> dict:
-        x_data = {'x': []}
-        step = time_base_ * 32 / data_points_ * 10**-6
-        for i in range(data_points_):
-            x_data['x'].append((i - zero_index_) * step)
-        return x_data
-
-
-class MaxesDataFrame(AbstractDataFrame):
-    def __init__(self, name_: str, maxes_: list, parent_: QWidget = None, max_value_: float = None, **kwargs):
-        super().__init__(name_, parent_)
-        self.data = {'x': [], 'y': maxes_, 'ry': []}
-        if 'x_list' in kwargs:
-            self.data['x'] = kwargs['x_list']
-        self.max_value = None
-
-        self._data_init(max_value_)
-        self.tmp_value = None
-
-    def max(self, max_value_: float = None) -> float:
-        if max_value_ is not None:
-            self.max_value = max_value_
-        if self.max_value is None and len(self.data['y']):
-            self.max_value = max(self.data['y'])
-        return self.max_value
-
-    def _data_init(self, max_value_: float = None) -> None:
-        self.compute_relative_data(max_value_)
-
-    def compute_relative_data(self, max_value_: float = None) -> None:
-        max_of_maxes = max_value_
-        if max_of_maxes is None:
-            max_of_maxes = self.max()
-        for max_ in self.data['y']:
-            self.data['ry'].append(max_ / max_of_maxes)
-
-    @staticmethod
-    def get_data_x(data_points_: int, start_point_: int = 0, step_: int = 1) -> dict:
-        x_dataframe = {'x': []}
-        for i in range(start_point_, start_point_ + data_points_ * step_, step_):
-            x_dataframe['x'].append(i)
-        return x_dataframe
-
-
 class AbstractQtGraphWidget(PlotWidget):
     def __init__(self, data_frames_, parent_: QWidget = None):
         super().__init__(parent_)
@@ -152,7 +18,9 @@ class AbstractQtGraphWidget(PlotWidget):
         self.data_frames = data_frames_
         self.dict_data_x = dict()
         self.base_init()
-        self.lines = []
+        self.series = dict()
+        self.series_states = dict()
+        self.updated_series_keys = set()
         self.legend = self.addLegend()
 
     def base_init(self):
@@ -163,65 +31,163 @@ class AbstractQtGraphWidget(PlotWidget):
 
     def data_x_init(self) -> None: ...
 
-    def recreate(self, data_frames_, **kwargs) -> None:
-        for line in self.lines:
-            line.clear()
-        self.data_frames = data_frames_
-        self.data_x_init()
-        # print("DATA SUCCESS")
-        self.base_init()
-        # print("BASE SUCCESS")
+    def update_series(self) -> None:
+        self.updated_series_keys = set()
         self.graph_init()
-        # print("GRAPH SUCCESS")
+        for key in list(self.series.keys()):
+            if key not in self.updated_series_keys:
+                self.remove_series(key)
+
+    def set_series(self, key_, data_x_, data_y_, name_: str, color_: str, width_: int = 1,
+                   is_visible_: bool = True, data_key_=None) -> None:
+        self.updated_series_keys.add(key_)
+        if key_ not in self.series:
+            line = self.plot(data_x_, data_y_, pen=mkPen(color_, width=width_))
+            self.series[key_] = line
+            self.series_states[key_] = {'data': (data_x_, data_y_) if data_key_ is None else data_key_,
+                                        'name': name_, 'pen': (color_, width_)}
+            self.legend.addItem(line, name_)
+        else:
+            line = self.series[key_]
+            state = self.series_states[key_]
+            self.set_series_data(key_, data_x_, data_y_, data_key_)
+            if state['name'] != name_:
+                state['name'] = name_
+                self.legend.getLabel(line).setText(name_)
+            if state['pen'] != (color_, width_):
+                state['pen'] = (color_, width_)
+                line.setPen(mkPen(color_, width=width_))
+        if line.isVisible() != is_visible_:
+            line.setVisible(is_visible_)
+
+    def set_series_data(self, key_, data_x_, data_y_, data_key_=None) -> None:
+        data_key = (data_x_, data_y_) if data_key_ is None else data_key_
+        state = self.series_states[key_]
+        if not self.is_same_data(state['data'], data_key):
+            state['data'] = data_key
+            self.series[key_].setData(data_x_, data_y_)
+
+    def set_series_visible(self, key_, is_visible_: bool) -> None:
+        if key_ in self.series and self.series[key_].isVisible() != is_visible_:
+            self.series[key_].setVisible(is_visible_)
+
+    def remove_series(self, key_) -> None:
+        line = self.series.pop(key_)
+        self.series_states.pop(key_)
+        self.legend.removeItem(line)
+        self.removeItem(line)
+
+    @staticmethod
+    def is_same_data(old_: tuple, new_: tuple) -> bool:
+        if len(old_) != len(new_):
+            return False
+        for i in range(len(old_)):
+            if old_[i] is new_[i]:
+                continue
+            if isinstance(old_[i], np.ndarray) or isinstance(new_[i], np.ndarray) or old_[i] != new_[i]:
+                return False
+        return True
+
+    def recreate(self, data_frames_, **kwargs) -> None:
+        with span('plot.' + type(self).__name__):
+            self.data_frames = data_frames_
+            self.data_x_init()
+            self.update_series()
 
 
 class OscilloscopeGraphWidget(AbstractQtGraphWidget):
     def __init__(self, data_frames_: dict, parent_: QWidget = None):
         super().__init__(data_frames_, parent_)
-        self.graph_init()
+        self.line_data_frames = []
+        self.is_lod_updating = False
+        self.update_series()
         self.setTitle("Данные осциллографа")
         self.setLabel('left', 'Напряжение (мВ)')
         self.setLabel('bottom', 'Время (с)')
+        self.getViewBox().sigXRangeChanged.connect(self.view_changed_action)
+        self.getViewBox().sigResized.connect(self.view_changed_action)
+
+    @staticmethod
+    def __get_data_x_key(dataframe_: XYDataFrame) -> tuple:
+        return dataframe_.header[cf.DATA_POINTS_HEADER], dataframe_.header[cf.TIME_BASE_HEADER], \
+            dataframe_.header[cf.ZERO_INDEX_HEADER]
 
     def data_x_init(self) -> None:
-        self.dict_data_x = dict()
+        dict_data_x = dict()
         for key in self.data_frames.keys():
             for dataframe in self.data_frames[key]:
-                if dataframe.header[cf.DATA_POINTS_HEADER] not in self.dict_data_x:
-                    self.dict_data_x[dataframe.header[cf.DATA_POINTS_HEADER]] = dict()
-                if dataframe.header[cf.TIME_BASE_HEADER] not in self.dict_data_x[dataframe.header[cf.DATA_POINTS_HEADER]]:
-                    self.dict_data_x[dataframe.header[cf.DATA_POINTS_HEADER]][dataframe.header[cf.TIME_BASE_HEADER]] \
-                        = XYDataFrame.get_data_x(dataframe.header[cf.DATA_POINTS_HEADER],
-                                                 dataframe.header[cf.TIME_BASE_HEADER],
-                                                 dataframe.header[cf.ZERO_INDEX_HEADER])
+                data_x_key = self.__get_data_x_key(dataframe)
+                if data_x_key not in dict_data_x:
+                    dict_data_x[data_x_key] = self.dict_data_x.get(data_x_key)
+                if dict_data_x[data_x_key] is None:
+                    dict_data_x[data_x_key] = np.asarray(XYDataFrame.get_data_x(*data_x_key)['x'])
+        self.dict_data_x = dict_data_x
+
+    def __get_data_x(self, dataframe_: XYDataFrame) -> np.ndarray:
+        return self.dict_data_x[self.__get_data_x_key(dataframe_)]
+
+    def __pixel_count(self) -> int:
+        width = int(self.getViewBox().width())
+        return width if width > 0 else cf.LOD_DEFAULT_PIXEL_COUNT
+
+    def __get_view_bounds(self, dataframe_: XYDataFrame) -> tuple:
+        start, stop = 0, len(dataframe_.data['y'])
+        if not self.getViewBox().autoRangeEnabled()[0]:
+            x_min, x_max = self.getViewBox().viewRange()[0]
+            data_x = self.__get_data_x(dataframe_)
+            start = max(int(np.searchsorted(data_x, x_min)) - 1, 0)
+            stop = min(int(np.searchsorted(data_x, x_max)) + 1, stop)
+        return start, stop
+
+    def __set_lod_data(self, dataframe_: XYDataFrame, pixel_count_: int, color_: str = None) -> None:
+        data_x = self.__get_data_x(dataframe_)
+        pyramid = dataframe_.get_pyramid()
+        start, stop = self.__get_view_bounds(dataframe_)
+        stop = min(stop, len(data_x))
+        data_key = (data_x, pyramid, start, stop, pixel_count_)
+        if color_ is None:
+            if not self.is_same_data(self.series_states[dataframe_.id]['data'], data_key):
+                indices, data_y = pyramid.get_view(start, stop, pixel_count_)
+                self.set_series_data(dataframe_.id, data_x[indices], data_y, data_key)
+            return
+        indices, data_y = pyramid.get_view(start, stop, pixel_count_)
+        self.set_series(dataframe_.id, data_x[indices], data_y, dataframe_.name, color_,
+                        is_visible_=dataframe_.active, data_key_=data_key)
 
     def graph_init(self) -> None:
-        self.legend.clear()
+        self.line_data_frames.clear()
         if len(self.data_frames.keys()) < 1:
             return
-        color_i, c = 0, 0
+        pixel_count = self.__pixel_count()
+        color_i = 0
         for key in self.data_frames.keys():
-            for i in range(len(self.data_frames[key])):
+            for dataframe in self.data_frames[key]:
                 if color_i >= len(cf.COLOR_NAMES):
                     color_i = 0
-                # print(self.data_frames[key][i].header[cf.DATA_POINTS_HEADER], self.data_frames[key][i].header[cf.TIME_BASE_HEADER])
-                if c >= len(self.lines):
-                    self.lines.append(self.plot(self.dict_data_x[self.data_frames[key][i].header[cf.DATA_POINTS_HEADER]]
-                                                [self.data_frames[key][i].header[cf.TIME_BASE_HEADER]]['x'],
-                                                self.data_frames[key][i].data["y"], pen=mkPen(cf.COLOR_NAMES[color_i])))
-                elif self.data_frames[key][i].active:
-                    self.lines[c].setData(self.dict_data_x[self.data_frames[key][i].header[cf.DATA_POINTS_HEADER]]
-                                          [self.data_frames[key][i].header[cf.TIME_BASE_HEADER]]['x'],
-                                          self.data_frames[key][i].data["y"])
-                self.legend.addItem(self.lines[c], self.data_frames[key][i].name)
-                c += 1
+                self.__set_lod_data(dataframe, pixel_count, cf.COLOR_NAMES[color_i])
+                self.line_data_frames.append(dataframe)
                 color_i += 1
 
+    def set_series_visible(self, key_, is_visible_: bool) -> None:
+        if is_visible_:
+            self.view_changed_action()
+        super().set_series_visible(key_, is_visible_)
+
+    def view_changed_action(self, *args) -> None:
+        if self.is_lod_updating or len(self.line_data_frames) < 1:
+            return
+        self.is_lod_updating = True
+        pixel_count = self.__pixel_count()
+        for dataframe in self.line_data_frames:
+            if dataframe.active and dataframe.id in self.series:
+                self.__set_lod_data(dataframe, pixel_count)
+        self.is_lod_updating = False
+
 
 class FrequencyResponseGraphWidget(AbstractQtGraphWidget):
     def __init__(self, data_frames_: dict, parent_: QWidget = None):
         super().__init__(data_frames_, parent_)
-        self.graph_init()
+        self.update_series()
         self.setTitle("Частотная характеристика")
         self.setLabel('left', 'U, В')
         self.setLabel('bottom', 'f, кГц')
@@ -230,28 +196,40 @@ class FrequencyResponseGraphWidget(AbstractQtGraphWidget):
         self.dict_data_x = {21: MaxesDataFrame.get_data_x(21, 4, 2)}
 
     def graph_init(self) -> None:
-        self.legend.clear()
         if len(self.data_frames.keys()) < 1:
             return
-        color_i, c = 0, 0
+        color_i = 0
         for key in self.data_frames.keys():
-            for i in range(len(self.data_frames[key])):
+            for dataframe in self.data_frames[key]:
                 if color_i >= len(cf.COLOR_NAMES):
                     color_i = 0
-                len_data = len(self.data_frames[key][i].data["y"])
+                len_data = len(dataframe.data["y"])
                 if len_data not in self.dict_data_x:
                     self.dict_data_x[len_data] = MaxesDataFrame.get_data_x(len_data, 4, 2)
-                if c >= len(self.lines):
-                    self.lines.append(self.plot(self.dict_data_x[len_data]['x'],
-                                                self.data_frames[key][i].data["y"],
-                                                pen=mkPen(cf.COLOR_NAMES[color_i], width=3)))
-                elif self.data_frames[key][i].active:
-                    self.lines[c].setData(self.dict_data_x[len_data]['x'],
-                                          self.data_frames[key][i].data["y"])
-                self.legend.addItem(self.lines[c], self.data_frames[key][i].name)
-                c += 1
+                self.set_series(dataframe.id, self.dict_data_x[len_data]['x'], dataframe.data["y"], dataframe.name,
+                                cf.COLOR_NAMES[color_i], 3, dataframe.active)
+                color_i += 1
+
+
+class SpectrumGraphWidget(AbstractQtGraphWidget):
+    def __init__(self, data_frames_: dict, parent_: QWidget = None):
+        super().__init__(data_frames_, parent_)
+        self.update_series()
+        self.setTitle("Спектр сигнала")
+        self.setLabel('left', 'Амплитуда (мВ)')
+        self.setLabel('bottom', 'f, кГц')
+
+    def graph_init(self) -> None:
+        if len(self.data_frames.keys()) < 1:
+            return
+        color_i = 0
+        for key in self.data_frames.keys():
+            for dataframe in self.data_frames[key]:
+                if color_i >= len(cf.COLOR_NAMES):
+                    color_i = 0
+                self.set_series(dataframe.id, dataframe.data["x"], dataframe.data["y"], key + '=' + dataframe.name,
+                                cf.COLOR_NAMES[color_i], is_visible_=dataframe.active)
                 color_i += 1
-            # break
 
 
 class AmplitudeTimeGraphWidget(AbstractQtGraphWidget):
@@ -261,7 +239,7 @@ class AmplitudeTimeGraphWidget(AbstractQtGraphWidget):
         self.mean_mode = -1
         self.sensor_num = -1
         self.is_relative = False
-        self.graph_init()
+        self.update_series()
         self.setTitle("Зависимость амплитуды во времени")
         self.setLabel('left', 'Значение')
         self.setLabel('bottom', 'Шаг')
@@ -271,64 +249,36 @@ class AmplitudeTimeGraphWidget(AbstractQtGraphWidget):
         pass
 
     def graph_init(self) -> None:
-        self.legend.clear()
         if len(self.data_frames.keys()) < 1:
             return
-        color_i, c = 0, 0
+        color_i = 0
         range_list = {'x': [None, None], 'y': [None, None]}
+        dataframes = []
         if self.section_name_mode is not None:
             if self.section_name_mode not in self.data_frames:
                 return
             for i in self.data_frames[self.section_name_mode].keys():
-                if i < 0:
-                    continue
-                if color_i >= len(cf.COLOR_NAMES):
-                    color_i = 0
-                minmaxes = {'x': [min(self.data_frames[self.section_name_mode][i].data['x']),
-                                  max(self.data_frames[self.section_name_mode][i].data['x'])],
-                            'y': [min(
-                                self.data_frames[self.section_name_mode][i].data['ry' if self.is_relative else "y"]),
-                                  max(self.data_frames[self.section_name_mode][i].data[
-                                          'ry' if self.is_relative else "y"])]}
-                range_list['x'][0] = minmaxes['x'][0] if range_list['x'][0] is None else  min(minmaxes['x'][0], range_list['x'][0])
-                range_list['x'][1] = minmaxes['x'][1] if range_list['x'][1] is None else max(minmaxes['x'][1], range_list['x'][1])
-                range_list['y'][0] = minmaxes['y'][0] if range_list['y'][0] is None else min(minmaxes['y'][0], range_list['y'][0])
-                range_list['y'][1] = minmaxes['y'][1] if range_list['y'][1] is None else max(minmaxes['y'][1], range_list['y'][1])
-                if c >= len(self.lines):
-                    self.lines.append(self.plot(self.data_frames[self.section_name_mode][i].data['x'],
-                                                self.data_frames[self.section_name_mode][i].data['ry' if self.is_relative else "y"],
-                                                pen=mkPen(cf.COLOR_NAMES[color_i])))
-                elif self.data_frames[self.section_name_mode][i].active:
-                    self.lines[c].setData(self.data_frames[self.section_name_mode][i].data["x"],
-                                          self.data_frames[self.section_name_mode][i].data['ry' if self.is_relative else "y"])
-                self.legend.addItem(self.lines[c], self.data_frames[self.section_name_mode][i].name)
-                c += 1
-                color_i += 1
+                if i >= 0:
+                    dataframes.append(self.data_frames[self.section_name_mode][i])
         else:
             i = self.mean_mode if self.mean_mode < 0 else self.sensor_num
             for key in self.data_frames.keys():
-                if i not in self.data_frames[key]:
-                    continue
-                if color_i >= len(cf.COLOR_NAMES):
-                    color_i = 0
-                minmaxes = {'x': [min(self.data_frames[key][i].data['x']), max(self.data_frames[key][i].data['x'])],
-                            'y': [min(self.data_frames[key][i].data['ry' if self.is_relative else "y"]),
-                                  max(self.data_frames[key][i].data['ry' if self.is_relative else "y"])]}
-                range_list['x'][0] = minmaxes['x'][0] if range_list['x'][0] is None else min(minmaxes['x'][0], range_list['x'][0])
-                range_list['x'][1] = minmaxes['x'][1] if range_list['x'][1] is None else max(minmaxes['x'][1], range_list['x'][1])
-                range_list['y'][0] = minmaxes['y'][0] if range_list['y'][0] is None else min(minmaxes['y'][0], range_list['y'][0])
-                range_list['y'][1] = minmaxes['y'][1] if range_list['y'][1] is None else max(minmaxes['y'][1], range_list['y'][1])
-                print(c, key, i, self.data_frames, self.dict_data_x, sep='\n')
-                if c >= len(self.lines):
-                    self.lines.append(self.plot(self.data_frames[key][i].data["x"],
-                                                self.data_frames[key][i].data['ry' if self.is_relative else "y"],
-                                                pen=mkPen(cf.COLOR_NAMES[color_i])))
-                elif self.data_frames[key][i].active:
-                    self.lines[c].setData(self.data_frames[key][i].data["x"],
-                                          self.data_frames[key][i].data['ry' if self.is_relative else "y"])
-                self.legend.addItem(self.lines[c], self.data_frames[key][i].name)
-                c += 1
-                color_i += 1
+                if i in self.data_frames[key]:
+                    dataframes.append(self.data_frames[key][i])
+        for dataframe in dataframes:
+            if color_i >= len(cf.COLOR_NAMES):
+                color_i = 0
+            data_y = dataframe.data['ry' if self.is_relative else "y"]
+            minmaxes = {'x': [min(dataframe.data['x']), max(dataframe.data['x'])], 'y': [min(data_y), max(data_y)]}
+            range_list['x'][0] = minmaxes['x'][0] if range_list['x'][0] is None else min(minmaxes['x'][0], range_list['x'][0])
+            range_list['x'][1] = minmaxes['x'][1] if range_list['x'][1] is None else max(minmaxes['x'][1], range_list['x'][1])
+            range_list['y'][0] = minmaxes['y'][0] if range_list['y'][0] is None else min(minmaxes['y'][0], range_list['y'][0])
+            range_list['y'][1] = minmaxes['y'][1] if range_list['y'][1] is None else max(minmaxes['y'][1], range_list['y'][1])
+            self.set_series(dataframe.id, dataframe.data["x"], data_y, dataframe.name, cf.COLOR_NAMES[color_i],
+                            is_visible_=dataframe.active)
+            color_i += 1
+        if len(dataframes) < 1:
+            return
         self.setXRange(range_list['x'][0], range_list['x'][1], padding=0.2)
         self.setYRange(range_list['y'][0], range_list['y'][1], padding=0.1)
 
@@ -347,7 +297,9 @@ class DepthResponseGraphWidget(AbstractQtGraphWidget):
         self.mean_mode = -1
         self.sensor_num = -1
         self.step_num = -1
-        self.graph_init()
+        self.frames = dict()
+        self.frames_source = None
+        self.update_series()
         self.setTitle("График соотношения глубины и абсолютной величины мощности сигнала")
         self.setLabel('left', 'Глубина (м)')
         self.setLabel('bottom', 'Мощность сигнала')
@@ -357,33 +309,40 @@ class DepthResponseGraphWidget(AbstractQtGraphWidget):
         pass
 
     def graph_init(self) -> None:
-        self.legend.clear()
-        if len(self.data_frames.keys()) < 1:
-            return
-        color_i, c = 0, 0
-        if self.step_num not in self.data_frames:
+        frame = self.get_frame(self.step_num)
+        if frame is None:
             return
-        range_list = {'x': [None, None], 'y': [None, None]}
-        for section_depth in self.data_frames[self.step_num].keys():
-            if self.mean_mode >= 0 and self.sensor_num not in self.data_frames[self.step_num][section_depth]:
-                continue
+        color_i = 0
+        for section_depth, data_x_list, data_y_list in frame['series']:
             if color_i >= len(cf.COLOR_NAMES):
                 color_i = 0
-            data_y_list = [section_depth + 8, section_depth]
-            range_list['y'][0] = min(data_y_list[1] if range_list['y'][0] is None else range_list['y'][0], data_y_list[1])
-            range_list['y'][1] = max(data_y_list[0] if range_list['y'][1] is None else range_list['y'][1], data_y_list[0])
-            data_x_list = [self.data_frames[self.step_num][section_depth][self.mean_mode if self.mean_mode < 0 else self.sensor_num]['rx' if self.is_relative else "x"]] * 2
-            range_list['x'][0] = min(data_x_list[0] if range_list['x'][0] is None else range_list['x'][0], data_x_list[0])
-            range_list['x'][1] = max(data_x_list[1] if range_list['x'][1] is None else range_list['x'][1], data_x_list[1])
-            if c >= len(self.lines):
-                self.lines.append(self.plot(data_x_list, data_y_list, pen=mkPen(cf.COLOR_NAMES[color_i], width=5)))
-            else:
-                self.lines[c].setData(data_x_list, data_y_list)
-            self.legend.addItem(self.lines[c], 'section=' + str(section_depth))
-            c += 1
+            self.set_series(section_depth, data_x_list, data_y_list, 'section=' + str(section_depth),
+                            cf.COLOR_NAMES[color_i], 5)
             color_i += 1
-        self.setXRange(range_list['x'][0], range_list['x'][1], padding=2.0)
-        self.setYRange(range_list['y'][0], range_list['y'][1], padding=0.1)
+        if frame['range']['x'][0] is None:
+            return
+        self.setXRange(frame['range']['x'][0], frame['range']['x'][1], padding=2.0)
+        self.setYRange(frame['range']['y'][0], frame['range']['y'][1], padding=0.1)
+
+    def get_frame_key(self, step_num_: int) -> tuple:
+        return step_num_, self.mean_mode, self.sensor_num, self.is_relative
+
+    def get_frame(self, step_num_: int) -> dict:
+        if self.frames_source is not self.data_frames:
+            self.frames_source = self.data_frames
+            self.frames = dict()
+        key = self.get_frame_key(step_num_)
+        if key not in self.frames:
+            self.frames[key] = self.compute_frame(self.data_frames, *key)
+        return self.frames[key]
+
+    def set_frames(self, data_frames_: dict, frames_: dict) -> None:
+        self.frames_source = data_frames_
+        self.frames = frames_
+
+    @staticmethod
+    def compute_frame(data_frames_: dict, step_num_: int, mean_mode_: int, sensor_num_: int, is_relative_: bool) -> dict:
+        return compute_depth_frame(data_frames_, step_num_, mean_mode_, sensor_num_, is_relative_)
 
     def recreate(self, data_frames_, **kwargs) -> None:
         self.is_relative = kwargs['is_relative'] if 'is_relative' in kwargs else False
@@ -422,28 +381,60 @@ class WindRoseGraphWidget(QWidget):
         self.setLayout(self.vbl)
 
         self.theta = np.array([0, 90, 180, 270, 360]) / 180 * np.pi
-
-    def set_data(self, data_frame_dict_: dict, index_: int = 0, is_relative_: bool = False):
-        top_y_lim = float('-inf')
-        for section_name in data_frame_dict_.keys():
-            is_active = True
-            data_list = [0] * (cf.DEFAULT_SENSOR_AMOUNT + 1)
-            for dataframe in data_frame_dict_[section_name]:
-                if not dataframe.is_correct_read() or not dataframe.active or \
-                        len(dataframe.data['ry' if is_relative_ else 'y']) <= index_ and \
-                        int(dataframe.name) < cf.DEFAULT_SENSOR_AMOUNT + 1:
-                    is_active = False
-                    continue
-                if dataframe.max() > top_y_lim:
-                    top_y_lim = dataframe.max()
-                data_list[int(dataframe.name)] = dataframe.data['ry' if is_relative_ else 'y'][index_]
-            data_list[-1] = data_list[0]
-            if is_active:
-                self.canvas.ax.plot(self.theta, data_list, label=section_name)
-        self.canvas.ax.set_ylim(0, 1 if is_relative_ or top_y_lim == float('-inf') else top_y_lim)
-        self.canvas.ax.legend()
+        self.frames = None
+        self.index = 0
+        self.lines = dict()
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self.draw_event_action)
+
+    @profiled('plot.WindRoseGraphWidget')
+    def set_frames(self, frames_: WindRoseFrames, visible_sections_: dict = None) -> None:
+        self.clear()
+        self.frames = frames_
+        self.index = 0
+        for s in range(len(frames_.section_names)):
+            section_name = frames_.section_names[s]
+            data = frames_.data[0, s] if len(frames_) > 0 else np.full(len(self.theta), np.nan)
+            self.lines[section_name] = self.canvas.ax.plot(self.theta, data, label=section_name, animated=True)[0]
+            if visible_sections_ is not None and section_name in visible_sections_:
+                self.lines[section_name].set_visible(visible_sections_[section_name])
+        self.canvas.ax.set_ylim(0, frames_.get_top_y_lim())
+        if len(self.lines) > 0:
+            self.canvas.ax.legend()
         self.canvas.draw()
 
+    def show_frame(self, index_: int) -> None:
+        if self.frames is None or index_ < 0 or index_ >= len(self.frames):
+            return
+        self.index = index_
+        for s in range(len(self.frames.section_names)):
+            self.lines[self.frames.section_names[s]].set_ydata(self.frames.data[index_, s])
+        self.__blit()
+
+    def set_section_visible(self, section_name_: str, is_visible_: bool) -> None:
+        if section_name_ in self.lines:
+            self.lines[section_name_].set_visible(is_visible_)
+            self.__blit()
+
+    def draw_event_action(self, event_) -> None:
+        self.background = self.canvas.copy_from_bbox(self.canvas.fig.bbox)
+        self.__draw_lines()
+
+    def __draw_lines(self) -> None:
+        for line in self.lines.values():
+            self.canvas.ax.draw_artist(line)
+
+    def __blit(self) -> None:
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self.__draw_lines()
+        self.canvas.blit(self.canvas.fig.bbox)
+
     def clear(self):
+        self.frames = None
+        self.lines.clear()
+        self.background = None
         self.canvas.ax.clear()
         self.canvas.axes_init()
@@ -1,10 +1,10 @@
 import sys
 import time
 import functools
-from PySide6.QtWidgets import QWidget, QLabel, QMenuBar
+from PySide6.QtWidgets import QWidget, QLabel, QMenuBar, QPushButton, QVBoxLayout, QProgressBar
 from PySide6.QtGui import QMovie
-from PySide6.QtCore import Qt, QSize, QObject, QThread, Signal
-from third_party import MyWarning, MessageBox
+from PySide6.QtCore import Qt, QSize, QObject, QRunnable, QThreadPool, Signal
+from third_party import MyWarning, MessageBox, ValidationReportDialog, Diagnostics, CancelToken, OperationCancelled, ProgressReporter
 import config as cf
 
 
@@ -18,13 +18,43 @@ class LoadLabel(QLabel):
         
         self.movie = QMovie(cf.LOAD_LABEL_PATH)
         self.setMovie(self.movie)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, cf.PROGRESS_BAR_MAXIMUM)
+        self.progress_label = QLabel(self)
+        self.progress_label.setAlignment(Qt.AlignCenter)
+        self.progress_label.setWordWrap(True)
+        self.progress_label.setStyleSheet("background-color: rgba(255, 255, 255, 180);")
+        self.cancel_button = QPushButton("Отмена", self)
+        self.__all_widgets_to_layout()
+
+    def __all_widgets_to_layout(self) -> None:
+        core_layout = QVBoxLayout()
+        core_layout.addStretch()
+        core_layout.addWidget(self.progress_bar)
+        core_layout.addWidget(self.progress_label)
+        core_layout.addWidget(self.cancel_button, alignment=Qt.AlignHCenter)
+        self.setLayout(core_layout)
+
+    def set_progress(self, done_: int, total_: int, item_: str, rate_: float, eta_: float) -> None:
+        self.progress_bar.setVisible(total_ > 0)
+        self.progress_label.setVisible(total_ > 0)
+        if total_ < 1:
+            return
+        self.progress_bar.setValue(done_ * cf.PROGRESS_BAR_MAXIMUM // total_)
+        self.progress_label.setText(cf.PROGRESS_INFO_MESSAGE_F(done_, total_, rate_, eta_))
+        self.progress_label.setToolTip(item_)
+        self.__set_actual_size(self.movie.currentImage().size())
     
     def __set_actual_size(self, image_size_: QSize):
         actual_size = QSize(200, 0)
-        actual_size.setHeight(image_size_.height() * actual_size.width() // image_size_.width())
+        actual_size.setHeight(max(image_size_.height() * actual_size.width() // image_size_.width(),
+                                  self.layout().totalHeightForWidth(actual_size.width())))
         self.setFixedSize(actual_size)
     
     def run(self) -> None:
+        self.cancel_button.setEnabled(True)
+        self.set_progress(0, 0, '', 0., -1.)
         self.movie.start()
         self.__set_actual_size(self.movie.currentImage().size())
         self.show()
@@ -32,88 +62,211 @@ class LoadLabel(QLabel):
     def stop(self) -> None:
         self.movie.stop()
         self.close()
-        
-class LoadWorker(QObject):
-    exception_signal = Signal(str, str)
-    complete = Signal(list)
-    def run(self, func_: classmethod, args: tuple, kwargs: dict) -> None:
-        print("Start Work in other Thread")
+
+
+class JobSignals(QObject):
+    complete = Signal(object, object)
+    cancelled = Signal(object)
+    progress = Signal(object, int, int, str, float, float)
+    exception_signal = Signal(object, str, str)
+
+
+class Job(QRunnable):
+    def __init__(self, key_, func_, args_: tuple, kwargs_: dict, priority_: int = cf.JOB_PRIORITY_NORMAL,
+                 is_modal_: bool = True):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key_
+        self.func = func_
+        self.args = args_
+        self.kwargs = kwargs_
+        self.priority = priority_
+        self.is_modal = is_modal_
+        self.is_started = False
+        self.callbacks = []
+        self.cancel_token = CancelToken()
+        self.diagnostics = Diagnostics()
+        self.signals = JobSignals()
+        self.progress_reporter = ProgressReporter(getattr(func_, '__qualname__', str(key_)), self.report_progress)
+
+    def report_progress(self, done_: int, total_: int, item_: str, rate_: float, eta_: float) -> None:
+        self.signals.progress.emit(self, done_, total_, item_, rate_, eta_)
+
+    def is_same_call(self, args_: tuple, kwargs_: dict) -> bool:
         try:
-            result = func_(*args, **kwargs)
-            self.complete.emit([result])
+            return bool(self.args == args_ and self.kwargs == kwargs_)
+        except BaseException:
+            return False
+
+    def add_callback(self, callback_) -> None:
+        if callback_ is not None and callback_ not in self.callbacks:
+            self.callbacks.append(callback_)
+
+    def run(self) -> None:
+        self.is_started = True
+        CancelToken.set_current(self.cancel_token)
+        ProgressReporter.set_current(self.progress_reporter)
+        Diagnostics.set_current(self.diagnostics)
+        try:
+            self.cancel_token.check()
+            result = self.func(*self.args, **self.kwargs)
+            self.signals.complete.emit(self, result)
+        except OperationCancelled:
+            self.signals.cancelled.emit(self)
         except MyWarning as mw:
-            self.exception_signal.emit(mw.exception_title, mw.message)
+            self.signals.exception_signal.emit(self, mw.exception_title, mw.message)
         except BaseException:
-            self.exception_signal.emit(cf.UNKNOWN_WARNING_TITLE, cf.UNKNOWN_WARNING_MESSAGE)
-        
-        
-class LoadDirector(QObject):
-    work_inition = Signal(classmethod, tuple, dict)
-
-
-class LoadThread:
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.is_busy = False
-        self.worker = LoadWorker()
-        self.director = LoadDirector()
-        self.load_label = LoadLabel()
-        self.work_thread = QThread()
-
-        self.worker.exception_signal.connect(self.exception)
-        self.worker.complete.connect(self.complete_work)
-        self.director.work_inition.connect(self.worker.run)
-        self.worker.moveToThread(self.work_thread)
-        
-        self.after_func = None
-        self.is_result_to_after = False
-        self.after_args = tuple()
-        self.after_kwargs = dict()
+            self.signals.exception_signal.emit(self, cf.UNKNOWN_WARNING_TITLE, cf.UNKNOWN_WARNING_MESSAGE)
+        finally:
+            CancelToken.set_current(None)
+            ProgressReporter.set_current(None)
+            Diagnostics.set_current(None)
 
-    def start_worker(self, func_, *args, **kwargs) -> bool:
-        if self.is_busy:
-            return False
-        self.is_busy = True
-        self.work_thread.start()
-        self.load_label.run()
-        self.director.work_inition.emit(func_, args, kwargs)        
-        return True
-    
-    def after_work(self, other_, after_func_: str, is_result_to_after_: bool = False, *args, **kwargs) -> None:
-        self.after_func = None if after_func_ is None else getattr(other_, after_func_)
-        self.is_result_to_after = is_result_to_after_
-        self.after_args = args
-        self.after_kwargs = kwargs
 
-    def exception(self, title_: str, message_: str) -> None:
+class JobScheduler(QObject):
+    def __init__(self):
+        if hasattr(self, 'pool'):
+            return
+        super().__init__()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(cf.JOB_SCHEDULER_MAX_THREADS)
+        self.jobs = dict()
+        self.active_jobs = set()
+        self.modal_job_count = 0
+        self.foreground_job_count = 0
+        self.load_label = None
+        self.report_dialog = None
+
+    def submit(self, key_, func_, args_: tuple = tuple(), kwargs_: dict = None, callback_=None,
+               priority_: int = cf.JOB_PRIORITY_NORMAL, is_modal_: bool = True) -> Job:
+        kwargs = dict() if kwargs_ is None else kwargs_
+        job = self.jobs.get(key_)
+        if job is not None and not job.is_started and not job.cancel_token.is_cancelled() \
+                and job.is_same_call(args_, kwargs):
+            job.add_callback(callback_)
+            if priority_ > job.priority and self.pool.tryTake(job):
+                if job.priority <= cf.JOB_PRIORITY_LOW < priority_:
+                    self.foreground_job_count += 1
+                job.priority = priority_
+                self.pool.start(job, job.priority)
+            return job
+
+        job = Job(key_, func_, args_, kwargs, priority_, is_modal_)
+        job.add_callback(callback_)
+        job.signals.complete.connect(self.complete_job)
+        job.signals.cancelled.connect(self.cancelled_job)
+        job.signals.progress.connect(self.progress_job)
+        job.signals.exception_signal.connect(self.exception)
+        self.jobs[key_] = job
+        self.active_jobs.add(job)
+        if job.priority > cf.JOB_PRIORITY_LOW:
+            self.foreground_job_count += 1
+        if job.is_modal:
+            self.modal_job_count += 1
+            if self.modal_job_count == 1:
+                self.__get_load_label().run()
+        self.pool.start(job, job.priority)
+        return job
+
+    def pending_count(self) -> int:
+        return len(self.active_jobs)
+
+    def wait_for_done(self, msecs_: int = -1) -> bool:
+        return self.pool.waitForDone(msecs_)
+
+    def cancel_job(self, job_: Job) -> None:
+        job_.cancel_token.cancel()
+        if not job_.is_started and self.pool.tryTake(job_):
+            self.__finish_job(job_)
+
+    def cancel_modal_jobs(self) -> None:
+        self.__get_load_label().cancel_button.setEnabled(False)
+        for job in list(self.active_jobs):
+            if job.is_modal:
+                self.cancel_job(job)
+
+    def __get_load_label(self) -> LoadLabel:
+        if self.load_label is None:
+            self.load_label = LoadLabel()
+            self.load_label.cancel_button.clicked.connect(self.cancel_modal_jobs)
+        return self.load_label
+
+    def show_diagnostics(self, diagnostics_: Diagnostics) -> None:
+        if len(diagnostics_) < 1:
+            return
+        is_report_visible = self.report_dialog is not None and self.report_dialog.isVisible()
+        if MessageBox.is_headless or len(diagnostics_) == 1 and not is_report_visible:
+            for diagnostic in diagnostics_:
+                MessageBox().warning(diagnostic.title, diagnostic.message)
+            return
+        if self.report_dialog is None:
+            self.report_dialog = ValidationReportDialog()
+        self.report_dialog.run(diagnostics_)
+
+    def __finish_job(self, job_: Job) -> None:
+        if job_ not in self.active_jobs:
+            return
+        self.active_jobs.discard(job_)
+        if self.jobs.get(job_.key) is job_:
+            self.jobs.pop(job_.key)
+        if job_.priority > cf.JOB_PRIORITY_LOW:
+            self.foreground_job_count -= 1
+        if job_.is_modal:
+            self.modal_job_count -= 1
+            if self.modal_job_count < 1:
+                self.__get_load_label().stop()
+        self.show_diagnostics(job_.diagnostics)
+        job_.diagnostics.clear()
+
+    def progress_job(self, job_: Job, done_: int, total_: int, item_: str, rate_: float, eta_: float) -> None:
+        if job_.is_modal and job_ in self.active_jobs:
+            self.__get_load_label().set_progress(done_, total_, item_, rate_, eta_)
+
+    def cancelled_job(self, job_: Job) -> None:
+        self.__finish_job(job_)
+
+    def exception(self, job_: Job, title_: str, message_: str) -> None:
+        self.__finish_job(job_)
         MessageBox().warning(title_, message_)
-        self.is_busy = False
-        self.load_label.stop()
-        self.work_thread.terminate()
-    
-    def complete_work(self, list_result_: list) -> None:
-        work_result = list_result_[0]
-        self.is_busy = False
-        self.load_label.stop()
-        self.work_thread.terminate()
-        if self.after_func is not None:
-            if self.is_result_to_after:
-                self.after_func(work_result, *self.after_args, **self.after_kwargs)
-            else:
-                self.after_func(*self.after_args, **self.after_kwargs)
-    
+
+    def complete_job(self, job_: Job, result_) -> None:
+        self.__finish_job(job_)
+        for callback in job_.callbacks:
+            callback(result_)
+
     def __new__(cls):
         if not hasattr(cls, 'instance'):
-            cls.instance = super(LoadThread, cls).__new__(cls)
+            cls.instance = super(JobScheduler, cls).__new__(cls)
         return cls.instance
-    
 
-def loading(after_func_: str = None, is_result_to_it_: bool = False, *after_args, **after_kwargs):
+
+class JobCallback:
+    def __init__(self, func_, is_result_to_it_: bool, args_: tuple, kwargs_: dict):
+        self.func = func_
+        self.is_result_to_it = is_result_to_it_
+        self.args = args_
+        self.kwargs = kwargs_
+
+    def __call__(self, result_) -> None:
+        if self.is_result_to_it:
+            self.func(result_, *self.args, **self.kwargs)
+        else:
+            self.func(*self.args, **self.kwargs)
+
+    def __eq__(self, other_) -> bool:
+        return isinstance(other_, JobCallback) and self.func == other_.func and \
+            self.is_result_to_it == other_.is_result_to_it and self.args == other_.args and \
+            self.kwargs == other_.kwargs
+
+
+def loading(after_func_: str = None, is_result_to_it_: bool = False, *after_args,
+            priority_: int = cf.JOB_PRIORITY_NORMAL, **after_kwargs):
     def loading_decorator(func_):
         @functools.wraps(func_)
         def wrapper(self, *args, **kwargs):
-            threads = LoadThread()
-            threads.after_work(self, after_func_, is_result_to_it_, *after_args, **after_kwargs)
-            threads.start_worker(func_, self, *args, **kwargs)
+            callback = None
+            if after_func_ is not None:
+                callback = JobCallback(getattr(self, after_func_), is_result_to_it_, after_args, after_kwargs)
+            JobScheduler().submit((id(self), func_.__qualname__), func_, (self,) + args, kwargs, callback, priority_)
         return wrapper
-    return loading_decorator
\ No newline at end of file
+    return loading_decorator
@@ -0,0 +1,33 @@
+import os
+import sys
+import logging
+import config as cf
+
+
+class LazyMessage:
+    def __init__(self, func_, *args, **kwargs):
+        self.func = func_
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args, **self.kwargs))
+
+
+def get_logger(name_: str = '') -> logging.Logger:
+    return logging.getLogger(cf.LOGGER_NAME + '.' + name_ if len(name_) > 0 else cf.LOGGER_NAME)
+
+
+def get_log_level(level_: str = None):
+    level = level_ if level_ is not None else os.environ.get(cf.LOG_LEVEL_ENV_VAR, cf.DEFAULT_LOG_LEVEL)
+    return int(level) if str(level).isdigit() else str(level).upper()
+
+
+def setup_logging(level_: str = None) -> None:
+    logger = get_logger()
+    logger.setLevel(get_log_level(level_))
+    if len(logger.handlers) < 1:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(cf.LOG_FORMAT))
+        logger.addHandler(handler)
+        logger.propagate = False
@@ -6,21 +6,30 @@ from time import gmtime, strftime
 from PySide6.QtWidgets import QApplication, QMainWindow, QFileDialog, QCheckBox, \
     QVBoxLayout, QHBoxLayout, QPushButton, QWidget, QFormLayout, QLayout, QMenuBar, \
     QTableWidget, QTableWidgetItem, QLabel, QSlider, QLineEdit, QComboBox
-from PySide6.QtGui import QScreen, QIcon, QPixmap, QIntValidator, QDoubleValidator, QPainter, QPen
-from PySide6.QtCore import Qt, QPoint, QSize, QRect, QLine
-from PySide6.QtWidgets import QAbstractItemView
-from graph_widget import OscilloscopeGraphWidget, AmplitudeTimeGraphWidget,\
-    FrequencyResponseGraphWidget, WindRoseGraphWidget, DepthResponseGraphWidget
-from third_party import AbstractFunctor, HelpInfoDialog, SimpleItemListWidget, \
+from PySide6.QtGui import QIcon, QPixmap, QIntValidator, QDoubleValidator, QPainter, QPen, QImage
+from PySide6.QtCore import Qt, QPoint, QSize, QRect, QLine, QAbstractTableModel, QAbstractItemModel, QModelIndex, \
+    Signal
+from PySide6.QtWidgets import QAbstractItemView, QTableView, QHeaderView, QTreeView
+from third_party import CancelToken, ProgressReporter, AbstractFunctor, HelpInfoDialog, SimpleItemListWidget, \
     select_path_to_files, select_path_to_dir, ListWidget, AbstractWindowWidget, \
-    MyCheckBox, ButtonWidget, MessageBox, get_last_project_path, AbstractToolDialog
+    MyCheckBox, ButtonWidget, MessageBox, get_last_project_path, AbstractToolDialog, ProfilerDialog, \
+    MemoryReportDialog
 from loadlabel import loading
 from borehole_logic import *
 from data_filter import *
+from dataframes import WindRoseFrames, SpectrumDataFrame, compute_depth_frame
 from converter import ConverterDialog
+from data_cache import FilteredDataCache, MemoryAccountant
+from spectral import get_spectra
+from prefetch import CachePrefetcher
+from profiler import Profiler, profiled
+from logger import get_logger
 import config as cf
 
 
+logger = get_logger(__name__)
+
+
 # DONE 0) get XYDataFrame in Borehole
 # DONE 1) Amplitude time graph
 # DONE 2) Оптимизация датафреймов ???
@@ -340,9 +349,18 @@ class BoreholeMenuWindowWidget(QWidget):
             amplitude_action_btn.triggered.connect(self.borehole_window.plot_amplitude_time_action)
             depth_resp_action_btn = self.select_graph_menu_btn.addAction('&Глубинная характеристика', 'Ctrl+g+5')
             depth_resp_action_btn.triggered.connect(self.borehole_window.plot_depth_response_action)
+            spectrum_action_btn = self.select_graph_menu_btn.addAction('&Спектр', 'Ctrl+g+6')
+            spectrum_action_btn.triggered.connect(self.borehole_window.plot_spectrum_action)
 
         def __view_menu_init(self) -> None:
-            pass
+            profiling_action_btn = self.view_menu_btn.addAction('&Профилирование')
+            profiling_action_btn.setCheckable(True)
+            profiling_action_btn.setChecked(Profiler().is_enabled)
+            profiling_action_btn.toggled.connect(self.borehole_window.profiling_toggle_action)
+            profiler_action_btn = self.view_menu_btn.addAction('&Панель профилирования', 'Ctrl+p')
+            profiler_action_btn.triggered.connect(self.borehole_window.profiler_action)
+            memory_action_btn = self.view_menu_btn.addAction('&Память')
+            memory_action_btn.triggered.connect(self.borehole_window.memory_report_action)
 
     def __init__(self, path_: str, main_window_: MainWindow):
         super().__init__(main_window_)
@@ -357,28 +375,45 @@ class BoreholeMenuWindowWidget(QWidget):
 
         self.borehole = Borehole(self.name, str(pathlib.Path(path_).parent))
         self.borehole_dialog = BoreHoleDialog(self.borehole, self)
+        self.borehole_dialog.borehole_changed.connect(self.borehole_changed_action)
         self.converter_dialog = ConverterDialog(self)
+        self.profiler_dialog = ProfilerDialog(self)
+        self.memory_report_dialog = MemoryReportDialog(self)
+        self.report_dir = None
+        self.report_paths = []
 
         self.borehole_menu_widget = BoreHoleMenuWidget(self.name, self)
-        self.graph_window_widgets = {
-            'oscilloscope': OscilloscopeGraphWindowWidget(self),
-            'frequency': FrequencyResponseGraphWindowWidget(self),
-            'amplitude': AmplitudeTimeGraphWindowWidget(self),
-            'depth': DepthResponseGraphWindowWidget(self),
-            'windrose': WindRoseGraphWindowWidget(self),
+        self.graph_window_classes = {
+            'oscilloscope': OscilloscopeGraphWindowWidget,
+            'frequency': FrequencyResponseGraphWindowWidget,
+            'amplitude': AmplitudeTimeGraphWindowWidget,
+            'depth': DepthResponseGraphWindowWidget,
+            'windrose': WindRoseGraphWindowWidget,
+            'spectrum': SpectrumGraphWindowWidget,
         }
+        self.graph_window_widgets = dict()
 
         top_menu_bar_init = self.TopMenuBarInit(self)
         self.__all_widgets_to_layout()
         self.borehole_menu_action()
+        self.validate_action()
+
+        self.prefetcher = CachePrefetcher(self.borehole)
+        if cf.IS_PREFETCH_ON_OPEN:
+            self.prefetcher.start()
 
     def __all_widgets_to_layout(self) -> None:
         core_layout = QVBoxLayout()
         core_layout.addWidget(self.borehole_menu_widget)
-        for key in self.graph_window_widgets.keys():
-            core_layout.addWidget(self.graph_window_widgets[key])
         self.setLayout(core_layout)
 
+    def get_graph_window_widget(self, name_: str):
+        if name_ not in self.graph_window_widgets and name_ in self.graph_window_classes:
+            self.graph_window_widgets[name_] = self.graph_window_classes[name_](self)
+            self.graph_window_widgets[name_].activate(False)
+            self.layout().addWidget(self.graph_window_widgets[name_])
+        return self.graph_window_widgets.get(name_)
+
     def __deactivate_all(self, is_deactivate_: bool = True) -> None:
         self.borehole_menu_widget.activate(not is_deactivate_)
         for key in self.graph_window_widgets.keys():
@@ -386,14 +421,48 @@ class BoreholeMenuWindowWidget(QWidget):
     
     def set_borehole_action(self) -> None:
         self.borehole_dialog.run()
+
+    def profiling_toggle_action(self, state_: bool) -> None:
+        Profiler().enable(state_)
+
+    def profiler_action(self) -> None:
+        self.profiler_dialog.run()
+
+    def memory_report_action(self) -> None:
+        self.memory_report_dialog.run()
+
+    @loading(priority_=cf.JOB_PRIORITY_HIGH)
+    def validate_action(self) -> None:
+        self.borehole.validate()
+
+    def borehole_changed_action(self, change_set_: dict) -> None:
+        self.validate_action()
+        if cf.IS_PREFETCH_ON_OPEN:
+            self.prefetcher.restart()
+        for key in self.graph_window_widgets.keys():
+            self.graph_window_widgets[key].invalidate_data(change_set_)
     
     def converter_action(self) -> None:
         self.converter_dialog.run()
 
     def response_action(self) -> None:
-        pass
+        path = select_path_to_dir(self, dir=str(pathlib.Path().resolve() / cf.DEFAULT_FOLDER_NAME_TO_SAVE))
+        if path is None or len(path) < 1:
+            return
+        self.report_dir = path
+        self.export_report_action()
+
+    @loading('report_complete_action')
+    def export_report_action(self) -> None:
+        from report_export import export_borehole_report
+        self.report_paths = export_borehole_report(self.borehole, self.report_dir)
+
+    def report_complete_action(self) -> None:
+        MessageBox().information(cf.REPORT_COMPLETE_INFO_TITLE,
+                                 cf.REPORT_COMPLETE_INFO_MESSAGE_F(len(self.report_paths), self.report_dir))
 
     def back_main_menu_action(self) -> None:
+        self.prefetcher.stop()
         self.main_window.menuBar().clear()
         self.main_window.run_main_menu()
 
@@ -403,8 +472,9 @@ class BoreholeMenuWindowWidget(QWidget):
 
     def __plot_graph_action_interface(self, name_: str) -> None:
         self.__deactivate_all()
-        if name_ in self.graph_window_widgets:
-            self.graph_window_widgets[name_].activate()
+        graph_window_widget = self.get_graph_window_widget(name_)
+        if graph_window_widget is not None:
+            graph_window_widget.activate()
 
     def plot_oscilloscope_action(self) -> None:
         self.__plot_graph_action_interface('oscilloscope')
@@ -421,6 +491,9 @@ class BoreholeMenuWindowWidget(QWidget):
     def plot_wind_rose_action(self) -> None:
         self.__plot_graph_action_interface('windrose')
 
+    def plot_spectrum_action(self) -> None:
+        self.__plot_graph_action_interface('spectrum')
+
 
 class BoreHoleMenuWidget(AbstractWindowWidget):
     def __init__(self, name_: str, borehole_window_: BoreholeMenuWindowWidget):
@@ -442,6 +515,7 @@ class BoreHoleMenuWidget(AbstractWindowWidget):
         self.graph_button_list.add_item("Построить круговую диаграмму", action=self.borehole_window.plot_wind_rose_action)
         self.graph_button_list.add_item("Построить зависимости амплитуды во времени", action=self.borehole_window.plot_amplitude_time_action)
         self.graph_button_list.add_item("Построить глубинную характеристику", action=self.borehole_window.plot_depth_response_action)
+        self.graph_button_list.add_item("Построить спектр", action=self.borehole_window.plot_spectrum_action)
         self.graph_button_list.add_item("Назад", action=self.back_from_graph_list)
         self.graph_button_list.setVisible(False)
 
@@ -478,17 +552,31 @@ class BoreHoleMenuWidget(AbstractWindowWidget):
 
 
 class BoreHoleDialog(AbstractToolDialog):
+    borehole_changed = Signal(dict)
+
     def __init__(self, borehole_: Borehole, parent_: QWidget = None):
         super().__init__(cf.BOREHOLE_SETTINGS_DIALOG_TITLE, parent_)
         self.borehole = borehole_
+        self.change_set = dict()
         self.setWindowModality(Qt.ApplicationModal)
         self.setMinimumSize(800, 500)
 
-        self.section_list_widget = ListWidget(self)
+        self.tree_model = BoreholeTreeModel(self)
+        self.tree_view = QTreeView(self)
+        self.__tree_view_init()
 
         self.add_button = QPushButton("+ Добавить секцию", self)
         self.add_button.clicked.connect(self.add_section_action)
 
+        self.add_step_button = QPushButton("+ Добавить шаг", self)
+        self.add_step_button.clicked.connect(self.add_step_action)
+
+        self.add_files_button = QPushButton("+ Добавить файлы", self)
+        self.add_files_button.clicked.connect(self.add_files_action)
+
+        self.delete_button = QPushButton("Удалить", self)
+        self.delete_button.clicked.connect(self.delete_action)
+
         self.accept_button = QPushButton("Принять", self)
         self.accept_button.clicked.connect(self.accept_action)
 
@@ -498,35 +586,88 @@ class BoreHoleDialog(AbstractToolDialog):
 
         self.__all_widgets_to_layout()
 
+    def __tree_view_init(self) -> None:
+        self.tree_view.setModel(self.tree_model)
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tree_view.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
+        self.tree_view.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree_view.header().setStretchLastSection(False)
+
     def __all_widgets_to_layout(self) -> None:
+        edit_layout = QHBoxLayout()
+        edit_layout.addWidget(self.add_button)
+        edit_layout.addWidget(self.add_step_button)
+        edit_layout.addWidget(self.add_files_button)
+        edit_layout.addWidget(self.delete_button)
+
         tmp_layout = QHBoxLayout()
         tmp_layout.addWidget(self.accept_button)
         tmp_layout.addWidget(self.cancel_button)
 
         core_layout = QVBoxLayout()
-        core_layout.addWidget(self.section_list_widget)
-        core_layout.addWidget(self.add_button)
+        core_layout.addWidget(self.tree_view)
+        core_layout.addLayout(edit_layout)
         core_layout.addLayout(tmp_layout)
         self.setLayout(core_layout)
 
+    def __current_index(self, item_type_: type) -> QModelIndex:
+        index = self.tree_view.currentIndex()
+        while index.isValid() and not isinstance(self.tree_model.get_item(index), item_type_):
+            index = index.parent()
+        return index.siblingAtColumn(0) if index.isValid() else index
+
     def add_section(self, name_: str, depth_: int = 0, length_: float = 0., id_: str = None) -> None:
-        self.section_list_widget.add_widget(SectionWidget(name_, self.section_list_widget, depth_, length_, id_))
+        self.tree_model.add_section(name_, depth_, length_, id_)
 
     def add_section_action(self) -> None:
         len_default_name = len(cf.DEFAULT_SECTION_NAME)
         max_section_number = -1
-        for section in self.section_list_widget.widget_list:
+        for section in self.tree_model.root_item.children:
             if section.name[:len_default_name] == cf.DEFAULT_SECTION_NAME and section.name[len_default_name:].isdigit():
                 max_section_number = max(int(section.name[len_default_name:]), max_section_number)
         self.add_section(cf.DEFAULT_SECTION_NAME + str(max_section_number + 1))
 
-    def save_all_sections(self, up_path_: str) -> None:
+    def add_step_action(self) -> None:
+        section_index = self.__current_index(SectionTreeItem)
+        if not section_index.isValid():
+            return
+        self.tree_model.fetch_all(section_index)
+        max_number = -1
+        for step in self.tree_model.get_item(section_index).children:
+            max_number = max(step.number, max_number)
+        self.tree_model.add_step(section_index, max_number + 1)
+        self.tree_view.expand(section_index)
+
+    def add_files_action(self) -> None:
+        step_index = self.__current_index(StepTreeItem)
+        if not step_index.isValid():
+            return
+        got_file_list = select_path_to_files(cf.FILE_DIALOG_CSV_FILTER, self, dir=cf.DEFAULT_DATA_FOLDER)
+        self.tree_model.fetch_all(step_index)
+        for filename in got_file_list:
+            self.tree_model.add_file(step_index, filename)
+        self.tree_view.expand(step_index)
+
+    def delete_action(self) -> None:
+        index = self.tree_view.currentIndex()
+        if index.isValid():
+            self.tree_model.remove_item(index)
+
+    def save_all_sections(self, up_path_: str, cancel_token_: CancelToken = None) -> None:
+        cancel_token = CancelToken.current(cancel_token_)
+        cancel_token.check()
+        file_count = 0
+        for section in self.tree_model.root_item.children:
+            for step in section.children:
+                file_count += len(step.children)
+        ProgressReporter.current().start(file_count)
         borehole_path = self.borehole.path()
         for filename in pathlib.Path(borehole_path).glob('*'):
             is_inside_widget_list = False
             file_base_name = os.path.basename(filename)
             if os.path.isdir(filename):
-                for section in self.section_list_widget.widget_list:
+                for section in self.tree_model.root_item.children:
                     if section.name == file_base_name:
                         is_inside_widget_list = True
                         break
@@ -537,240 +678,142 @@ class BoreHoleDialog(AbstractToolDialog):
                     shutil.rmtree(filename)
                 else:
                     os.remove(filename)
-        for section in self.section_list_widget.widget_list:
-            section.save_all(borehole_path)
+        for section in self.tree_model.root_item.children:
+            section.save_all(borehole_path, cancel_token)
 
-    @loading('cancel_action')
     def accept_action(self) -> None:
-        self.save_all_sections(self.borehole.up_path)
-
-        print('______________________________')
-        print("Widget")
-        for section in self.section_list_widget.widget_list:
-            print('sec\t', section.name)
-            for step in section.step_list.widget_list:
-                print('\tstep\t', step.number)
-                for file in step.file_list.widget_list:
-                    print('\t\tf\t', file.path)
-
-        self.borehole.correlate_data()
-
-        print('______________________________')
-        print("OUT:", self.borehole.path())
-        for section in self.borehole.section_list:
-            for section_w in self.section_list_widget.widget_list:
-                if section.name == section_w.name:
-                    section.select(section_w.is_selected())
-                    for step in section.step_list:
-                        for step_w in section_w.step_list.widget_list:
-                            if step_w.number == step.number:
-                                step.select(step_w.is_selected())
-                                for file in step.data_list:
-                                    for file_w in step_w.file_list.widget_list:
-                                        if file.name == os.path.basename(file_w.path):
-                                            file.select(file_w.is_selected())
-                                            break
-                                break
-                    break
-
-
-            print('sec\t', section.path())
-            for step in section.step_list:
-                print('\tstep\t', step.path())
-                for file in step.data_list:
-                    print('\t\tf\t', file.path())
-            for section_w in self.section_list_widget.widget_list:
-                if section.name == section_w.name:
-                    section.depth = section_w.depth
-                    section.length = section_w.length
-        print('______________________________')
+        self.tree_model.fetch_all()
+        self.save_action()
+
+    @loading('save_complete_action', priority_=cf.JOB_PRIORITY_HIGH)
+    @profiled('save.borehole')
+    def save_action(self) -> None:
+        item_states = self.borehole.get_item_states()
+        try:
+            self.save_all_sections(self.borehole.up_path)
+        finally:
+            self.borehole.correlate_data()
+        self.change_set = self.borehole.apply_selection(self.tree_model.get_selection_dict())
+        for key, fields in self.borehole.get_structure_changes(item_states).items():
+            self.change_set[key] = self.change_set.get(key, set()) | fields
         self.borehole.save_info_to_file()
 
-    def run(self) -> None:
-        self.section_list_widget.remove_all()
-        for section in self.borehole.section_list:
-            self.add_section(section.name, section.depth, section.length, section.id)
-            section_w = self.section_list_widget.widget_list[len(self.section_list_widget.widget_list) - 1]
-            section_w.checkbox.setChecked(section.is_select)
-            for step in section.step_list:
-                section_w.add_step(step.number, step.id)
-                step_w = section_w.step_list.widget_list[len(section_w.step_list.widget_list) - 1]
-                step_w.checkbox.setChecked(step.is_select)
-                for file in step.data_list:
-                    step_w.add_file(file.name, file.id)
-                    step_w.file_list.widget_list[len(step_w.file_list.widget_list) - 1]\
-                        .checkbox.setChecked(file.is_select)
-        print('______________________________')
-        print("IN:", self.borehole.path())
-        for section in self.borehole.section_list:
-            print('sec\t', section.path())
-            for step in section.step_list:
-                print('\tstep\t', step.path())
-                for file in step.data_list:
-                    print('\t\tf\t', file.path())
-        print('______________________________')
+    def save_complete_action(self) -> None:
+        self.cancel_action()
+        self.borehole_changed.emit(self.change_set)
 
+    def run(self) -> None:
+        self.tree_model.set_borehole(self.borehole)
         self.exec()
 
 
-class AbstractBoreholeDialogItemWidget(QWidget):
-    def __init__(self, parent_list_: ListWidget, id_: str = None, is_show_: bool = True):
-        super().__init__(parent_list_)
-        self.parent_list = parent_list_
+class AbstractBoreholeTreeItem:
+    def __init__(self, parent_item_=None, id_: str = None, is_select_: bool = True):
+        self.parent_item = parent_item_
         self.id = id_
         if self.id is None:
             self.id = uuid4()
+        self.is_select = is_select_
+        self.children = []
+        self.source = None
+        self.is_fetched = True
 
-        self.checkbox = QCheckBox(self)
-        self.checkbox.setChecked(True)
+    def row(self) -> int:
+        if self.parent_item is None:
+            return 0
+        return self.parent_item.children.index(self)
 
-        self.delete_button = QPushButton("X", self)
-        self.delete_button.setMaximumWidth(20)
-        self.delete_button.clicked.connect(self.delete_action)
+    def get_source_children(self) -> list:
+        return []
 
-        self.setVisible(is_show_)
+    def can_fetch(self) -> bool:
+        return not self.is_fetched and len(self.get_source_children()) > 0
 
-    def __all_widgets_to_layout(self) -> None: ...
+    def fetch(self) -> None:
+        self.is_fetched = True
 
-    def is_selected(self) -> bool:
-        return self.checkbox.isChecked()
+    def get_text(self, column_: int) -> str:
+        return ''
 
-    def delete_action(self) -> None:
-        self.parent_list.remove_item(self)
+    def set_text(self, column_: int, text_: str) -> bool:
+        return False
+
+    def is_editable(self, column_: int) -> bool:
+        return False
 
+    def select(self, is_select_: bool) -> None:
+        self.is_select = is_select_
+        for child in self.children:
+            child.select(is_select_)
 
-class FileWidget(AbstractBoreholeDialogItemWidget):
-    def __init__(self, path_: str, parent_list_: ListWidget, id_: str = None, is_show_: bool = False):
-        super().__init__(parent_list_, id_, is_show_)
+    def get_child_select(self, source_child_) -> bool:
+        return self.is_select if self.is_select != self.source.is_select else source_child_.is_select
+
+
+class FileTreeItem(AbstractBoreholeTreeItem):
+    def __init__(self, path_: str, parent_item_: AbstractBoreholeTreeItem, id_: str = None, is_select_: bool = True):
+        super().__init__(parent_item_, id_, is_select_)
         self.path = path_
         self.basename = os.path.basename(self.path)
-        self.checkbox.setText(self.basename)
 
-        self.__all_widgets_to_layout()
-
-    def __all_widgets_to_layout(self) -> None:
-        core_layout = QHBoxLayout()
-        core_layout.addWidget(self.checkbox)
-        core_layout.addWidget(self.delete_button)
-        core_layout.setSizeConstraint(QLayout.SetFixedSize)
-        self.setLayout(core_layout)
+    def get_text(self, column_: int) -> str:
+        return self.basename if column_ == 0 else ''
 
     def copy_to(self, step_dir_path_: str):
         if os.path.isfile(self.path):
-            shutil.copy2(self.path, step_dir_path_)
+            new_path = step_dir_path_ + '/' + self.basename
+            shutil.copy2(self.path, new_path + '.tmp')
+            os.replace(new_path + '.tmp', new_path)
 
 
-class StepWidget(AbstractBoreholeDialogItemWidget):
-    def __init__(self, number_: int, parent_list_: ListWidget, id_: str = None, is_show_: bool = False):
-        super().__init__(parent_list_, id_, is_show_)
+class StepTreeItem(AbstractBoreholeTreeItem):
+    def __init__(self, number_: int, parent_item_: AbstractBoreholeTreeItem, id_: str = None,
+                 is_select_: bool = True, step_: Step = None):
+        super().__init__(parent_item_, id_, is_select_)
         self.number = number_
-        self.file_list = ListWidget(self)
-        self.setMaximumHeight(150)
-        self.setMinimumWidth(400)
-
-        self.checkbox.stateChanged.connect(self.click_checkbox_action)
-
-        self.number_editor = QLineEdit(self)
-        self.__editor_init()
-        self.__values_to_editors()
-
-        self.add_button = QPushButton('+', self)
-        self.drop_button = QPushButton('▽', self)
-        self.__button_init()
-        self.is_dropped = True
-        self.drop_list_action()
-
-        self.__all_widgets_to_layout()
-
-    def __editor_init(self) -> None:
-        self.number_editor.setAlignment(Qt.AlignLeft)
-        self.number_editor.setValidator(QIntValidator())
-        self.number_editor.textChanged.connect(self.number_edit_action)
-
-    def __values_to_editors(self) -> None:
-        self.number_editor.setText(str(self.number))
-
-    def __button_init(self) -> None:
-        self.add_button.setMaximumWidth(20)
-        self.add_button.clicked.connect(self.add_files_action)
-
-        self.drop_button.setMaximumWidth(20)
-        self.drop_button.clicked.connect(self.drop_list_action)
-
-    def __all_widgets_to_layout(self) -> None:
-        tmp_layout = QHBoxLayout()
-        tmp_layout.addWidget(self.checkbox)
-        flo = QFormLayout()
-        flo.addRow("Шаг №", self.number_editor)
-        tmp_layout.addLayout(flo)
-        tmp_layout.addWidget(self.add_button)
-        tmp_layout.addWidget(self.drop_button)
-        tmp_layout.addWidget(self.delete_button)
-
-        core_layout = QVBoxLayout()
-        core_layout.addLayout(tmp_layout)
-        core_layout.addWidget(self.file_list)
-        core_layout.setSizeConstraint(QLayout.SetFixedSize)
-        self.setLayout(core_layout)
-
-    def add_file(self, path_: str, id_: str = None, is_select: bool = True) -> None:
-        for file in self.file_list.widget_list:
+        self.source = step_
+        self.is_fetched = self.source is None
+
+    def get_source_children(self) -> list:
+        return [] if self.source is None else self.source.data_list
+
+    def fetch(self) -> None:
+        if not self.is_fetched:
+            for file in self.source.data_list:
+                self.add_file(file.name, file.id, self.get_child_select(file))
+        super().fetch()
+
+    def get_text(self, column_: int) -> str:
+        return "Шаг №" + str(self.number) if column_ == 0 else ''
+
+    def set_text(self, column_: int, text_: str) -> bool:
+        text = text_.replace("Шаг №", '').strip()
+        if column_ != 0 or not text.isdigit():
+            return False
+        for step in self.parent_item.children:
+            if int(text) == step.number:
+                return False
+        self.number = int(text)
+        return True
+
+    def is_editable(self, column_: int) -> bool:
+        return column_ == 0
+
+    def add_file(self, path_: str, id_: str = None, is_select_: bool = True) -> bool:
+        for file in self.children:
             if file.id == id_ or file.path == path_:
-                return
-        file_widget = FileWidget(path_, self.file_list, id_)
-        self.file_list.add_widget(file_widget)
-        file_widget.checkbox.setChecked(is_select)
-
-    def remove_file(self, **kwargs):
-        if 'id' in kwargs:
-            id_ = kwargs['id']
-            for file in self.file_list.widget_list:
-                if file.id == id_:
-                    file.delete_action()
-        elif 'name' in kwargs:
-            name_ = kwargs['name']
-            for file in self.file_list.widget_list:
-                if file.name == name_:
-                    file.delete_action()
-
-    def remove_all(self) -> None:
-        for file in self.file_list.widget_list:
-            file.delete_action()
-
-    def add_files_action(self) -> None:
-        got_file_list = select_path_to_files(cf.FILE_DIALOG_CSV_FILTER, self, dir=cf.DEFAULT_DATA_FOLDER)
-        for filename in got_file_list:
-            self.add_file(filename)
-
-    def click_checkbox_action(self, state_: bool) -> None:
-        for file in self.file_list.widget_list:
-            file.checkbox.setChecked(state_)
-
-    def number_edit_action(self, text_: str) -> None:
-        for step in self.parent_list.widget_list:
-            if len(text_) and int(text_) == step.number:
-                self.number_editor.setText(str(self.number))
-                return
-        if len(text_):
-            self.number = int(text_)
-
-    def __drop_list(self, is_drop: bool) -> None:
-        self.is_dropped = is_drop
-        self.drop_button.setText("△" if self.is_dropped else "▽")
-        self.file_list.setVisible(self.is_dropped)
-        self.parent_list.resize_item(self)
+                return False
+        self.children.append(FileTreeItem(path_, self, id_, is_select_))
+        return True
 
-    def drop_list_action(self) -> None:
-        self.__drop_list(not self.is_dropped)
-
-    def save_all(self, section_path_: str) -> None:
+    def save_all(self, section_path_: str, cancel_token_: CancelToken) -> None:
         step_path = section_path_ + '/' + str(self.number)
         if not os.path.isdir(step_path):
             os.mkdir(step_path)
         for filename in pathlib.Path(step_path).glob('*'):
             is_inside_widget_list = False
             file_base_name = os.path.basename(filename)
-            for file in self.file_list.widget_list:
+            for file in self.children:
                 if file.basename == file_base_name:
                     is_inside_widget_list = True
                     break
@@ -779,141 +822,62 @@ class StepWidget(AbstractBoreholeDialogItemWidget):
                     shutil.rmtree(filename)
                 else:
                     os.remove(filename)
-        for file in self.file_list.widget_list:
+        for file in self.children:
+            cancel_token_.check()
             file.copy_to(step_path)
+            ProgressReporter.current().advance(file.basename)
 
 
-class SectionWidget(AbstractBoreholeDialogItemWidget):
-    def __init__(self, name_: str, parent_list_: ListWidget, depth_: int = 0, length_: float = 0.,
-                 id_: str = None, is_show_: bool = False):
-        super().__init__(parent_list_, id_, is_show_)
+class SectionTreeItem(AbstractBoreholeTreeItem):
+    def __init__(self, name_: str, parent_item_: AbstractBoreholeTreeItem, depth_: int = 0, length_: float = 0.,
+                 id_: str = None, is_select_: bool = True, section_: Section = None):
+        super().__init__(parent_item_, id_, is_select_)
         self.name = name_
         self.depth = depth_
         self.length = length_
-        self.step_list = ListWidget(self)
-
-        self.checkbox.stateChanged.connect(self.click_checkbox_action)
-
-        self.name_editor = QLineEdit(self)
-        self.depth_editor = QLineEdit(self)
-        self.length_editor = QLineEdit(self)
-        self.__editor_init()
-        self.__values_to_editors()
-
-        self.add_button = QPushButton('+', self)
-        self.drop_button = QPushButton('▽', self)
-        self.__button_init()
-
-        self.is_dropped = True
-        self.drop_list_action()
-        self.__all_widgets_to_layout()
-
-    def __editor_init(self) -> None:
-        self.name_editor.setAlignment(Qt.AlignRight)
-        self.name_editor.textChanged.connect(self.name_edit_action)
-
-        self.depth_editor.setAlignment(Qt.AlignRight)
-        self.depth_editor.setValidator(QIntValidator())
-        self.depth_editor.textChanged.connect(self.depth_edit_action)
-
-        self.length_editor.setAlignment(Qt.AlignRight)
-        self.length_editor.setValidator(QDoubleValidator(0., 20., 1))
-        self.length_editor.textChanged.connect(self.length_edit_action)
-
-    def __values_to_editors(self) -> None:
-        self.name_editor.setText(self.name)
-        self.depth_editor.setText(str(self.depth))
-        self.length_editor.setText(str(self.length))
-
-    def __button_init(self) -> None:
-        self.add_button.setMaximumWidth(20)
-        self.add_button.clicked.connect(self.add_step_action)
-
-        self.drop_button.setMaximumWidth(20)
-        self.drop_button.clicked.connect(self.drop_list_action)
-
-    def __all_widgets_to_layout(self) -> None:
-        core_layout = QVBoxLayout()
-        core_layout.addWidget(self.checkbox)
-        base_layout = QHBoxLayout()
-        flo = QFormLayout()
-        flo.addRow("Имя", self.name_editor)
-        base_layout.addLayout(flo)
-        flo = QFormLayout()
-        flo.addRow("Глубина (м)", self.depth_editor)
-        base_layout.addLayout(flo)
-        flo = QFormLayout()
-        flo.addRow("Длина (м)", self.length_editor)
-        base_layout.addLayout(flo)
-        base_layout.addWidget(self.add_button)
-        base_layout.addWidget(self.drop_button)
-        base_layout.addWidget(self.delete_button)
-        core_layout.addLayout(base_layout)
-        core_layout.addWidget(self.step_list)
-        self.setLayout(core_layout)
-
-    def add_step(self, number_: int, id_: str = None, is_select: bool = True) -> None:
-        for step in self.step_list.widget_list:
+        self.source = section_
+        self.is_fetched = self.source is None
+
+    def get_source_children(self) -> list:
+        return [] if self.source is None else self.source.step_list
+
+    def fetch(self) -> None:
+        if not self.is_fetched:
+            for step in self.source.step_list:
+                self.add_step(step.number, step.id, self.get_child_select(step), step)
+        super().fetch()
+
+    def get_text(self, column_: int) -> str:
+        return [self.name, str(self.depth), str(self.length)][column_]
+
+    def set_text(self, column_: int, text_: str) -> bool:
+        try:
+            if column_ == 0:
+                for section in self.parent_item.children:
+                    if section.name == text_:
+                        return False
+                if len(text_) < 1:
+                    return False
+                self.name = text_
+            elif column_ == 1:
+                self.depth = int(float(text_.replace(',', '.')))
+            elif column_ == 2:
+                self.length = float(text_.replace(',', '.'))
+        except ValueError:
+            return False
+        return True
+
+    def is_editable(self, column_: int) -> bool:
+        return True
+
+    def add_step(self, number_: int, id_: str = None, is_select_: bool = True, step_: Step = None) -> bool:
+        for step in self.children:
             if step.id == id_ or step.number == number_:
-                return
-        step_widget = StepWidget(number_, self.step_list, id_)
-        self.step_list.add_widget(step_widget)
-        step_widget.checkbox.setChecked(is_select)
-
-    def remove_step(self, **kwargs):
-        if 'id' in kwargs:
-            id_ = kwargs['id']
-            for step in self.step_list.widget_list:
-                if step.id == id_:
-                    step.delete_action()
-        elif 'number' in kwargs:
-            number_ = kwargs['number']
-            for step in self.step_list.widget_list:
-                if step.number == number_:
-                    step.delete_action()
-
-    def remove_all(self) -> None:
-        for step in self.step_list.widget_list:
-            step.delete_action()
+                return False
+        self.children.append(StepTreeItem(number_, self, id_, is_select_, step_))
+        return True
 
-    def add_step_action(self) -> None:
-        max_number = -1
-        for step in self.step_list.widget_list:
-            if max_number < step.number:
-                max_number = step.number
-        self.add_step(max_number + 1)
-        if not self.is_dropped:
-            self.__drop_list(not self.is_dropped)
-
-    def click_checkbox_action(self, state_) -> None:
-        for step in self.step_list.widget_list:
-            step.checkbox.setChecked(state_)
-
-    def name_edit_action(self, text_: str) -> None:
-        for section in self.parent_list.widget_list:
-            if section.name == text_:
-                self.name_editor.setText(self.name)
-                return
-        self.name = text_
-
-    def depth_edit_action(self, text_: str) -> None:
-        if len(text_):
-            self.depth = int(float(text_))
-
-    def length_edit_action(self, text_: str) -> None:
-        if len(text_):
-            self.length = float(text_.replace(',', '.'))
-
-    def __drop_list(self, is_drop: bool) -> None:
-        self.is_dropped = is_drop
-        self.drop_button.setText("△" if self.is_dropped else "▽")
-        self.step_list.setVisible(self.is_dropped)
-        self.parent_list.resize_item(self)
-
-    def drop_list_action(self) -> None:
-        self.__drop_list(not self.is_dropped)
-
-    def save_all(self, borehole_path_: str) -> None:
+    def save_all(self, borehole_path_: str, cancel_token_: CancelToken) -> None:
         section_path = borehole_path_ + '/' + self.name
         if not os.path.isdir(section_path):
             os.mkdir(section_path)
@@ -921,7 +885,7 @@ class SectionWidget(AbstractBoreholeDialogItemWidget):
             is_inside_widget_list = False
             if os.path.isdir(filename) and str(os.path.basename(filename)).isdigit():
                 file_num = int(os.path.basename(filename))
-                for step in self.step_list.widget_list:
+                for step in self.children:
                     if step.number == file_num:
                         is_inside_widget_list = True
                         break
@@ -930,8 +894,169 @@ class SectionWidget(AbstractBoreholeDialogItemWidget):
                     shutil.rmtree(filename)
                 else:
                     os.remove(filename)
-        for step in self.step_list.widget_list:
-            step.save_all(section_path)
+        for step in self.children:
+            cancel_token_.check()
+            step.save_all(section_path, cancel_token_)
+
+
+class BoreholeTreeModel(QAbstractItemModel):
+    def __init__(self, parent_: QWidget = None):
+        super().__init__(parent_)
+        self.root_item = AbstractBoreholeTreeItem()
+
+    def set_borehole(self, borehole_: Borehole) -> None:
+        self.beginResetModel()
+        self.root_item = AbstractBoreholeTreeItem()
+        for section in borehole_.section_list:
+            self.root_item.children.append(SectionTreeItem(section.name, self.root_item, section.depth,
+                                                           section.length, section.id, section.is_select, section))
+        self.endResetModel()
+
+    def get_selection_dict(self) -> dict:
+        selection_dict = dict()
+        for section in self.root_item.children:
+            section_key = (section.name,)
+            selection_dict[section_key] = {'is_select': section.is_select, 'depth': section.depth,
+                                           'length': section.length}
+            for step in section.children:
+                step_key = section_key + (step.number,)
+                selection_dict[step_key] = {'is_select': step.is_select}
+                for file in step.children:
+                    selection_dict[step_key + (file.basename,)] = {'is_select': file.is_select}
+        return selection_dict
+
+    def get_item(self, index_: QModelIndex) -> AbstractBoreholeTreeItem:
+        if index_.isValid():
+            return index_.internalPointer()
+        return self.root_item
+
+    def index(self, row_: int, column_: int, parent_: QModelIndex = QModelIndex()) -> QModelIndex:
+        parent_item = self.get_item(parent_)
+        if not self.hasIndex(row_, column_, parent_):
+            return QModelIndex()
+        return self.createIndex(row_, column_, parent_item.children[row_])
+
+    def parent(self, index_: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index_.isValid():
+            return QModelIndex()
+        parent_item = index_.internalPointer().parent_item
+        if parent_item is None or parent_item is self.root_item:
+            return QModelIndex()
+        return self.createIndex(parent_item.row(), 0, parent_item)
+
+    def rowCount(self, parent_: QModelIndex = QModelIndex()) -> int:
+        if parent_.column() > 0:
+            return 0
+        return len(self.get_item(parent_).children)
+
+    def columnCount(self, parent_: QModelIndex = QModelIndex()) -> int:
+        return len(cf.BOREHOLE_TREE_HEADERS)
+
+    def hasChildren(self, parent_: QModelIndex = QModelIndex()) -> bool:
+        if parent_.column() > 0:
+            return False
+        item = self.get_item(parent_)
+        return len(item.children) > 0 or item.can_fetch()
+
+    def canFetchMore(self, parent_: QModelIndex) -> bool:
+        return self.get_item(parent_).can_fetch()
+
+    def fetchMore(self, parent_: QModelIndex) -> None:
+        item = self.get_item(parent_)
+        if item.is_fetched:
+            return
+        source_children = item.get_source_children()
+        if len(source_children) < 1:
+            item.fetch()
+            return
+        self.beginInsertRows(parent_, len(item.children), len(item.children) + len(source_children) - 1)
+        item.fetch()
+        self.endInsertRows()
+
+    def fetch_all(self, parent_: QModelIndex = QModelIndex()) -> None:
+        if self.canFetchMore(parent_):
+            self.fetchMore(parent_)
+        if isinstance(self.get_item(parent_), StepTreeItem):
+            return
+        for row in range(self.rowCount(parent_)):
+            self.fetch_all(self.index(row, 0, parent_))
+
+    def data(self, index_: QModelIndex, role_: int = Qt.DisplayRole):
+        if not index_.isValid():
+            return None
+        item = index_.internalPointer()
+        if role_ in (Qt.DisplayRole, Qt.EditRole):
+            return item.get_text(index_.column())
+        if role_ == Qt.CheckStateRole and index_.column() == 0:
+            return Qt.Checked if item.is_select else Qt.Unchecked
+        return None
+
+    def setData(self, index_: QModelIndex, value_, role_: int = Qt.EditRole) -> bool:
+        if not index_.isValid():
+            return False
+        item = index_.internalPointer()
+        if role_ == Qt.CheckStateRole and index_.column() == 0:
+            item.select(Qt.CheckState(value_) == Qt.Checked)
+            self.dataChanged.emit(index_, index_, [Qt.CheckStateRole])
+            self.__emit_children_changed(index_)
+            return True
+        if role_ == Qt.EditRole and item.set_text(index_.column(), str(value_)):
+            self.dataChanged.emit(index_, index_, [Qt.DisplayRole, Qt.EditRole])
+            return True
+        return False
+
+    def __emit_children_changed(self, parent_: QModelIndex) -> None:
+        row_count = self.rowCount(parent_)
+        if row_count < 1:
+            return
+        self.dataChanged.emit(self.index(0, 0, parent_), self.index(row_count - 1, 0, parent_), [Qt.CheckStateRole])
+        for row in range(row_count):
+            self.__emit_children_changed(self.index(row, 0, parent_))
+
+    def flags(self, index_: QModelIndex) -> Qt.ItemFlags:
+        if not index_.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index_.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        if index_.internalPointer().is_editable(index_.column()):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section_: int, orientation_: Qt.Orientation, role_: int = Qt.DisplayRole):
+        if orientation_ == Qt.Horizontal and role_ == Qt.DisplayRole:
+            return cf.BOREHOLE_TREE_HEADERS[section_]
+        return None
+
+    def add_section(self, name_: str, depth_: int = 0, length_: float = 0., id_: str = None) -> None:
+        row = len(self.root_item.children)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.root_item.children.append(SectionTreeItem(name_, self.root_item, depth_, length_, id_))
+        self.endInsertRows()
+
+    def add_step(self, section_index_: QModelIndex, number_: int) -> None:
+        section_item = self.get_item(section_index_)
+        row = len(section_item.children)
+        self.beginInsertRows(section_index_, row, row)
+        section_item.add_step(number_, is_select_=section_item.is_select)
+        self.endInsertRows()
+
+    def add_file(self, step_index_: QModelIndex, path_: str) -> None:
+        step_item = self.get_item(step_index_)
+        for file in step_item.children:
+            if file.path == path_:
+                return
+        row = len(step_item.children)
+        self.beginInsertRows(step_index_, row, row)
+        step_item.add_file(path_, is_select_=step_item.is_select)
+        self.endInsertRows()
+
+    def remove_item(self, index_: QModelIndex) -> None:
+        item = self.get_item(index_)
+        row = item.row()
+        self.beginRemoveRows(index_.parent(), row, row)
+        item.parent_item.children.pop(row)
+        self.endRemoveRows()
 
 
 class HideLineToolDialog(AbstractToolDialog):
@@ -939,12 +1064,38 @@ class HideLineToolDialog(AbstractToolDialog):
         super().__init__(cf.HIDING_LINES_DIALOG_TITLE, parent_)
         self.checkbox_list_widget = CheckBoxList(self)
         self.checkbox_list_widget.setMaximumSize(300, 300)
+        self.show_all_btn = ButtonWidget('Показать все', self, action=self.show_all_action)
+        self.hide_all_btn = ButtonWidget('Скрыть все', self, action=self.hide_all_action)
+        self.invert_btn = ButtonWidget('Инвертировать', self, action=self.invert_action)
         self.__all_widgets_to_layout()
     
     def __all_widgets_to_layout(self) -> None:
+        btn_layout = QHBoxLayout()
+        btn_layout.addWidget(self.show_all_btn)
+        btn_layout.addWidget(self.hide_all_btn)
+        btn_layout.addWidget(self.invert_btn)
         core_layout = QVBoxLayout()
         core_layout.addWidget(self.checkbox_list_widget)
+        core_layout.addLayout(btn_layout)
         self.setLayout(core_layout)
+
+    def show_all_action(self) -> None:
+        self.__set_all_checked(lambda is_checked_: True)
+
+    def hide_all_action(self) -> None:
+        self.__set_all_checked(lambda is_checked_: False)
+
+    def invert_action(self) -> None:
+        self.__set_all_checked(lambda is_checked_: not is_checked_)
+
+    def __set_all_checked(self, get_checked_) -> None:
+        parent = self.parentWidget()
+        if parent is not None:
+            parent.setUpdatesEnabled(False)
+        for checkbox in self.checkbox_list_widget.widget_list:
+            checkbox.setChecked(get_checked_(checkbox.isChecked()))
+        if parent is not None:
+            parent.setUpdatesEnabled(True)
     
     def remove_all(self, *args, **kwargs) -> None:
         self.checkbox_list_widget.remove_all(*args, **kwargs)
@@ -959,6 +1110,8 @@ class AbstractGraphWindowWidget(AbstractWindowWidget):
         self.borehole_window = borehole_window_
         self.plot_widget = None
         self.data_frames = dict()
+        self.is_data_outdated = False
+        MemoryAccountant().add_source(type(self).__name__, self, 'data_frames')
 
         self.hide_line_dialog = HideLineToolDialog(self)
         self.help_info_dialog = HelpInfoDialog(self)
@@ -992,11 +1145,24 @@ class AbstractGraphWindowWidget(AbstractWindowWidget):
     def activate(self, is_active_: bool = True) -> None:
         self.hide_line_dialog.close()
         self.setVisible(is_active_)
+        if is_active_ and self.is_data_outdated:
+            self.is_data_outdated = False
+            self.plot_graph_action()
+
+    def invalidate_data(self, change_set_: dict) -> None:
+        if len(change_set_) > 0 and len(self.data_frames) > 0:
+            self.is_data_outdated = True
+            if self.isVisible():
+                self.activate()
 
     def plot_graph_action(self) -> None: ...
 
     def replot_for_new_data(self) -> None:
         self.plot_widget.recreate(self.data_frames)
+
+    def set_dataframe_visible(self, dataframe_, is_visible_: bool) -> None:
+        dataframe_.active = is_visible_
+        self.plot_widget.set_series_visible(dataframe_.id, is_visible_)
     
     def checkbox_activate(self) -> None: ...
 
@@ -1011,10 +1177,10 @@ class AbstractGraphWindowWidget(AbstractWindowWidget):
                                                filter=cf.FILE_DIALOG_SAVE_FILTERS[2])
         self.save_data_for_path(filename[0], filename[0].split('.')[-1].lower())
 
+    @profiled('save.graph')
     def save_data_for_path(self, path_: str, type_: str) -> None:
         if self.plot_widget is not None:
-            QScreen.grabWindow(self.borehole_window.main_window.app.primaryScreen(),
-                               self.plot_widget.winId()).save(path_, type_)
+            self.plot_widget.grab().save(path_, type_)
     
     def help_window_action(self) -> None:
         self.help_info_dialog.run()
@@ -1032,8 +1198,7 @@ class CheckBoxHideFunctor(AbstractFunctor):
         self.graph_window_widget = graph_window_widget_
 
     def action(self, state_: int) -> None:
-        self.dataframe.active = state_ != 0
-        self.graph_window_widget.replot_for_new_data()
+        self.graph_window_widget.set_dataframe_visible(self.dataframe, state_ != 0)
 
 
 class CheckBoxList(ListWidget):
@@ -1052,9 +1217,8 @@ class AbstractFilterSettings(QWidget):
         self.filter = None
         self.setVisible(False)
 
-    def get_filtered_data(self, init_data_: list) -> list:
-        self.filter.set_data(init_data_)
-        return self.filter.get_data()
+    def get_filtered_data(self, filename_: str, init_data_) -> list:
+        return FilteredDataCache().get_filtered_data(filename_, self.filter, init_data_)
 
 
 class ArithFilterSettings(AbstractFilterSettings):
@@ -1316,12 +1480,12 @@ class FilterSettingsDialog(AbstractToolDialog):
     def is_filter_action(self, state_: bool) -> None:
         self.is_filtering = state_
 
-    def get_data(self, init_data_: list) -> dict:
-        return {"y": self.filter_widgets_dict[self.filter_editor.currentText()].get_filtered_data(init_data_)}
+    def get_data(self, filename_: str, init_data_) -> dict:
+        return {"y": self.filter_widgets_dict[self.filter_editor.currentText()].get_filtered_data(filename_, init_data_)}
 
     def accept_action(self) -> None:
         self.window_widget.filter_action_btn.setChecked(self.is_filtering)
-        self.window_widget.plot_graph_action()
+        self.window_widget.refilter_graph_action()
         self.close()
 
     def run(self):
@@ -1329,49 +1493,105 @@ class FilterSettingsDialog(AbstractToolDialog):
 
 
 # ---------------- Oscilloscope ----------------
-class OscilloscopeTableWidget(QTableWidget):
+class OscilloscopeTableModel(QAbstractTableModel):
+    def __init__(self, parent_: QWidget = None):
+        super().__init__(parent_)
+        self.rows = []
+        self.headers = list(cf.OSCILLOSCOPE_TABLE_HEADERS)
+
+    def rowCount(self, parent_: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent_.isValid() else len(self.rows)
+
+    def columnCount(self, parent_: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent_.isValid() else len(self.headers)
+
+    def data(self, index_: QModelIndex, role_: int = Qt.DisplayRole):
+        if not index_.isValid():
+            return None
+        if role_ == Qt.DisplayRole:
+            value = self.rows[index_.row()][index_.column()]
+            if isinstance(value, float):
+                return cf.OSCILLOSCOPE_TABLE_FLOAT_FORMAT.format(value)
+            return str(value)
+        if role_ == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section_: int, orientation_: Qt.Orientation, role_: int = Qt.DisplayRole):
+        if role_ != Qt.DisplayRole:
+            return None
+        if orientation_ == Qt.Horizontal:
+            return self.headers[section_]
+        return str(section_ + 1)
+
+    def sort(self, column_: int, order_: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        if column_ < 0 or column_ >= len(self.headers):
+            return
+        self.layoutAboutToBeChanged.emit()
+        self.rows.sort(key=lambda row_: row_[column_], reverse=order_ == Qt.DescendingOrder)
+        self.layoutChanged.emit()
+
+    def set_rows(self, rows_: list, unit_: str = None) -> None:
+        self.beginResetModel()
+        self.rows = rows_
+        self.headers = list(cf.OSCILLOSCOPE_TABLE_HEADERS)
+        if unit_:
+            for column in cf.OSCILLOSCOPE_TABLE_VALUE_COLUMNS:
+                self.headers[column] += ', ' + unit_
+        self.endResetModel()
+
+    @staticmethod
+    def get_rows(data_frames_: dict) -> list:
+        rows = []
+        for section_name in data_frames_:
+            for dataframe in data_frames_[section_name]:
+                summary = dataframe.get_summary()
+                sensor_num = get_num_file_by_default(dataframe.name, cf.DEFAULT_SENSOR_AMOUNT)[1]
+                step_name = os.path.basename(os.path.dirname(dataframe.filename))
+                rows.append((dataframe.name, section_name, int(step_name) if step_name.isdigit() else -1,
+                             chr(ord('A') + sensor_num) if sensor_num >= 0 else '-',
+                             summary['max'], summary['min'], summary['rms']))
+        return rows
+
+
+class OscilloscopeTableWidget(QTableView):
     def __init__(self, parent_: QWidget):
         super().__init__(parent_)
+        self.table_model = OscilloscopeTableModel(self)
+        self.setModel(self.table_model)
+        self.__table_init()
 
-    def __table_init(self, row_count_: int, column_count_: int, labels_: list) -> None:
-        self.setRowCount(row_count_)
-        self.setColumnCount(column_count_)
-        self.setHorizontalHeaderLabels(labels_)
-        for i in range(len(labels_)):
-            self.horizontalHeaderItem(i).setTextAlignment(Qt.AlignLeft)
+    def __table_init(self) -> None:
+        self.setSortingEnabled(True)
+        self.sortByColumn(-1, Qt.AscendingOrder)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(cf.OSCILLOSCOPE_TABLE_ROW_HEIGHT)
+        self.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
+        self.horizontalHeader().setStretchLastSection(True)
         self.horizontalHeader().setStyleSheet("QHeaderView::section {background-color: rgb(128, 255, 192);}")
 
     def __default_size_set(self, window_size_: QSize) -> None:
-        self.setColumnWidth(0, int(window_size_.width() / 3))
-        self.setColumnWidth(1, int(window_size_.width() / 4))
-        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setColumnWidth(0, int(window_size_.width() / 4))
 
-    def set_data(self, data_frames_: dict, window_size_: QSize) -> None:
-        self.clear()
-        row_count, fkey = 0, None
-        for key in data_frames_:
-            dfl = len(data_frames_[key])
-            row_count += dfl
-            if dfl:
-                fkey = key
-        if fkey is None:
-            return
-        self.__table_init(row_count, 2, ["Файл", "Максимум, " + data_frames_[fkey][0].header[cf.DATA_UINT_HEADER]])
+    def set_data(self, data_frames_: dict, window_size_: QSize, rows_: list = None) -> None:
+        unit = None
         for key in data_frames_:
-            for i in range(len(data_frames_[key])):
-                lTWI = QTableWidgetItem(data_frames_[key][i].name)
-                rTWI = QTableWidgetItem(str(data_frames_[key][i].max_y))
-                lTWI.setTextAlignment(Qt.AlignRight)
-                rTWI.setTextAlignment(Qt.AlignRight)
-                self.setItem(i, 0, lTWI)
-                self.setItem(i, 1, rTWI)
+            if len(data_frames_[key]):
+                unit = data_frames_[key][0].header[cf.DATA_UINT_HEADER]
+                break
+        self.table_model.set_rows(OscilloscopeTableModel.get_rows(data_frames_) if rows_ is None else rows_, unit)
+        self.sortByColumn(-1, Qt.AscendingOrder)
         self.__default_size_set(window_size_)
 
 
 class OscilloscopeGraphWindowWidget(AbstractGraphWindowWidget):
     def __init__(self, borehole_window_: BoreholeMenuWindowWidget):
         super().__init__(borehole_window_)
+        from graph_widget import OscilloscopeGraphWidget
         self.table_widget = OscilloscopeTableWidget(self)
+        self.table_rows = []
         self.plot_widget = OscilloscopeGraphWidget(dict(), self)
 
         self.filter_settings_dialog = FilterSettingsDialog(self)
@@ -1397,27 +1617,51 @@ class OscilloscopeGraphWindowWidget(AbstractGraphWindowWidget):
 
     def filter_data_action(self, state_: bool) -> None:
         self.filter_settings_dialog.set_filter(state_)
-        self.plot_graph_action()
+        self.refilter_graph_action()
 
-    @loading('checkbox_activate')
+    def refilter_graph_action(self) -> None:
+        if len(self.data_frames) < 1:
+            self.plot_graph_action()
+        else:
+            self.filter_graph_action()
+
+    @loading('show_data_frames')
     def plot_graph_action(self) -> None:
         self.data_frames = self.borehole_window.borehole.get_xy_dataframes_dict()
-        if len(self.data_frames) < 1:
-            return
+        self.table_rows = OscilloscopeTableModel.get_rows(self.data_frames)
+        self.filter_data_frames()
+
+    @loading('replot_for_new_data')
+    def filter_graph_action(self) -> None:
+        self.filter_data_frames()
+
+    def filter_data_frames(self, cancel_token_: CancelToken = None) -> None:
+        cancel_token = CancelToken.current(cancel_token_)
+        filt_data_list = []
         if self.filter_settings_dialog.is_filtering:
             for key in self.data_frames.keys():
                 for dataframe in self.data_frames[key]:
-                    if dataframe.filt_data is None:
-                        dataframe.filt_data = self.filter_settings_dialog.get_data(dataframe.origin_data["y"])
+                    cancel_token.check()
+                    filt_data_list.append(self.filter_settings_dialog.get_data(dataframe.filename,
+                                                                               dataframe.get_filter_input()))
+        i = 0
+        for key in self.data_frames.keys():
+            for dataframe in self.data_frames[key]:
+                if self.filter_settings_dialog.is_filtering:
+                    dataframe.filt_data = filt_data_list[i]
                     dataframe.data = dataframe.filt_data
-        else:
-            for key in self.data_frames.keys():
-                for dataframe in self.data_frames[key]:
+                    i += 1
+                else:
                     dataframe.data = dataframe.origin_data
+                dataframe.get_pyramid()
 
-        self.table_widget.set_data(self.data_frames, self.borehole_window.main_window.size())
+    def show_data_frames(self) -> None:
+        if len(self.data_frames) < 1:
+            return
+        self.table_widget.set_data(self.data_frames, self.borehole_window.main_window.size(), self.table_rows)
         self.replot_for_new_data()
-    
+        self.checkbox_activate()
+
     def checkbox_activate(self) -> None:
         self.hide_line_dialog.remove_all()
         for key in self.data_frames.keys():
@@ -1812,6 +2056,7 @@ class CrackSettingsDialog(AbstractToolDialog):
 class FrequencyResponseGraphWindowWidget(AbstractGraphWindowWidget):
     def __init__(self, borehole_window_: BoreholeMenuWindowWidget):
         super().__init__(borehole_window_)
+        from graph_widget import FrequencyResponseGraphWidget
         self.plot_widget = FrequencyResponseGraphWidget(dict(), self)
         self.pipe_widget = PipeWidget(self)
         self.cracks_dialog = CrackSettingsDialog(self.pipe_widget.pipe, self)
@@ -1982,6 +2227,7 @@ class AmplitudeGraphSettingsDialog(GraphSettingsDialog):
 class AmplitudeTimeGraphWindowWidget(AbstractGraphWindowWidget):
     def __init__(self, borehole_window_: BoreholeMenuWindowWidget):
         super().__init__(borehole_window_)
+        from graph_widget import AmplitudeTimeGraphWidget
         self.plot_widget = AmplitudeTimeGraphWidget(dict(), self)
         
         self.graph_settings_dialog = AmplitudeGraphSettingsDialog(self)
@@ -2007,7 +2253,7 @@ class AmplitudeTimeGraphWindowWidget(AbstractGraphWindowWidget):
         self.data_frames = self.borehole_window.borehole.get_step_maxes_dataframe_dict()
     
     def checkbox_activate(self) -> None:
-        print(self.data_frames)
+        logger.debug('amplitude data frames: %s', self.data_frames)
         if len(self.data_frames) < 1:
             return
         self.hide_line_dialog.remove_all()
@@ -2077,6 +2323,7 @@ class DepthGraphSettingsDialog(GraphSettingsDialog):
 class DepthResponseGraphWindowWidget(AbstractGraphWindowWidget):
     def __init__(self, borehole_window_: BoreholeMenuWindowWidget):
         super().__init__(borehole_window_)
+        from graph_widget import DepthResponseGraphWidget
         self.plot_widget = DepthResponseGraphWidget(dict(), self)
 
         self.graph_settings_dialog = DepthGraphSettingsDialog(self)
@@ -2084,8 +2331,11 @@ class DepthResponseGraphWindowWidget(AbstractGraphWindowWidget):
         self.settings_menu_action_btn.triggered.connect(self.graph_settings_dialog.run)
 
         self.step_nums_list = list()
+        self.depth_frames = dict()
         self.slider = QSlider(Qt.Horizontal, self)
         self.__slider_init()
+        from playback import PlaybackWidget
+        self.playback_widget = PlaybackWidget(self.slider, self.render_frame, self)
         self.__all_widgets_to_layout()
         self.activate(False)
 
@@ -2100,41 +2350,51 @@ class DepthResponseGraphWindowWidget(AbstractGraphWindowWidget):
         core_layout = QVBoxLayout()
         core_layout.addWidget(self.menu_bar)
         core_layout.addWidget(self.slider)
+        core_layout.addWidget(self.playback_widget)
         core_layout.addWidget(self.plot_widget)
         self.setLayout(core_layout)
 
     def activate(self, is_active_: bool = True) -> None:
         self.graph_settings_dialog.close()
+        self.playback_widget.pause()
         super().activate(is_active_)
 
-    @loading()
+    @loading('set_frames')
     def plot_graph_action(self) -> None:
         self.data_frames = self.borehole_window.borehole.get_step_depth_dataframe_dict()
-        if len(self.data_frames) < 1:
+        self.step_nums_list = sorted(self.data_frames.keys())
+        graph_kwargs = self.get_graph_kwargs()
+        self.depth_frames = dict()
+        for step_num in self.step_nums_list:
+            key = (step_num, graph_kwargs['mean_mode'], graph_kwargs['sensor_num'], graph_kwargs['is_relative'])
+            self.depth_frames[key] = compute_depth_frame(self.data_frames, *key)
+
+    def set_frames(self) -> None:
+        self.plot_widget.set_frames(self.data_frames, self.depth_frames)
+        if len(self.step_nums_list) < 1:
             return
-
-        self.step_nums_list.clear()
-        for step_num in self.data_frames.keys():
-            self.step_nums_list.append(step_num)
-        self.step_nums_list.sort()
         self.slider.setRange(1, len(self.step_nums_list))
-        self.slider.setValue(1)
+        if self.slider.value() != 1:
+            self.slider.setValue(1)
+        else:
+            self.replot_for_new_data()
 
-        self.replot_for_new_data()
+    def get_graph_kwargs(self) -> dict:
+        if self.graph_settings_dialog.sensor_num == -1:
+            return {'sensor_num': -1, 'mean_mode': self.graph_settings_dialog.mean_mode,
+                    'is_relative': self.graph_settings_dialog.is_relative}
+        return {'sensor_num': self.graph_settings_dialog.sensor_num, 'mean_mode': 0,
+                'is_relative': self.graph_settings_dialog.is_relative}
 
-    # @loading()
     def replot_for_new_data(self) -> None:
         if len(self.step_nums_list) < 1:
             return
-        if self.graph_settings_dialog.sensor_num == -1:
-            self.plot_widget.recreate(self.data_frames, sensor_num=-1,
-                                      step_num=self.step_nums_list[self.slider.value() - 1],
-                                      mean_mode=self.graph_settings_dialog.mean_mode,
-                                      is_relative=self.graph_settings_dialog.is_relative)
-        else:
-            self.plot_widget.recreate(self.data_frames, sensor_num=self.graph_settings_dialog.sensor_num,
-                                      step_num=self.step_nums_list[self.slider.value() - 1],
-                                      is_relative=self.graph_settings_dialog.is_relative)
+        self.plot_widget.recreate(self.data_frames, step_num=self.step_nums_list[self.slider.value() - 1],
+                                  **self.get_graph_kwargs())
+
+    def render_frame(self, index_: int) -> QImage:
+        self.slider.setValue(self.slider.minimum() + index_)
+        return self.plot_widget.grab().toImage()
 
     def checkbox_activate(self) -> None:
         pass
@@ -2144,6 +2404,7 @@ class DepthResponseGraphWindowWidget(AbstractGraphWindowWidget):
 class WindRoseGraphWindowWidget(AbstractGraphWindowWidget):
     def __init__(self, borehole_window_: BoreholeMenuWindowWidget):
         super().__init__(borehole_window_)
+        from graph_widget import WindRoseGraphWidget
         self.plot_widget = WindRoseGraphWidget(self)
 
         self.is_relative = False
@@ -2152,8 +2413,11 @@ class WindRoseGraphWindowWidget(AbstractGraphWindowWidget):
         relative_action_btn.setChecked(True)
         relative_action_btn.triggered.connect(self.change_relative_mode_action)
 
+        self.wind_rose_frames = dict()
         self.slider = QSlider(Qt.Horizontal, self)
         self.__slider_init()
+        from playback import PlaybackWidget
+        self.playback_widget = PlaybackWidget(self.slider, self.render_frame, self)
         self.__all_widgets_to_layout()
         self.activate(False)
 
@@ -2168,33 +2432,54 @@ class WindRoseGraphWindowWidget(AbstractGraphWindowWidget):
         core_layout = QVBoxLayout()
         core_layout.addWidget(self.menu_bar)
         core_layout.addWidget(self.slider)
+        core_layout.addWidget(self.playback_widget)
         core_layout.addWidget(self.plot_widget)
         self.setLayout(core_layout)
 
     @loading('checkbox_activate')
     def plot_graph_action(self) -> None:
         self.data_frames = self.borehole_window.borehole.get_sensor_dataframe_dict()
+        self.wind_rose_frames = {is_relative: WindRoseFrames(self.data_frames, is_relative)
+                                 for is_relative in (False, True)}
         
     def checkbox_activate(self) -> None:
         self.hide_line_dialog.remove_all()
         for section_name in self.data_frames:
             self.hide_line_dialog.add_checkbox(section_name, CheckBoxHideWindRoseFunctor(section_name, self), True)
+        self.set_frames()
         if self.slider.value() != 1:
             self.slider.setValue(1)
-        else:
-            self.replot_for_new_data()
 
-    def replot_for_new_data(self) -> None:
-        self.plot_widget.clear()
-        if len(self.data_frames.keys()) < 1:
+    def set_frames(self) -> None:
+        if len(self.data_frames.keys()) < 1 or self.is_relative not in self.wind_rose_frames:
+            self.plot_widget.clear()
+            self.plot_widget.canvas.draw()
             return
-        max_range = 1
-        for key in self.data_frames.keys():
-            for dataframe in self.data_frames[key]:
-                max_range = max(max_range, len(dataframe.data['y']))
-        self.slider.setRange(1, max_range)
-        self.plot_widget.set_data(self.data_frames, self.slider.value() - 1, self.is_relative)
+        visible_sections = dict()
+        for section_name in self.data_frames.keys():
+            visible_sections[section_name] = all(dataframe.active for dataframe in self.data_frames[section_name])
+        frames = self.wind_rose_frames[self.is_relative]
+        self.plot_widget.set_frames(frames, visible_sections)
+        self.slider.setRange(1, max(len(frames), 1))
+        self.replot_for_new_data()
+
+    def replot_for_new_data(self) -> None:
+        self.plot_widget.show_frame(self.slider.value() - 1)
+
+    def render_frame(self, index_: int) -> QImage:
+        self.slider.setValue(self.slider.minimum() + index_)
+        return self.plot_widget.grab().toImage()
+
+    def activate(self, is_active_: bool = True) -> None:
+        self.playback_widget.pause()
+        super().activate(is_active_)
     
+    def set_section_visible(self, section_name_: str, is_visible_: bool) -> None:
+        if section_name_ in self.data_frames:
+            for dataframe in self.data_frames[section_name_]:
+                dataframe.active = is_visible_
+        self.plot_widget.set_section_visible(section_name_, is_visible_)
+
     def change_relative_mode_action(self, state_: bool) -> None:
         CheckBoxAbsoluteValueWindRoseFunctor(self).action(state_)
 
@@ -2205,7 +2490,7 @@ class CheckBoxAbsoluteValueWindRoseFunctor(AbstractFunctor):
 
     def action(self, state_: int) -> None:
         self.graph_window_widget.is_relative = state_ == 0
-        self.graph_window_widget.replot_for_new_data()
+        self.graph_window_widget.set_frames()
 
 
 class CheckBoxHideWindRoseFunctor(AbstractFunctor):
@@ -2214,7 +2499,111 @@ class CheckBoxHideWindRoseFunctor(AbstractFunctor):
         self.graph_window_widget = graph_window_widget_
 
     def action(self, state_: int) -> None:
-        if self.section_name in self.graph_window_widget.data_frames:
-            for dataframe in self.graph_window_widget.data_frames[self.section_name]:
-                dataframe.active = state_   
-        self.graph_window_widget.replot_for_new_data()
+        self.graph_window_widget.set_section_visible(self.section_name, state_ != 0)
+
+
+# ---------------- Spectrum ----------------
+class SpectrumSettingsDialog(AbstractToolDialog):
+    def __init__(self, window_graph_):
+        super().__init__(cf.SPECTRUM_SETTINGS_DIALOG_TITLE, window_graph_)
+        self.window_graph = window_graph_
+        self.window_name = cf.DEFAULT_SPECTRUM_WINDOW
+        self.segment_size = cf.DEFAULT_WELCH_SEGMENT_SIZE
+        self.overlap = cf.DEFAULT_WELCH_OVERLAP
+
+        self.window_editor = QComboBox(self)
+        self.segment_editor = QLineEdit(self)
+        self.overlap_editor = QLineEdit(self)
+        self.__editors_init()
+
+        self.accept_btn = ButtonWidget('Ок', self, action=self.accept_action)
+        self.__all_widgets_to_layout()
+
+    def __editors_init(self) -> None:
+        self.window_editor.addItems(cf.SPECTRUM_WINDOW_NAMES.keys())
+        self.window_editor.currentIndexChanged.connect(self.window_changed_action)
+        self.window_editor.setCurrentIndex(list(cf.SPECTRUM_WINDOW_NAMES.values()).index(self.window_name))
+
+        self.segment_editor.setValidator(QIntValidator(0, 10**7))
+        self.segment_editor.setAlignment(Qt.AlignRight)
+        self.segment_editor.setText(str(self.segment_size))
+        self.segment_editor.textChanged.connect(self.segment_edit_action)
+
+        self.overlap_editor.setValidator(QDoubleValidator(0., 0.9, 2))
+        self.overlap_editor.setAlignment(Qt.AlignRight)
+        self.overlap_editor.setText(str(self.overlap))
+        self.overlap_editor.textChanged.connect(self.overlap_edit_action)
+
+    def __all_widgets_to_layout(self) -> None:
+        flo = QFormLayout()
+        flo.addRow('Оконная функция', self.window_editor)
+        flo.addRow('Размер сегмента (0 - вся запись)', self.segment_editor)
+        flo.addRow('Перекрытие сегментов', self.overlap_editor)
+
+        core_layout = QVBoxLayout()
+        core_layout.addLayout(flo)
+        core_layout.addWidget(self.accept_btn)
+        self.setLayout(core_layout)
+
+    def window_changed_action(self, index_: int) -> None:
+        self.window_name = cf.SPECTRUM_WINDOW_NAMES[self.window_editor.currentText()]
+
+    def segment_edit_action(self, text_: str) -> None:
+        self.segment_size = 0 if len(text_) < 1 else int(text_)
+
+    def overlap_edit_action(self, text_: str) -> None:
+        if len(text_) != 0:
+            self.overlap = min(max(float(text_.replace(',', '.')), 0.), 0.9)
+
+    def accept_action(self) -> None:
+        self.window_graph.plot_graph_action()
+        self.close()
+
+
+class SpectrumGraphWindowWidget(AbstractGraphWindowWidget):
+    def __init__(self, borehole_window_: BoreholeMenuWindowWidget):
+        super().__init__(borehole_window_)
+        from graph_widget import SpectrumGraphWidget
+        self.plot_widget = SpectrumGraphWidget(dict(), self)
+
+        self.spectrum_settings_dialog = SpectrumSettingsDialog(self)
+        settings_action_btn = self.tools_menu_btn.addAction('Настройки спектра')
+        settings_action_btn.triggered.connect(self.spectrum_settings_dialog.run)
+
+        self.__all_widgets_to_layout()
+        self.activate(False)
+
+    def __all_widgets_to_layout(self) -> None:
+        core_layout = QVBoxLayout()
+        core_layout.addWidget(self.menu_bar)
+        core_layout.addWidget(self.plot_widget)
+        self.setLayout(core_layout)
+
+    def activate(self, is_active_: bool = True) -> None:
+        self.spectrum_settings_dialog.close()
+        super().activate(is_active_)
+
+    @loading('checkbox_activate')
+    def plot_graph_action(self) -> None:
+        xy_data_frames = self.borehole_window.borehole.get_xy_dataframes_dict()
+        all_xy_data_frames = [dataframe for section_name in xy_data_frames.keys()
+                              for dataframe in xy_data_frames[section_name]]
+        spectra = get_spectra(all_xy_data_frames, self.spectrum_settings_dialog.window_name,
+                              self.spectrum_settings_dialog.segment_size, self.spectrum_settings_dialog.overlap)
+        self.data_frames = dict()
+        i = 0
+        for section_name in xy_data_frames.keys():
+            self.data_frames[section_name] = []
+            for dataframe in xy_data_frames[section_name]:
+                self.data_frames[section_name].append(SpectrumDataFrame(dataframe, *spectra[i]))
+                i += 1
+
+    def checkbox_activate(self) -> None:
+        if len(self.data_frames.keys()) < 1:
+            return
+        self.hide_line_dialog.remove_all()
+        for section_name in self.data_frames.keys():
+            for dataframe in self.data_frames[section_name]:
+                self.hide_line_dialog.add_checkbox(section_name + '=' + dataframe.name,
+                                                   CheckBoxHideFunctor(dataframe, self), True)
+        self.replot_for_new_data()
@@ -0,0 +1,173 @@
+import io
+import os
+from PIL import Image
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QComboBox, QCheckBox, QSlider, QFileDialog
+from PySide6.QtGui import QImage
+from PySide6.QtCore import QObject, QTimer, QBuffer, QIODevice, Signal
+from third_party import ButtonWidget, MessageBox
+import config as cf
+
+
+def qimage_to_pil(image_: QImage) -> Image.Image:
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image_.save(buffer, 'PNG')
+    return Image.open(io.BytesIO(buffer.data().data())).convert('RGB')
+
+
+def save_animation(images_: list, path_: str, interval_ms_: int = cf.DEFAULT_PLAYBACK_INTERVAL_MS) -> list:
+    if len(images_) < 1:
+        return []
+    root, extension = os.path.splitext(path_)
+    if extension.lower() == '.gif':
+        frames = [qimage_to_pil(image) for image in images_]
+        frames[0].save(path_, save_all=True, append_images=frames[1:], duration=interval_ms_, loop=0)
+        return [path_]
+    paths = []
+    for i in range(len(images_)):
+        paths.append(root + '_' + str(i + 1).zfill(cf.ANIMATION_SERIES_INDEX_WIDTH) + '.png')
+        images_[i].save(paths[-1], 'PNG')
+    return paths
+
+
+class PlaybackController(QObject):
+    frame_changed = Signal(int)
+    state_changed = Signal(bool)
+
+    def __init__(self, parent_: QObject = None):
+        super().__init__(parent_)
+        self.frame_count = 0
+        self.index = 0
+        self.speed = cf.PLAYBACK_SPEEDS[cf.DEFAULT_PLAYBACK_SPEED]
+        self.is_loop = False
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.next_frame_action)
+        self.set_speed(self.speed)
+
+    def is_playing(self) -> bool:
+        return self.timer.isActive()
+
+    def interval(self) -> int:
+        return max(1, int(cf.DEFAULT_PLAYBACK_INTERVAL_MS / self.speed))
+
+    def set_speed(self, speed_: float) -> None:
+        self.speed = speed_
+        self.timer.setInterval(self.interval())
+
+    def set_loop(self, is_loop_: bool) -> None:
+        self.is_loop = is_loop_
+
+    def set_frame_count(self, frame_count_: int) -> None:
+        self.frame_count = frame_count_
+        if self.index >= self.frame_count:
+            self.index = 0
+        if self.frame_count < 2:
+            self.pause()
+
+    def set_index(self, index_: int) -> None:
+        self.index = index_
+
+    def play(self) -> None:
+        if self.frame_count < 2 or self.is_playing():
+            return
+        if self.index >= self.frame_count - 1:
+            self.index = 0
+            self.frame_changed.emit(self.index)
+        self.timer.start()
+        self.state_changed.emit(True)
+
+    def pause(self) -> None:
+        if not self.is_playing():
+            return
+        self.timer.stop()
+        self.state_changed.emit(False)
+
+    def toggle(self) -> None:
+        if self.is_playing():
+            self.pause()
+        else:
+            self.play()
+
+    def next_frame_action(self) -> None:
+        if self.index + 1 >= self.frame_count:
+            if not self.is_loop:
+                self.pause()
+                return
+            self.index = 0
+        else:
+            self.index += 1
+        self.frame_changed.emit(self.index)
+
+
+class PlaybackWidget(QWidget):
+    def __init__(self, slider_: QSlider, render_frame_=None, parent_: QWidget = None):
+        super().__init__(parent_)
+        self.slider = slider_
+        self.render_frame = render_frame_
+        self.controller = PlaybackController(self)
+
+        self.play_btn = ButtonWidget('▶', self, action=self.controller.toggle)
+        self.speed_editor = QComboBox(self)
+        self.loop_checkbox = QCheckBox('Повтор', self)
+        self.export_btn = ButtonWidget('Экспорт', self, action=self.export_action,
+                                       is_show=render_frame_ is not None)
+        self.__editors_init()
+        self.__all_widgets_to_layout()
+
+    def __editors_init(self) -> None:
+        self.speed_editor.addItems(list(cf.PLAYBACK_SPEEDS.keys()))
+        self.speed_editor.setCurrentText(cf.DEFAULT_PLAYBACK_SPEED)
+        self.speed_editor.currentTextChanged.connect(self.speed_changed_action)
+        self.loop_checkbox.stateChanged.connect(self.loop_changed_action)
+
+        self.controller.state_changed.connect(self.state_changed_action)
+        self.controller.frame_changed.connect(self.frame_changed_action)
+        self.slider.valueChanged.connect(self.slider_changed_action)
+        self.slider.rangeChanged.connect(self.range_changed_action)
+        self.range_changed_action(self.slider.minimum(), self.slider.maximum())
+
+    def __all_widgets_to_layout(self) -> None:
+        core_layout = QHBoxLayout()
+        core_layout.setContentsMargins(0, 0, 0, 0)
+        core_layout.addWidget(self.play_btn)
+        core_layout.addWidget(self.speed_editor)
+        core_layout.addWidget(self.loop_checkbox)
+        core_layout.addWidget(self.export_btn)
+        core_layout.addStretch()
+        self.setLayout(core_layout)
+
+    def speed_changed_action(self, text_: str) -> None:
+        self.controller.set_speed(cf.PLAYBACK_SPEEDS[text_])
+
+    def loop_changed_action(self, state_: int) -> None:
+        self.controller.set_loop(state_ != 0)
+
+    def state_changed_action(self, is_playing_: bool) -> None:
+        self.play_btn.setText('⏸' if is_playing_ else '▶')
+
+    def frame_changed_action(self, index_: int) -> None:
+        self.slider.setValue(self.slider.minimum() + index_)
+
+    def slider_changed_action(self, value_: int) -> None:
+        self.controller.set_index(value_ - self.slider.minimum())
+
+    def range_changed_action(self, min_: int, max_: int) -> None:
+        self.controller.set_frame_count(max_ - min_ + 1)
+
+    def pause(self) -> None:
+        self.controller.pause()
+
+    def export_action(self) -> None:
+        self.controller.pause()
+        filename = QFileDialog.getSaveFileName(self, filter=cf.FILE_DIALOG_ANIMATION_FILTER)[0]
+        if not filename:
+            return
+        paths = self.export(filename)
+        if len(paths) > 0:
+            MessageBox().information(cf.EXPORT_COMPLETE_INFO_TITLE, cf.EXPORT_COMPLETE_INFO_MESSAGE_F(paths[0]))
+
+    def export(self, path_: str) -> list:
+        current_value = self.slider.value()
+        images = [self.render_frame(i) for i in range(self.controller.frame_count)]
+        self.render_frame(current_value - self.slider.minimum())
+        return save_animation(images, path_, self.controller.interval())
@@ -0,0 +1,72 @@
+from PySide6.QtCore import QTimer
+from task_context import CancelToken
+from loadlabel import JobScheduler, JobCallback
+from borehole_logic import Borehole
+from dataframes import XYDataFrame
+import config as cf
+
+
+class CachePrefetcher:
+    def __init__(self, borehole_: Borehole):
+        self.borehole = borehole_
+        self.job = None
+        self.is_finished = False
+        self.is_stopped = False
+        self.resume_timer = QTimer()
+        self.resume_timer.setSingleShot(True)
+        self.resume_timer.timeout.connect(self.start)
+
+    def get_filenames(self) -> list:
+        filenames = []
+        for section in sorted(self.borehole.section_list, key=lambda section_: not section_.is_select):
+            for step in section.step_list:
+                for data_file in step.data_list:
+                    if data_file.is_valid is not False and data_file.measurement_num != -1 \
+                            and data_file.sensor_num != -1:
+                        filenames.append(data_file.path())
+        return filenames
+
+    def start(self) -> None:
+        if self.job is not None or self.is_finished or self.is_stopped:
+            return
+        scheduler = JobScheduler()
+        if scheduler.foreground_job_count > 0:
+            self.resume_timer.start(cf.PREFETCH_RESUME_DELAY_MS)
+            return
+        self.job = scheduler.submit(('prefetch', id(self)), self.prefetch, (self.get_filenames(),),
+                                    priority_=cf.JOB_PRIORITY_LOW, is_modal_=False)
+        self.job.add_callback(JobCallback(self.prefetch_complete, True, (self.job,), dict()))
+
+    def stop(self) -> None:
+        self.is_stopped = True
+        self.resume_timer.stop()
+        if self.job is not None:
+            JobScheduler().cancel_job(self.job)
+            self.job = None
+
+    def restart(self) -> None:
+        self.stop()
+        self.is_finished = False
+        self.is_stopped = False
+        self.start()
+
+    def prefetch(self, filenames_: list) -> bool:
+        scheduler = JobScheduler()
+        cancel_token = CancelToken.current()
+        for filename in filenames_:
+            cancel_token.check()
+            if scheduler.foreground_job_count > 0:
+                return False
+            try:
+                XYDataFrame.read_summary(filename)
+            except Exception:
+                continue
+        return True
+
+    def prefetch_complete(self, is_finished_: bool, job_) -> None:
+        if job_ is not self.job:
+            return
+        self.job = None
+        self.is_finished = is_finished_
+        if not self.is_finished and not self.is_stopped:
+            self.resume_timer.start(cf.PREFETCH_RESUME_DELAY_MS)
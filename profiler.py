@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+import config as cf
+
+
+class Span:
+    def __init__(self, profiler_, name_: str, args_: dict = None):
+        self.profiler = profiler_
+        self.name = name_
+        self.args = args_
+        self.start_time = 0.
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.profiler.add_span(self.name, self.start_time, time.perf_counter(), self.args)
+        return False
+
+
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+class Profiler:
+    def __init__(self):
+        if hasattr(self, 'stats'):
+            return
+        self.is_enabled = os.environ.get(cf.PROFILE_ENV_VAR, '') not in ('', '0')
+        self.lock = threading.Lock()
+        self.origin_time = time.perf_counter()
+        self.stats = dict()
+        self.counters = dict()
+        self.events = []
+        self.null_span = NullSpan()
+
+    def enable(self, is_enabled_: bool = True) -> None:
+        self.is_enabled = is_enabled_
+
+    def reset(self) -> None:
+        with self.lock:
+            self.stats = dict()
+            self.counters = dict()
+            self.events = []
+
+    def span(self, name_: str, args_: dict = None):
+        return Span(self, name_, args_) if self.is_enabled else self.null_span
+
+    def add_span(self, name_: str, start_time_: float, end_time_: float, args_: dict = None) -> None:
+        duration = end_time_ - start_time_
+        with self.lock:
+            stat = self.stats.get(name_)
+            if stat is None:
+                stat = self.stats[name_] = {'count': 0, 'total_s': 0., 'max_s': 0.}
+            stat['count'] += 1
+            stat['total_s'] += duration
+            stat['max_s'] = max(stat['max_s'], duration)
+            if len(self.events) < cf.PROFILER_MAX_EVENTS:
+                self.events.append((name_, start_time_, duration, threading.get_ident(), args_))
+
+    def count(self, name_: str, value_: int = 1) -> None:
+        if not self.is_enabled:
+            return
+        with self.lock:
+            self.counters[name_] = self.counters.get(name_, 0) + value_
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {name: dict(stat) for name, stat in self.stats.items()}
+
+    def get_counters(self) -> dict:
+        with self.lock:
+            return dict(self.counters)
+
+    def get_chrome_trace(self) -> dict:
+        with self.lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+        pid = os.getpid()
+        trace_events = []
+        for name, start_time, duration, tid, args in events:
+            event = {'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': (start_time - self.origin_time) * 10**6, 'dur': duration * 10**6}
+            if args is not None:
+                event['args'] = args
+            trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms', 'otherData': {'counters': counters}}
+
+    def dump_chrome_trace(self, path_: str) -> None:
+        with open(path_, 'w', encoding=cf.DEFAULT_ENCODING) as file:
+            json.dump(self.get_chrome_trace(), file)
+
+    def __new__(cls):
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(Profiler, cls).__new__(cls)
+        return cls.instance
+
+
+def span(name_: str, args_: dict = None):
+    return Profiler().span(name_, args_)
+
+
+def count(name_: str, value_: int = 1) -> None:
+    Profiler().count(name_, value_)
+
+
+def profiled(name_: str):
+    def profiled_decorator(func_):
+        @functools.wraps(func_)
+        def wrapper(*args, **kwargs):
+            with Profiler().span(name_):
+                return func_(*args, **kwargs)
+        return wrapper
+    return profiled_decorator
+
+
+def dump_trace_at_exit() -> None:
+    path = os.environ.get(cf.PROFILE_TRACE_ENV_VAR, '')
+    if len(path) > 0 and Profiler().is_enabled:
+        Profiler().dump_chrome_trace(path)
+
+
+atexit.register(dump_trace_at_exit)
@@ -0,0 +1,156 @@
+import os
+import sys
+import argparse
+import numpy as np
+from logger import get_logger, setup_logging
+import config as cf
+
+
+logger = get_logger(__name__)
+
+
+def get_measurement_name(measurement_num_: int) -> str:
+    return str(measurement_num_) if measurement_num_ < 10 else chr(ord('A') + measurement_num_ - 10)
+
+
+def get_data_filename(sensor_num_: int, depth_mm_: int, measurement_num_: int) -> str:
+    return 'DEFAULT_' + chr(ord('A') + sensor_num_) + '_' + str(depth_mm_) + 'mm_' + \
+           get_measurement_name(measurement_num_) + '.csv'
+
+
+def get_header_lines(point_count_: int) -> list:
+    return [
+        cf.TIME_BASE_HEADER + ':' + str(cf.GENERATOR_TIME_BASE_US) + 'μs',
+        cf.SAMPLING_RATE_HEADER + ':' + str(cf.GENERATOR_SAMPLING_RATE_MSA) + 'MSa/s',
+        cf.AMPLITUDE_HEADER + ':2V',
+        cf.AMPLITUDE_RESOLUTION_HEADER + ':0.08mV',
+        cf.DATA_UINT_HEADER + ':mV',
+        cf.DATA_POINTS_HEADER + ':' + str(point_count_),
+        cf.ZERO_INDEX_HEADER + ':' + str(point_count_ // 4),
+    ]
+
+
+def get_noise(rng_: np.random.Generator, noise_: str, noise_level_: float, point_count_: int) -> np.ndarray:
+    if noise_ == 'gauss':
+        return rng_.normal(0., noise_level_, point_count_)
+    if noise_ == 'uniform':
+        return rng_.uniform(-noise_level_, noise_level_, point_count_)
+    return np.zeros(point_count_)
+
+
+def get_trace(rng_: np.random.Generator, amplitude_: float, frequency_: float, noise_: str, noise_level_: float,
+              point_count_: int) -> np.ndarray:
+    t = np.arange(point_count_) - point_count_ // 4
+    envelope = np.where(t < 0, 0., np.exp(-np.maximum(t, 0) / max(point_count_ / 4, 1.)))
+    return amplitude_ * envelope * np.sin(2 * np.pi * frequency_ * t) + \
+        get_noise(rng_, noise_, noise_level_, point_count_)
+
+
+def write_trace(path_: str, header_lines_: list, trace_: np.ndarray) -> None:
+    with open(path_, 'w', encoding=cf.DEFAULT_ENCODING) as file:
+        file.write('\n'.join(header_lines_) + '\n')
+        file.write('\n'.join(['{:.4f}'.format(value) for value in trace_.tolist()]) + '\n')
+
+
+def write_malformed_trace(rng_: np.random.Generator, step_path_: str, filename_: str, header_lines_: list,
+                          trace_: np.ndarray) -> tuple:
+    kind = cf.GENERATOR_MALFORMED_KINDS[rng_.integers(len(cf.GENERATOR_MALFORMED_KINDS))]
+    if kind == 'filename':
+        filename_ = 'trace_' + filename_[len('DEFAULT_'):-len('.csv')].replace('_', '') + '.csv'
+    elif kind == 'header':
+        header_lines_ = list(header_lines_)
+        line_num = rng_.integers(len(header_lines_))
+        header_lines_[line_num] = header_lines_[line_num].replace(':', ' ', 1)
+    path = os.path.join(step_path_, filename_)
+    write_trace(path, header_lines_, trace_)
+    if kind == 'data':
+        with open(path, 'a', encoding=cf.DEFAULT_ENCODING) as file:
+            file.write('---\n')
+    return path, kind
+
+
+def write_info_file(path_: str, section_names_: list, section_depths_: list) -> None:
+    with open(os.path.join(path_, cf.BOREHOLE_INFO_SAVE_FILENAME), 'w', encoding=cf.DEFAULT_ENCODING) as file:
+        file.write(cf.BOREHOLE_NAME_BOREHOLE_INFO_F(os.path.basename(path_)))
+        file.write(cf.START_SECTIONS_TAG_BOREHOLE_INFO)
+        for section_name, section_depth in zip(section_names_, section_depths_):
+            file.write(cf.START_SECTION_TAG_BOREHOLE_INFO)
+            file.write(cf.SECTION_NAME_BOREHOLE_INFO_F(section_name))
+            file.write(cf.SECTION_DEPTH_BOREHOLE_INFO_F(section_depth))
+            file.write(cf.SECTION_LENGTH_BOREHOLE_INFO_F(cf.DEFAULT_SECTION_LENGTH))
+            file.write(cf.END_SECTION_TAG_BOREHOLE_INFO)
+        file.write(cf.END_SECTIONS_TAG_BOREHOLE_INFO)
+
+
+def generate_project(path_: str, section_count_: int = cf.DEFAULT_GENERATOR_SECTION_COUNT,
+                     step_count_: int = cf.DEFAULT_GENERATOR_STEP_COUNT,
+                     sensor_count_: int = cf.DEFAULT_SENSOR_AMOUNT,
+                     measurement_count_: int = cf.DEFAULT_MEASUREMENT_NUMBER,
+                     point_count_: int = cf.DEFAULT_GENERATOR_POINT_COUNT,
+                     noise_: str = cf.DEFAULT_GENERATOR_NOISE, noise_level_: float = cf.DEFAULT_GENERATOR_NOISE_LEVEL,
+                     malformed_fraction_: float = 0., seed_: int = 0) -> dict:
+    if not 0 < sensor_count_ <= cf.DEFAULT_SENSOR_AMOUNT:
+        raise ValueError(cf.GENERATOR_RANGE_WARNING_MESSAGE_F('sensor_count', 1, cf.DEFAULT_SENSOR_AMOUNT))
+    if not 0 < measurement_count_ <= cf.DEFAULT_MEASUREMENT_NUMBER:
+        raise ValueError(cf.GENERATOR_RANGE_WARNING_MESSAGE_F('measurement_count', 1, cf.DEFAULT_MEASUREMENT_NUMBER))
+    if noise_ not in cf.GENERATOR_NOISE_MODELS:
+        raise ValueError(cf.GENERATOR_NOISE_WARNING_MESSAGE_F(noise_))
+    if os.path.isdir(path_) and len(os.listdir(path_)) > 0:
+        raise FileExistsError(cf.NOT_EMPTY_FOLDER_WARNING_MESSAGE_F(path_))
+
+    rng = np.random.default_rng(seed_)
+    section_names = [cf.DEFAULT_SECTION_NAME + str(i) for i in range(section_count_)]
+    section_depths = [int(i * cf.DEFAULT_SECTION_LENGTH) for i in range(section_count_)]
+    header_lines = get_header_lines(point_count_)
+    os.makedirs(path_, exist_ok=True)
+    write_info_file(path_, section_names, section_depths)
+
+    result = {'path': path_, 'file_count': 0, 'malformed': dict()}
+    for section_name, section_depth in zip(section_names, section_depths):
+        section_gain = rng.uniform(0.5, 1.5)
+        for step_num in range(step_count_):
+            step_path = os.path.join(path_, section_name, str(step_num))
+            os.makedirs(step_path)
+            for sensor_num in range(sensor_count_):
+                for measurement_num in range(measurement_count_):
+                    amplitude = section_gain * (1 + sensor_num) * (1 + 0.1 * step_num)
+                    frequency = cf.GENERATOR_BASE_FREQUENCY * (1 + 0.1 * measurement_num)
+                    trace = get_trace(rng, amplitude, frequency, noise_, noise_level_, point_count_)
+                    filename = get_data_filename(sensor_num, section_depth * 1000, measurement_num)
+                    if rng.random() < malformed_fraction_:
+                        path, kind = write_malformed_trace(rng, step_path, filename, header_lines, trace)
+                        result['malformed'][path] = kind
+                    else:
+                        write_trace(os.path.join(step_path, filename), header_lines, trace)
+                    result['file_count'] += 1
+    return result
+
+
+def main(argv_: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Генерация синтетического проекта скважины")
+    parser.add_argument('project', help="папка создаваемого проекта")
+    parser.add_argument('--sections', type=int, default=cf.DEFAULT_GENERATOR_SECTION_COUNT)
+    parser.add_argument('--steps', type=int, default=cf.DEFAULT_GENERATOR_STEP_COUNT)
+    parser.add_argument('--sensors', type=int, default=cf.DEFAULT_SENSOR_AMOUNT)
+    parser.add_argument('--measurements', type=int, default=cf.DEFAULT_MEASUREMENT_NUMBER)
+    parser.add_argument('--points', type=int, default=cf.DEFAULT_GENERATOR_POINT_COUNT)
+    parser.add_argument('--noise', choices=cf.GENERATOR_NOISE_MODELS, default=cf.DEFAULT_GENERATOR_NOISE)
+    parser.add_argument('--noise-level', type=float, default=cf.DEFAULT_GENERATOR_NOISE_LEVEL)
+    parser.add_argument('--malformed', type=float, default=0., help="доля испорченных файлов от 0 до 1")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv_)
+    setup_logging()
+
+    try:
+        result = generate_project(os.path.abspath(args.project), args.sections, args.steps, args.sensors,
+                                  args.measurements, args.points, args.noise, args.noise_level, args.malformed,
+                                  args.seed)
+    except (ValueError, FileExistsError) as e:
+        logger.error('%s', e)
+        return 1
+    print(cf.GENERATOR_COMPLETE_MESSAGE_F(result['path'], result['file_count'], len(result['malformed'])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import os
+import re
+import sys
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from diagnostics import Diagnostics, print_diagnostic
+from task_context import ProgressReporter
+from borehole_logic import Borehole
+from dataframes import XYDataFrame, MaxesDataFrame, WindRoseFrames, compute_depth_frame
+from report_render import render_figure
+from profiler import profiled
+from logger import get_logger, setup_logging
+import config as cf
+
+
+logger = get_logger(__name__)
+
+
+WIND_ROSE_THETA = np.array([0, 90, 180, 270, 360]) / 180 * np.pi
+WIND_ROSE_TICK_LABELS = ['0° A', '45° ', '90° B', '135° ', '180° C', '225° ', '270° D', '315° ']
+
+
+def get_safe_filename(name_: str) -> str:
+    return re.sub(r'[^\w\-.]+', '_', str(name_)).strip('_') or 'graph'
+
+
+def get_color(i_: int) -> str:
+    return cf.COLOR_NAMES[i_ % len(cf.COLOR_NAMES)]
+
+
+def make_job(out_dir_: str, name_: str, format_: str, dpi_: int, title_: str, series_: list, **kwargs) -> dict:
+    job = {
+        'path': os.path.join(out_dir_, get_safe_filename(name_) + '.' + format_),
+        'format': format_,
+        'dpi': dpi_,
+        'title': title_,
+        'series': series_,
+    }
+    job.update(kwargs)
+    return job
+
+
+def get_oscilloscope_jobs(borehole_: Borehole, out_dir_: str, format_: str, dpi_: int) -> list:
+    jobs = []
+    xy_dataframes_dict = borehole_.get_xy_dataframes_dict()
+    for section_name in xy_dataframes_dict.keys():
+        series = []
+        for dataframe in xy_dataframes_dict[section_name]:
+            if not dataframe.is_correct_read():
+                continue
+            data_x = np.asarray(XYDataFrame.get_data_x(dataframe.header[cf.DATA_POINTS_HEADER],
+                                                       dataframe.header[cf.TIME_BASE_HEADER],
+                                                       dataframe.header[cf.ZERO_INDEX_HEADER])['x'])
+            pyramid = dataframe.get_pyramid()
+            indices, data_y = pyramid.get_view(0, min(len(pyramid), len(data_x)), cf.REPORT_PIXEL_COUNT)
+            series.append((dataframe.name, data_x[indices], data_y, get_color(len(series)), 1))
+        if len(series) > 0:
+            jobs.append(make_job(out_dir_, 'oscilloscope_' + section_name, format_, dpi_,
+                                 "Данные осциллографа: " + section_name, series,
+                                 x_label='Время (с)', y_label='Напряжение (мВ)'))
+    return jobs
+
+
+def get_frequency_jobs(borehole_: Borehole, out_dir_: str, format_: str, dpi_: int) -> list:
+    series = []
+    dataframes_dict = borehole_.get_sensor_21_dataframe_dict()
+    for section_name in dataframes_dict.keys():
+        for dataframe in dataframes_dict[section_name]:
+            data_x = MaxesDataFrame.get_data_x(len(dataframe.data['y']), 4, 2)['x']
+            series.append((section_name + '=' + dataframe.name, data_x, dataframe.data['y'], get_color(len(series)), 2))
+    if len(series) < 1:
+        return []
+    return [make_job(out_dir_, 'frequency', format_, dpi_, "Частотная характеристика", series,
+                     x_label='f, кГц', y_label='U, В')]
+
+
+def get_amplitude_jobs(borehole_: Borehole, out_dir_: str, format_: str, dpi_: int) -> list:
+    jobs, mean_series = [], []
+    dataframes_dict = borehole_.get_step_maxes_dataframe_dict()
+    for section_name in dataframes_dict.keys():
+        series = []
+        for sensor_num in dataframes_dict[section_name].keys():
+            dataframe = dataframes_dict[section_name][sensor_num]
+            if sensor_num >= 0:
+                series.append(('sensor=' + dataframe.name, dataframe.data['x'], dataframe.data['y'],
+                               get_color(len(series)), 1))
+            elif sensor_num == -1:
+                mean_series.append((dataframe.name, dataframe.data['x'], dataframe.data['y'],
+                                    get_color(len(mean_series)), 1))
+        if len(series) > 0:
+            jobs.append(make_job(out_dir_, 'amplitude_' + section_name, format_, dpi_,
+                                 "Зависимость амплитуды во времени: " + section_name, series,
+                                 x_label='Шаг', y_label='Значение', x_margin=0.2))
+    if len(mean_series) > 0:
+        jobs.append(make_job(out_dir_, 'amplitude_mean', format_, dpi_, "Зависимость амплитуды во времени",
+                             mean_series, x_label='Шаг', y_label='Значение', x_margin=0.2))
+    return jobs
+
+
+def get_depth_jobs(borehole_: Borehole, out_dir_: str, format_: str, dpi_: int) -> list:
+    jobs = []
+    dataframes_dict = borehole_.get_step_depth_dataframe_dict()
+    for step_num in sorted(dataframes_dict.keys()):
+        frame = compute_depth_frame(dataframes_dict, step_num, -1, -1, False)
+        if frame is None or len(frame['series']) < 1:
+            continue
+        series = []
+        for section_depth, data_x_list, data_y_list in frame['series']:
+            series.append(('section=' + str(section_depth), data_x_list, data_y_list, get_color(len(series)), 4))
+        jobs.append(make_job(out_dir_, 'depth_step_' + str(step_num), format_, dpi_,
+                             "Глубинная характеристика, шаг " + str(step_num), series,
+                             x_label='Мощность сигнала', y_label='Глубина (м)', x_margin=0.5))
+    return jobs
+
+
+def get_wind_rose_jobs(borehole_: Borehole, out_dir_: str, format_: str, dpi_: int) -> list:
+    jobs = []
+    frames = WindRoseFrames(borehole_.get_sensor_dataframe_dict())
+    index_width = len(str(len(frames)))
+    for index in range(len(frames)):
+        series = []
+        for s in range(len(frames.section_names)):
+            if not np.isnan(frames.data[index, s]).all():
+                series.append((frames.section_names[s], WIND_ROSE_THETA, frames.data[index, s], get_color(s), 1))
+        jobs.append(make_job(out_dir_, 'windrose_' + str(index + 1).zfill(index_width), format_, dpi_,
+                             "Круговая диаграмма, измерение " + str(index + 1), series, projection='polar',
+                             tick_labels=WIND_ROSE_TICK_LABELS, y_lim=(0, frames.get_top_y_lim())))
+    return jobs
+
+
+REPORT_JOB_GETTERS = {
+    'oscilloscope': get_oscilloscope_jobs,
+    'frequency': get_frequency_jobs,
+    'amplitude': get_amplitude_jobs,
+    'depth': get_depth_jobs,
+    'windrose': get_wind_rose_jobs,
+}
+
+
+def get_report_jobs(borehole_: Borehole, out_dir_: str, format_: str = cf.DEFAULT_REPORT_FORMAT,
+                    dpi_: int = cf.DEFAULT_REPORT_DPI, graph_types_: list = None) -> list:
+    jobs = []
+    for graph_type in cf.REPORT_GRAPH_TYPES if graph_types_ is None else graph_types_:
+        jobs += REPORT_JOB_GETTERS[graph_type](borehole_, out_dir_, format_, dpi_)
+    return jobs
+
+
+@profiled('save.report')
+def export_report(jobs_: list, workers_: int = cf.DEFAULT_REPORT_WORKERS) -> list:
+    workers = min(workers_ if workers_ > 0 else os.cpu_count() or 1, len(jobs_))
+    if workers <= 1:
+        return [render_figure(job) for job in jobs_]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(render_figure, jobs_, chunksize=max(1, len(jobs_) // (workers * 4))))
+
+
+def export_borehole_report(borehole_: Borehole, out_dir_: str, format_: str = cf.DEFAULT_REPORT_FORMAT,
+                           dpi_: int = cf.DEFAULT_REPORT_DPI, workers_: int = cf.DEFAULT_REPORT_WORKERS,
+                           graph_types_: list = None) -> list:
+    if not os.path.isdir(out_dir_):
+        os.makedirs(out_dir_)
+    return export_report(get_report_jobs(borehole_, out_dir_, format_, dpi_, graph_types_), workers_)
+
+
+def main(argv_: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Экспорт всех графиков скважины в файлы")
+    parser.add_argument('project', help="папка проекта скважины")
+    parser.add_argument('output', help="папка для сохранения графиков")
+    parser.add_argument('--format', choices=cf.REPORT_FORMATS, default=cf.DEFAULT_REPORT_FORMAT)
+    parser.add_argument('--dpi', type=int, default=cf.DEFAULT_REPORT_DPI)
+    parser.add_argument('--workers', type=int, default=cf.DEFAULT_REPORT_WORKERS)
+    parser.add_argument('--graphs', nargs='+', choices=cf.REPORT_GRAPH_TYPES, default=None)
+    args = parser.parse_args(argv_)
+    setup_logging()
+
+    project_path = os.path.abspath(args.project)
+    if not os.path.isdir(project_path):
+        logger.error('%s', cf.NOT_DIR_WARNING_MESSAGE_F(project_path))
+        return 1
+    Diagnostics.default_sink = print_diagnostic
+    ProgressReporter.is_headless = True
+    borehole = Borehole(os.path.basename(project_path), os.path.dirname(project_path))
+    for section in borehole.section_list:
+        section.select(True)
+    for path in export_borehole_report(borehole, args.output, args.format, args.dpi, args.workers, args.graphs):
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
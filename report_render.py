@@ -0,0 +1,28 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import config as cf
+
+
+def render_figure(job_: dict) -> str:
+    figure = Figure(figsize=cf.REPORT_FIGURE_SIZE)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111, projection=job_.get('projection'))
+    for name, data_x, data_y, color, width in job_['series']:
+        ax.plot(data_x, data_y, label=name, color=color, linewidth=width)
+
+    ax.set_title(job_.get('title', ''))
+    if job_.get('projection') == 'polar':
+        ax.set_xticks(np.arange(len(job_['tick_labels'])) * 2 * np.pi / len(job_['tick_labels']))
+        ax.set_xticklabels(job_['tick_labels'])
+    else:
+        ax.set_xlabel(job_.get('x_label', ''))
+        ax.set_ylabel(job_.get('y_label', ''))
+        ax.margins(x=job_.get('x_margin', 0.05))
+    ax.grid(True)
+    if 'y_lim' in job_:
+        ax.set_ylim(*job_['y_lim'])
+    if 0 < len(job_['series']) <= cf.REPORT_MAX_LEGEND_SIZE:
+        ax.legend(fontsize='small')
+    figure.savefig(job_['path'], dpi=job_['dpi'], format=job_['format'])
+    return job_['path']
@@ -0,0 +1,85 @@
+import numpy as np
+from data_cache import MemoryBoundedCache, file_signature
+import config as cf
+
+
+WINDOW_FUNCTIONS = {
+    'rectangular': np.ones,
+    'hann': np.hanning,
+    'hamming': np.hamming,
+    'blackman': np.blackman,
+}
+
+
+def get_sampling_rate(header_: dict) -> float:
+    sampling_rate = header_.get(cf.SAMPLING_RATE_HEADER)
+    if sampling_rate is not None and sampling_rate > 0:
+        return sampling_rate * 10**6
+    return header_[cf.DATA_POINTS_HEADER] / (header_[cf.TIME_BASE_HEADER] * 32 * 10**-6)
+
+
+def get_segment_size(trace_size_: int, segment_size_: int) -> int:
+    if segment_size_ < 1 or segment_size_ > trace_size_:
+        return trace_size_
+    return segment_size_
+
+
+def batch_spectrum(traces_, sampling_rate_: float, window_: str = cf.DEFAULT_SPECTRUM_WINDOW,
+                   segment_size_: int = 0, overlap_: float = 0.) -> tuple:
+    traces = np.atleast_2d(np.asarray(traces_, dtype=float))
+    segment_size = get_segment_size(traces.shape[1], segment_size_)
+    hop = max(1, int(segment_size * (1. - overlap_)))
+    segments = np.lib.stride_tricks.sliding_window_view(traces, segment_size, axis=1)[:, ::hop, :]
+    segments = segments - segments.mean(axis=-1, keepdims=True)
+    window = WINDOW_FUNCTIONS[window_](segment_size)
+    power = np.abs(np.fft.rfft(segments * window, axis=-1)) ** 2
+    amplitude = np.sqrt(power.mean(axis=1)) * 2 / (window.sum() or 1.)
+    frequencies = np.fft.rfftfreq(segment_size, 1. / sampling_rate_)
+    return frequencies, amplitude
+
+
+class SpectrumCache(MemoryBoundedCache):
+    def __init__(self):
+        if hasattr(self, 'entries'):
+            return
+        super().__init__('spectrum', cf.SPECTRUM_CACHE_MAX_BYTES)
+
+    @staticmethod
+    def get_key(filename_: str, window_: str, segment_size_: int, overlap_: float) -> tuple:
+        return file_signature(filename_), window_, segment_size_, overlap_
+
+    def __new__(cls):
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(SpectrumCache, cls).__new__(cls)
+        return cls.instance
+
+
+def get_spectra(xy_dataframes_: list, window_: str = cf.DEFAULT_SPECTRUM_WINDOW,
+                segment_size_: int = 0, overlap_: float = 0.) -> list:
+    cache = SpectrumCache()
+    spectra = [None] * len(xy_dataframes_)
+    batches = dict()
+    for i in range(len(xy_dataframes_)):
+        dataframe = xy_dataframes_[i]
+        try:
+            key = cache.get_key(dataframe.filename, window_, segment_size_, overlap_)
+        except OSError:
+            key = None
+        spectra[i] = None if key is None else cache.get(key)
+        if spectra[i] is None:
+            batch_key = (len(dataframe.origin_data['y']), get_sampling_rate(dataframe.header))
+            if batch_key not in batches:
+                batches[batch_key] = []
+            batches[batch_key].append((i, key))
+
+    for (trace_size, sampling_rate), batch in batches.items():
+        traces = np.empty((len(batch), trace_size))
+        for row in range(len(batch)):
+            traces[row] = xy_dataframes_[batch[row][0]].origin_data['y']
+        frequencies, amplitude = batch_spectrum(traces, sampling_rate, window_, segment_size_, overlap_)
+        for row in range(len(batch)):
+            i, key = batch[row]
+            spectra[i] = (frequencies, amplitude[row].copy())
+            if key is not None:
+                cache.put(key, spectra[i])
+    return spectra
@@ -0,0 +1,204 @@
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import statistics
+import subprocess
+import config as cf
+
+
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$')
+STARTUP_METRICS = ['import_s', 'app_s', 'last_project_s', 'model_build_s', 'window_build_s', 'first_paint_s', 'total_s']
+
+
+def parse_import_time(stderr_: str, top_count_: int = cf.BENCHMARK_TOP_IMPORT_COUNT) -> dict:
+    modules = []
+    for line in stderr_.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is not None:
+            modules.append((match.group(4), len(match.group(3)) // 2, int(match.group(1)), int(match.group(2))))
+    top_level = [module for module in modules if module[1] == 0]
+    heaviest = sorted(modules, key=lambda module_: module_[3], reverse=True)[:top_count_]
+    return {
+        'total_s': sum(module[3] for module in top_level) * 10**-6,
+        'module_count': len(modules),
+        'top': [{'module': name, 'self_s': self_us * 10**-6, 'cumulative_s': cumulative_us * 10**-6}
+                for name, _, self_us, cumulative_us in heaviest],
+    }
+
+
+def get_child_env() -> dict:
+    env = dict(os.environ)
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    env['PYTHONPATH'] = os.path.dirname(os.path.abspath(__file__)) + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def measure_import_time(module_: str = 'main_window') -> dict:
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module_],
+                               env=get_child_env(), capture_output=True, text=True, check=True)
+    return parse_import_time(completed.stderr)
+
+
+def measure_startup(work_dir_: str, project_path_: str = None) -> dict:
+    command = [sys.executable, os.path.abspath(__file__), '--child', work_dir_]
+    if project_path_ is not None:
+        command.append(project_path_)
+    completed = subprocess.run(command, env=get_child_env(), capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_child(work_dir_: str, project_path_: str = None) -> dict:
+    start_time = time.perf_counter()
+    os.chdir(work_dir_)
+    if os.path.isdir(cf.CACHE_DIR_PATH):
+        shutil.rmtree(cf.CACHE_DIR_PATH)
+    if project_path_ is not None:
+        os.mkdir(cf.CACHE_DIR_PATH)
+        with open(cf.CACHE_FILE_INFO_PATH, 'w', encoding=cf.DEFAULT_ENCODING) as file:
+            file.write(project_path_)
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    import main_window
+    from borehole_logic import Borehole
+    from loadlabel import JobScheduler
+    metrics = {'import_s': time.perf_counter() - start_time}
+
+    class FirstPaintFilter(QObject):
+        def __init__(self, app_: QApplication):
+            super().__init__()
+            self.app = app_
+            self.paint_time = None
+
+        def eventFilter(self, watched_, event_) -> bool:
+            if event_.type() == QEvent.Paint and self.paint_time is None:
+                self.paint_time = time.perf_counter()
+                QTimer.singleShot(0, self.app.quit)
+            return False
+
+    checkpoint = time.perf_counter()
+    app = QApplication([])
+    metrics['app_s'] = time.perf_counter() - checkpoint
+
+    checkpoint = time.perf_counter()
+    last_project_path = main_window.get_last_project_path()
+    metrics['last_project_s'] = time.perf_counter() - checkpoint
+
+    metrics['model_build_s'] = 0.
+    if last_project_path is not None:
+        checkpoint = time.perf_counter()
+        Borehole(os.path.basename(last_project_path), os.path.dirname(last_project_path))
+        metrics['model_build_s'] = time.perf_counter() - checkpoint
+
+    checkpoint = time.perf_counter()
+    window = main_window.MainWindow(app)
+    metrics['window_build_s'] = time.perf_counter() - checkpoint
+
+    paint_filter = FirstPaintFilter(app)
+    window.installEventFilter(paint_filter)
+    checkpoint = time.perf_counter()
+    window.showMaximized()
+    QTimer.singleShot(cf.BENCHMARK_FIRST_PAINT_TIMEOUT_MS, app.quit)
+    app.exec()
+    metrics['first_paint_s'] = -1. if paint_filter.paint_time is None else paint_filter.paint_time - checkpoint
+    metrics['total_s'] = time.perf_counter() - start_time
+
+    scheduler = JobScheduler()
+    for job in list(scheduler.active_jobs):
+        scheduler.cancel_job(job)
+    scheduler.wait_for_done()
+    return metrics
+
+
+def get_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def get_median_metrics(runs_: list) -> dict:
+    return {metric: statistics.median(run[metric] for run in runs_) for metric in STARTUP_METRICS}
+
+
+def run_benchmark(work_dir_: str, sizes_: list, repeat_: int) -> dict:
+    from project_generator import generate_project
+    os.makedirs(work_dir_, exist_ok=True)
+    resource_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resource')
+    if os.path.isdir(resource_path) and not os.path.isdir(os.path.join(work_dir_, 'resource')):
+        shutil.copytree(resource_path, os.path.join(work_dir_, 'resource'))
+
+    import_runs = [measure_import_time() for _ in range(repeat_)]
+    results = {
+        'revision': get_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat_,
+        'import': min(import_runs, key=lambda run_: run_['total_s']),
+        'projects': [],
+    }
+    for section_count in sizes_:
+        project_path, file_count = None, 0
+        if section_count > 0:
+            project_path = os.path.join(work_dir_, 'projects', 'startup_' + str(section_count))
+            if os.path.isdir(project_path):
+                shutil.rmtree(project_path)
+            file_count = generate_project(project_path, section_count, cf.BENCHMARK_STEP_COUNT,
+                                          point_count_=cf.BENCHMARK_POINT_COUNT)['file_count']
+        runs = [measure_startup(work_dir_, project_path) for _ in range(repeat_)]
+        project_result = {'section_count': section_count, 'file_count': file_count}
+        project_result.update(get_median_metrics(runs))
+        project_result['runs'] = runs
+        results['projects'].append(project_result)
+    return results
+
+
+def print_results(results_: dict, baseline_: dict = None) -> None:
+    print(cf.BENCHMARK_IMPORT_MESSAGE_F(results_['import']['total_s'], results_['import']['module_count']))
+    baseline_projects = dict()
+    if baseline_ is not None:
+        baseline_projects = {project['section_count']: project for project in baseline_['projects']}
+    for project in results_['projects']:
+        baseline = baseline_projects.get(project['section_count'])
+        for metric in STARTUP_METRICS:
+            ratio = None
+            if baseline is not None and baseline.get(metric, 0) > 0:
+                ratio = project[metric] / baseline[metric]
+            print(cf.BENCHMARK_METRIC_MESSAGE_F(project['file_count'], metric, project[metric], ratio))
+
+
+def main(argv_: list = None) -> int:
+    argv = sys.argv[1:] if argv_ is None else argv_
+    if len(argv) > 0 and argv[0] == '--child':
+        print(json.dumps(run_child(*argv[1:3])))
+        return 0
+
+    parser = argparse.ArgumentParser(description="Замер времени запуска приложения")
+    parser.add_argument('--work-dir', default=os.path.join(cf.BENCHMARK_DIR, 'startup'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=cf.BENCHMARK_STARTUP_SECTION_COUNTS,
+                        help="количество секций в синтетических проектах, 0 - без проекта")
+    parser.add_argument('--repeat', type=int, default=cf.BENCHMARK_REPEAT)
+    parser.add_argument('--output', default=None, help="файл для сохранения результатов в JSON")
+    parser.add_argument('--baseline', default=None, help="JSON с результатами для сравнения")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(os.path.abspath(args.work_dir), args.sizes, max(args.repeat, 1))
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding=cf.DEFAULT_ENCODING) as file:
+            baseline = json.load(file)
+    print_results(results, baseline)
+    if args.output is not None:
+        with open(args.output, 'w', encoding=cf.DEFAULT_ENCODING) as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import time
+import threading
+from logger import LazyMessage, get_logger
+import config as cf
+
+
+logger = get_logger(__name__)
+
+
+class OperationCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    local = threading.local()
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self) -> None:
+        self.event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.event.is_set()
+
+    def check(self) -> None:
+        if self.event.is_set():
+            raise OperationCancelled()
+
+    @staticmethod
+    def current(cancel_token_=None):
+        if cancel_token_ is not None:
+            return cancel_token_
+        token = getattr(CancelToken.local, 'token', None)
+        return CancelToken() if token is None else token
+
+    @staticmethod
+    def set_current(cancel_token_) -> None:
+        CancelToken.local.token = cancel_token_
+
+
+class ProgressReporter:
+    local = threading.local()
+    is_headless = False
+
+    def __init__(self, name_: str = '', sink_=None, is_log_: bool = False):
+        self.name = name_
+        self.sink = sink_
+        self.is_log = is_log_
+        self.done = 0
+        self.total = 0
+        self.start_time = time.monotonic()
+        self.last_report_time = 0.
+
+    def start(self, total_: int, name_: str = None) -> None:
+        if name_ is not None:
+            self.name = name_
+        self.done = 0
+        self.total = total_
+        self.start_time = time.monotonic()
+        self.last_report_time = 0.
+        self.report()
+
+    def advance(self, item_: str = '', count_: int = 1) -> None:
+        self.update(self.done + count_, self.total, item_)
+
+    def update(self, done_: int, total_: int, item_: str = '') -> None:
+        self.done = done_
+        self.total = max(total_, done_)
+        now = time.monotonic()
+        if now - self.last_report_time < cf.PROGRESS_REPORT_INTERVAL and self.done < self.total:
+            return
+        self.last_report_time = now
+        self.report(item_)
+
+    def get_rate(self) -> float:
+        elapsed = time.monotonic() - self.start_time
+        return self.done / elapsed if elapsed > 0 else 0.
+
+    def get_eta(self) -> float:
+        rate = self.get_rate()
+        return (self.total - self.done) / rate if rate > 0 else -1.
+
+    def report(self, item_: str = '') -> None:
+        rate, eta = self.get_rate(), self.get_eta()
+        if self.sink is not None:
+            self.sink(self.done, self.total, str(item_), rate, eta)
+        if self.is_log or ProgressReporter.is_headless:
+            logger.info('%s', LazyMessage(cf.PROGRESS_LOG_MESSAGE_F, self.name, self.done, self.total, item_, rate, eta))
+
+    @staticmethod
+    def current(progress_reporter_=None):
+        if progress_reporter_ is not None:
+            return progress_reporter_
+        reporter = getattr(ProgressReporter.local, 'reporter', None)
+        if reporter is None:
+            reporter = ProgressReporter()
+            ProgressReporter.set_current(reporter)
+        return reporter
+
+    @staticmethod
+    def set_current(progress_reporter_) -> None:
+        ProgressReporter.local.reporter = progress_reporter_
@@ -0,0 +1,13 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from diagnostics import Diagnostics, print_diagnostic
+
+
+@pytest.fixture(autouse=True)
+def headless_diagnostics(monkeypatch):
+    monkeypatch.setattr(Diagnostics, 'default_sink', print_diagnostic)
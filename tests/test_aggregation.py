@@ -0,0 +1,66 @@
+import os
+import shutil
+import pytest
+from project_generator import generate_project
+from borehole_logic import Borehole
+from data_cache import TraceCache, SummaryCache
+
+AGGREGATION_METHODS = [
+    'get_xy_dataframes_dict',
+    'get_sensor_21_dataframe_dict',
+    'get_sensor_dataframe_dict',
+    'get_step_maxes_dataframe_dict',
+    'get_step_depth_dataframe_dict',
+]
+
+
+@pytest.fixture(scope='module')
+def malformed_project(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('aggregation') / 'malformed')
+    result = generate_project(path, section_count_=2, step_count_=3, sensor_count_=2, measurement_count_=3,
+                              point_count_=300, malformed_fraction_=0.3, seed_=3)
+    assert len(result['malformed']) > 0
+    return path
+
+
+@pytest.mark.parametrize('method', AGGREGATION_METHODS)
+def test_aggregation_skips_malformed_files(malformed_project, method):
+    TraceCache().clear()
+    SummaryCache().clear()
+    borehole = Borehole(os.path.basename(malformed_project), os.path.dirname(malformed_project))
+    for section in borehole.section_list:
+        section.select(True)
+    borehole.validate()
+    assert isinstance(getattr(borehole, method)(), dict)
+
+
+def test_depth_aggregation_keeps_sensors_missing_in_last_step(malformed_project):
+    borehole = Borehole(os.path.basename(malformed_project), os.path.dirname(malformed_project))
+    for section in borehole.section_list:
+        section.select(True)
+    dataframes_dict = borehole.get_step_depth_dataframe_dict()
+    for step_dict in dataframes_dict.values():
+        for sensor_dict in step_dict.values():
+            for value in sensor_dict.values():
+                assert 0 < value['rx'] <= 1
+
+
+def test_validation_follows_file_changes(tmp_path):
+    path = str(tmp_path / 'revalidated')
+    generate_project(path, section_count_=1, step_count_=2, sensor_count_=2, measurement_count_=3,
+                     point_count_=64, malformed_fraction_=0.5, seed_=3)
+    borehole = Borehole(os.path.basename(path), os.path.dirname(path))
+    borehole.validate()
+    data_files = [data_file for section in borehole.section_list for step in section.step_list
+                  for data_file in step.data_list]
+    invalid_file = next(data_file for data_file in data_files if data_file.is_valid is False)
+    valid_file = next(data_file for data_file in data_files if data_file.is_valid)
+    assert invalid_file.get_xy_dataframe() is None
+
+    shutil.copyfile(valid_file.path(), invalid_file.path())
+    stat = os.stat(invalid_file.path())
+    os.utime(invalid_file.path(), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not invalid_file.is_validated()
+    borehole.validate()
+    assert invalid_file.is_valid is True
+    assert invalid_file.get_xy_dataframe() is not None
@@ -0,0 +1,47 @@
+import os
+import shutil
+from project_generator import generate_project
+from borehole_logic import Borehole
+
+
+def make_borehole(tmp_path) -> Borehole:
+    path = str(tmp_path / 'borehole')
+    generate_project(path, section_count_=2, step_count_=2, measurement_count_=2, point_count_=16)
+    return Borehole(os.path.basename(path), os.path.dirname(path))
+
+
+def test_no_structure_changes(tmp_path):
+    borehole = make_borehole(tmp_path)
+    item_states = borehole.get_item_states()
+    borehole.correlate_data()
+    assert borehole.get_structure_changes(item_states) == dict()
+
+
+def test_removed_and_renamed_items(tmp_path):
+    borehole = make_borehole(tmp_path)
+    item_states = borehole.get_item_states()
+    section = borehole.section_list[0]
+    removed_step = section.step_list[1]
+    renamed_file = section.step_list[0].data_list[0]
+    shutil.rmtree(removed_step.path())
+    new_name = renamed_file.name.replace('_0.csv', '_9.csv')
+    os.rename(renamed_file.path(), os.path.join(os.path.dirname(renamed_file.path()), new_name))
+    borehole.correlate_data()
+
+    change_set = borehole.get_structure_changes(item_states)
+    step_key = (section.name, section.step_list[0].number)
+    assert change_set[(section.name, removed_step.number)] == {'removed'}
+    assert change_set[step_key + (renamed_file.name,)] == {'removed'}
+    assert change_set[step_key + (new_name,)] == {'added'}
+
+
+def test_modified_file(tmp_path):
+    borehole = make_borehole(tmp_path)
+    item_states = borehole.get_item_states()
+    data_file = borehole.section_list[1].step_list[0].data_list[0]
+    with open(data_file.path(), 'a') as file:
+        file.write('0.0\n')
+    borehole.correlate_data()
+
+    change_set = borehole.get_structure_changes(item_states)
+    assert change_set == {(borehole.section_list[1].name, 0, data_file.name): {'modified'}}
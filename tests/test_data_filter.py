@@ -0,0 +1,63 @@
+import random
+import pathlib
+import pytest
+from data_filter import ArithmeticMeanFilter, MedianFilter, ExpEasyMeanFilter, NormaliseFilter, KalmanFilter, \
+    filter_chunks
+from project_generator import generate_project
+from dataframes import XYDataFrame
+from data_cache import FilteredDataCache
+import config as cf
+
+FILTERS = [
+    (ArithmeticMeanFilter, ()),
+    (ArithmeticMeanFilter, (1,)),
+    (ArithmeticMeanFilter, (4,)),
+    (MedianFilter, ()),
+    (MedianFilter, (2,)),
+    (ExpEasyMeanFilter, ()),
+    (NormaliseFilter, ()),
+    (KalmanFilter, ()),
+]
+LENGTHS = [0, 1, 6, 7, 10, 11, 257]
+CHUNK_SIZES = [1, 3, 64, 1000]
+
+
+def get_trace(length_: int) -> list:
+    rng = random.Random(length_)
+    return [rng.gauss(0., 1.) + (5. if rng.random() < 0.1 else 0.) for _ in range(length_)]
+
+
+def get_chunks(data_: list, chunk_size_: int):
+    for i in range(0, len(data_), chunk_size_):
+        yield data_[i:i + chunk_size_]
+
+
+@pytest.mark.parametrize('filter_class, params', FILTERS)
+@pytest.mark.parametrize('length', LENGTHS)
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_stream_matches_get_data(filter_class, params, length, chunk_size):
+    data = get_trace(length)
+    data_filter = filter_class(data)
+    if len(params):
+        data_filter.set_params(*params)
+    expected = data_filter.get_data()
+    streamed = [value for chunk in filter_chunks(data_filter, get_chunks(data, chunk_size)) for value in chunk]
+    assert streamed == expected
+    assert len(expected) == length
+
+
+def test_evicted_trace_is_filtered_from_chunks(tmp_path, monkeypatch):
+    path = str(tmp_path / 'stream')
+    generate_project(path, section_count_=1, step_count_=1, sensor_count_=1, measurement_count_=1, point_count_=300)
+    filename = next(str(p) for p in pathlib.Path(path).rglob('*.csv'))
+    dataframe = XYDataFrame(filename)
+    data_filter = MedianFilter([])
+    expected = FilteredDataCache.filter_data(data_filter, dataframe.origin_data['y'])
+
+    monkeypatch.setattr(cf, 'STREAM_FILTER_MIN_POINTS', 100)
+    monkeypatch.setattr(cf, 'DEFAULT_STREAM_CHUNK_SIZE', 64)
+    dataframe.evict()
+    init_data = dataframe.get_filter_input()
+    assert not isinstance(init_data, list)
+    assert FilteredDataCache.filter_data(data_filter, init_data) == expected
+    assert not dataframe.is_loaded()
@@ -0,0 +1,47 @@
+import os
+import pytest
+from PySide6.QtWidgets import QApplication
+from project_generator import generate_project
+from borehole_logic import Borehole
+from task_context import CancelToken, OperationCancelled
+from loadlabel import JobScheduler
+from prefetch import CachePrefetcher
+
+
+@pytest.fixture
+def prefetcher(tmp_path):
+    app = QApplication.instance() or QApplication([])
+    path = str(tmp_path / 'prefetch')
+    generate_project(path, section_count_=1, step_count_=1, measurement_count_=1, point_count_=16)
+    prefetcher = CachePrefetcher(Borehole(os.path.basename(path), os.path.dirname(path)))
+    yield prefetcher
+    prefetcher.stop()
+    JobScheduler().wait_for_done()
+    app.processEvents()
+
+
+def test_stale_completion_is_ignored(prefetcher):
+    stale_job, current_job = object(), object()
+    prefetcher.job = current_job
+    prefetcher.prefetch_complete(True, stale_job)
+    assert prefetcher.job is current_job
+    assert not prefetcher.is_finished
+    assert not prefetcher.resume_timer.isActive()
+
+    prefetcher.prefetch_complete(False, current_job)
+    assert prefetcher.job is None
+    assert not prefetcher.is_finished
+    assert prefetcher.resume_timer.isActive()
+
+
+def test_cancelled_prefetch_does_not_complete(prefetcher):
+    cancel_token = CancelToken()
+    cancel_token.cancel()
+    CancelToken.set_current(cancel_token)
+    JobScheduler().foreground_job_count += 1
+    try:
+        with pytest.raises(OperationCancelled):
+            prefetcher.prefetch(prefetcher.get_filenames())
+    finally:
+        JobScheduler().foreground_job_count -= 1
+        CancelToken.set_current(None)
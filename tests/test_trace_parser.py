@@ -0,0 +1,20 @@
+import os
+from project_generator import generate_project, get_data_filename
+from dataframes import XYDataFrame
+from data_cache import TraceCache
+import config as cf
+
+
+def test_read_trace_matches_read_chunks(tmp_path):
+    path = str(tmp_path / 'parser')
+    generate_project(path, section_count_=1, step_count_=1, sensor_count_=1, measurement_count_=1,
+                     point_count_=250, seed_=7)
+    filename = os.path.join(path, cf.DEFAULT_SECTION_NAME + '0', '0', get_data_filename(0, 0, 0))
+    TraceCache().clear()
+
+    trace = XYDataFrame.read_trace(filename)
+    chunks = [value for chunk in XYDataFrame.read_chunks(filename, 64) for value in chunk]
+
+    assert len(trace['y']) == 250
+    assert trace['y'] == chunks
+    assert trace['header'][cf.DATA_POINTS_HEADER] == 250
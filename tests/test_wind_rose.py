@@ -0,0 +1,41 @@
+import os
+import numpy as np
+from project_generator import generate_project
+from borehole_logic import Borehole
+from dataframes import WindRoseFrames
+from data_cache import TraceCache, SummaryCache
+from report_export import get_wind_rose_jobs
+
+
+def load_borehole(path_: str) -> Borehole:
+    TraceCache().clear()
+    SummaryCache().clear()
+    borehole = Borehole(os.path.basename(path_), os.path.dirname(path_))
+    for section in borehole.section_list:
+        section.select(True)
+    return borehole
+
+
+def test_wind_rose_with_missing_sensor(tmp_path):
+    path = str(tmp_path / 'missing_sensor')
+    generate_project(path, section_count_=2, step_count_=2, sensor_count_=3, measurement_count_=2,
+                     point_count_=64)
+    borehole = load_borehole(path)
+
+    for is_relative in (False, True):
+        frames = WindRoseFrames(borehole.get_sensor_dataframe_dict(), is_relative)
+        assert len(frames) > 0
+        assert np.isnan(frames.data).all()
+        assert frames.get_top_y_lim() > 0
+
+    assert len(get_wind_rose_jobs(borehole, str(tmp_path / 'out'), 'png', 50)) == len(frames)
+
+
+def test_wind_rose_with_all_sensors(tmp_path):
+    path = str(tmp_path / 'all_sensors')
+    generate_project(path, section_count_=2, step_count_=2, measurement_count_=2, point_count_=64)
+    borehole = load_borehole(path)
+
+    frames = WindRoseFrames(borehole.get_sensor_dataframe_dict())
+    assert len(frames) > 0
+    assert not np.isnan(frames.data).any()
@@ -2,17 +2,19 @@ import os
 import pathlib
 from uuid import uuid4
 from PySide6.QtWidgets import QWidget, QCheckBox, QVBoxLayout, QHBoxLayout, QMessageBox, \
-    QPushButton, QFileDialog, QListWidget, QListWidgetItem, QLabel, QDialog, QTextEdit, QTabWidget
+    QPushButton, QFileDialog, QListWidget, QListWidgetItem, QLabel, QDialog, QTextEdit, QTabWidget, \
+    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView
 from PySide6.QtCore import Qt, QUrl, QPoint, QSize, QRect, QRunnable, QThreadPool, Signal, QObject
 from PySide6.QtGui import QMovie
+from diagnostics import MyWarning, Diagnostic, Diagnostics
+from task_context import OperationCancelled, CancelToken, ProgressReporter
+from profiler import Profiler
+from data_cache import MemoryAccountant
+from logger import get_logger
 import config as cf
 
 
-class MyWarning(Warning):
-    def __init__(self, exception_title_: str, message_: str):
-        self.message = message_
-        self.exception_title = exception_title_
-        super().__init__(self.message)
+logger = get_logger(__name__)
 
 
 class MessageSignalHandler(QObject):
@@ -21,15 +23,23 @@ class MessageSignalHandler(QObject):
     
 
 class MessageBox:
+    is_headless = False
+
     def __init__(self) -> None:
         self.signal_handler = MessageSignalHandler()
         self.signal_handler.information.connect(self.wrapper_information_message)
         self.signal_handler.warning.connect(self.wrapper_warning_message)
     
     def information(self, title_: str, message_: str) -> None:
+        if MessageBox.is_headless:
+            logger.info('%s: %s', title_, message_)
+            return
         self.signal_handler.information.emit(title_, message_)
     
     def warning(self, title_: str, message_: str) -> None:
+        if MessageBox.is_headless:
+            logger.warning('%s: %s', title_, message_)
+            return
         self.signal_handler.warning.emit(title_, message_)
     
     def wrapper_information_message(self, title_: str, message_: str) -> None:
@@ -44,22 +54,11 @@ class MessageBox:
         return cls.instance
 
 
-def get_num_file_by_default(base_name_: str, sensor_amount_: int) -> list:
-    if len(base_name_) < 19:
-        return [-1, -1]
-    measurement_num = -1
-    if base_name_[-5].isalpha():
-        measurement_num = ord(base_name_[-5].lower()) - ord('a') + 10
-    elif base_name_[-5].isdigit():
-        measurement_num = int(base_name_[-5])
-    else:
-        return [-1, -1]
-    sensor_num = -1
-    if base_name_[8].isalpha() and ord(base_name_[8].lower()) - ord('a') < sensor_amount_:
-        sensor_num = ord(base_name_[8].lower()) - ord('a')
-    else:
-        return [-1, -1]
-    return [measurement_num, sensor_num]
+def show_diagnostic(diagnostic_: Diagnostic) -> None:
+    MessageBox().warning(diagnostic_.title, diagnostic_.message)
+
+
+Diagnostics.default_sink = show_diagnostic
 
 
 class AbstractFunctor:
@@ -333,9 +332,200 @@ class HelpInfoDialog(AbstractToolDialog):
         self.tab_widget.addTab(HelpInfoPageWidget(cf.WINDROSE_HELP_INFO, self), 'Роза ветров')
         self.tab_widget.addTab(HelpInfoPageWidget(cf.AMPLITUDE_HELP_INFO, self), 'Амлитудный')
         self.tab_widget.addTab(HelpInfoPageWidget(cf.DEPTH_HELP_INFO, self), 'Глубинный')
+        self.tab_widget.addTab(HelpInfoPageWidget(cf.SPECTRUM_HELP_INFO, self), 'Спектр')
         self.__all_widgets_to_layout()
     
     def __all_widgets_to_layout(self) -> None:
         core_layout = QVBoxLayout()
         core_layout.addWidget(self.tab_widget)
         self.setLayout(core_layout)
+
+
+class ValidationReportDialog(AbstractToolDialog):
+    def __init__(self, parent_: QWidget = None):
+        super().__init__(cf.VALIDATION_REPORT_DIALOG_TITLE, parent_)
+        self.setMinimumSize(800, 400)
+        self.table_widget = QTableWidget(0, len(cf.VALIDATION_REPORT_HEADERS), self)
+        self.count_label = QLabel(self)
+        self.close_btn = QPushButton("Закрыть", self)
+        self.close_btn.clicked.connect(self.cancel_action)
+        self.__table_init()
+        self.__all_widgets_to_layout()
+
+    def __table_init(self) -> None:
+        self.table_widget.setHorizontalHeaderLabels(cf.VALIDATION_REPORT_HEADERS)
+        self.table_widget.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_widget.horizontalHeader().setStretchLastSection(True)
+        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
+        self.table_widget.setColumnWidth(0, 300)
+
+    def __all_widgets_to_layout(self) -> None:
+        core_layout = QVBoxLayout()
+        core_layout.addWidget(self.table_widget)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.count_label)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.close_btn)
+        core_layout.addLayout(buttons_layout)
+        self.setLayout(core_layout)
+
+    def add_diagnostics(self, diagnostics_: Diagnostics) -> None:
+        self.table_widget.setSortingEnabled(False)
+        for diagnostic in diagnostics_:
+            row = self.table_widget.rowCount()
+            self.table_widget.insertRow(row)
+            path_item = QTableWidgetItem(os.path.basename(diagnostic.path))
+            path_item.setToolTip(diagnostic.path)
+            self.table_widget.setItem(row, 0, path_item)
+            self.table_widget.setItem(row, 1, QTableWidgetItem(diagnostic.title))
+            self.table_widget.setItem(row, 2, QTableWidgetItem(diagnostic.message))
+        self.table_widget.setSortingEnabled(True)
+        self.count_label.setText(cf.VALIDATION_REPORT_COUNT_MESSAGE_F(self.table_widget.rowCount()))
+
+    def run(self, diagnostics_: Diagnostics = None) -> None:
+        if not self.isVisible():
+            self.table_widget.setRowCount(0)
+        if diagnostics_ is not None:
+            self.add_diagnostics(diagnostics_)
+        super().run()
+        self.raise_()
+
+
+class ProfilerDialog(AbstractToolDialog):
+    def __init__(self, parent_: QWidget = None):
+        super().__init__(cf.PROFILER_DIALOG_TITLE, parent_)
+        self.setMinimumSize(800, 500)
+        self.stats_table = QTableWidget(0, len(cf.PROFILER_STATS_HEADERS), self)
+        self.counters_table = QTableWidget(0, len(cf.PROFILER_COUNTERS_HEADERS), self)
+        self.update_btn = QPushButton("Обновить", self)
+        self.update_btn.clicked.connect(self.update_action)
+        self.reset_btn = QPushButton("Сбросить", self)
+        self.reset_btn.clicked.connect(self.reset_action)
+        self.save_trace_btn = QPushButton("Сохранить trace", self)
+        self.save_trace_btn.clicked.connect(self.save_trace_action)
+        self.close_btn = QPushButton("Закрыть", self)
+        self.close_btn.clicked.connect(self.cancel_action)
+        self.__table_init(self.stats_table, cf.PROFILER_STATS_HEADERS)
+        self.__table_init(self.counters_table, cf.PROFILER_COUNTERS_HEADERS)
+        self.__all_widgets_to_layout()
+
+    @staticmethod
+    def __table_init(table_widget_: QTableWidget, headers_: list) -> None:
+        table_widget_.setHorizontalHeaderLabels(headers_)
+        table_widget_.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table_widget_.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table_widget_.horizontalHeader().setStretchLastSection(True)
+        table_widget_.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
+        table_widget_.setColumnWidth(0, 300)
+
+    def __all_widgets_to_layout(self) -> None:
+        core_layout = QVBoxLayout()
+        core_layout.addWidget(self.stats_table, 2)
+        core_layout.addWidget(self.counters_table, 1)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.update_btn)
+        buttons_layout.addWidget(self.reset_btn)
+        buttons_layout.addWidget(self.save_trace_btn)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.close_btn)
+        core_layout.addLayout(buttons_layout)
+        self.setLayout(core_layout)
+
+    @staticmethod
+    def __set_rows(table_widget_: QTableWidget, rows_: list) -> None:
+        table_widget_.setSortingEnabled(False)
+        table_widget_.setRowCount(0)
+        for row_values in rows_:
+            row = table_widget_.rowCount()
+            table_widget_.insertRow(row)
+            for column, value in enumerate(row_values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                table_widget_.setItem(row, column, item)
+        table_widget_.setSortingEnabled(True)
+
+    def update_action(self) -> None:
+        stats = sorted(Profiler().get_stats().items(), key=lambda item_: item_[1]['total_s'], reverse=True)
+        self.__set_rows(self.stats_table, [[name, stat['count'], round(stat['total_s'], 3),
+                                            round(stat['total_s'] / stat['count'] * 10**3, 3),
+                                            round(stat['max_s'] * 10**3, 3)] for name, stat in stats])
+        self.__set_rows(self.counters_table, [[name, value] for name, value in sorted(Profiler().get_counters().items())])
+
+    def reset_action(self) -> None:
+        Profiler().reset()
+        self.update_action()
+
+    def save_trace_action(self) -> None:
+        path = QFileDialog.getSaveFileName(self, dir=str(pathlib.Path().resolve() / 'trace.json'),
+                                           filter=cf.PROFILER_TRACE_FILE_FILTER)[0]
+        if len(path) > 0:
+            Profiler().dump_chrome_trace(path)
+
+    def run(self) -> None:
+        self.update_action()
+        super().run()
+        self.raise_()
+
+
+class MemoryReportDialog(AbstractToolDialog):
+    def __init__(self, parent_: QWidget = None):
+        super().__init__(cf.MEMORY_REPORT_DIALOG_TITLE, parent_)
+        self.setMinimumSize(600, 400)
+        self.table_widget = QTableWidget(0, len(cf.MEMORY_REPORT_HEADERS), self)
+        self.total_label = QLabel(self)
+        self.update_btn = QPushButton("Обновить", self)
+        self.update_btn.clicked.connect(self.update_action)
+        self.free_btn = QPushButton("Освободить", self)
+        self.free_btn.clicked.connect(self.free_action)
+        self.close_btn = QPushButton("Закрыть", self)
+        self.close_btn.clicked.connect(self.cancel_action)
+        self.__table_init()
+        self.__all_widgets_to_layout()
+
+    def __table_init(self) -> None:
+        self.table_widget.setHorizontalHeaderLabels(cf.MEMORY_REPORT_HEADERS)
+        self.table_widget.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_widget.horizontalHeader().setStretchLastSection(True)
+        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
+        self.table_widget.setColumnWidth(0, 350)
+
+    def __all_widgets_to_layout(self) -> None:
+        core_layout = QVBoxLayout()
+        core_layout.addWidget(self.table_widget)
+        core_layout.addWidget(self.total_label)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.update_btn)
+        buttons_layout.addWidget(self.free_btn)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.close_btn)
+        core_layout.addLayout(buttons_layout)
+        self.setLayout(core_layout)
+
+    def update_action(self) -> None:
+        accountant = MemoryAccountant()
+        rows = [("Окно: " + name, nbytes) for name, nbytes in accountant.get_source_report()] + \
+               [("Кэш: " + name, nbytes) for name, nbytes in accountant.get_cache_report()]
+        self.table_widget.setSortingEnabled(False)
+        self.table_widget.setRowCount(0)
+        for name, nbytes in rows:
+            row = self.table_widget.rowCount()
+            self.table_widget.insertRow(row)
+            self.table_widget.setItem(row, 0, QTableWidgetItem(name))
+            size_item = QTableWidgetItem()
+            size_item.setData(Qt.DisplayRole, round(nbytes / 1024 ** 2, 2))
+            self.table_widget.setItem(row, 1, size_item)
+        self.table_widget.setSortingEnabled(True)
+        self.total_label.setText(cf.MEMORY_REPORT_TOTAL_MESSAGE_F(accountant.get_total_bytes(), accountant.budget_bytes,
+                                                                  accountant.evicted_count))
+
+    def free_action(self) -> None:
+        for cache in MemoryAccountant().caches:
+            cache.clear()
+        self.update_action()
+
+    def run(self) -> None:
+        self.update_action()
+        super().run()
+        self.raise_()